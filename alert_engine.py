@@ -0,0 +1,112 @@
+"""
+ALERT_ENGINE.PY - Evaluasi price alert secara vektor dengan NumPy
+Threshold BELI dan JUAL disimpan dalam array terurut, sehingga alert yang
+terpicu untuk satu harga cukup dicari dengan binary search (searchsorted)
+alih-alih loop Python per alert.
+
+Aturan (sama dengan pengecekan per alert):
+- BELI terpicu jika harga <= harga_beli
+- JUAL terpicu jika harga >= harga_jual
+
+Untuk mode crossing (proses_crossing), engine juga menyimpan status
+terpicu tiap alert sehingga notifikasi hanya muncul saat harga MASUK ke
+zona target, bukan di setiap tick selama harga masih di zona tersebut.
+"""
+import numpy as np
+
+TIPE_BELI = 0
+TIPE_JUAL = 1
+TANPA_TARGET_BELI = np.iinfo(np.int64).min  # Alert tanpa target BELI tidak pernah terpicu
+TANPA_TARGET_JUAL = np.iinfo(np.int64).max  # Alert tanpa target JUAL tidak pernah terpicu
+
+
+def _rp(harga):
+    return f"Rp {int(harga):,}".replace(",", ".")
+
+
+class AlertEngine:
+    def __init__(self, alerts):
+        """alerts: list (id, nama, harga_beli, harga_jual[, terpicu_beli, terpicu_jual])
+        dalam urutan tampil"""
+        self.ids = np.array([a[0] for a in alerts], dtype=np.int64)
+        self.nama = [a[1] for a in alerts]
+        self.beli = np.array([a[2] or TANPA_TARGET_BELI for a in alerts], dtype=np.int64)
+        self.jual = np.array([a[3] or TANPA_TARGET_JUAL for a in alerts], dtype=np.int64)
+
+        # Urutan index berdasarkan threshold (stable supaya hasil deterministik)
+        self._urut_beli = np.argsort(self.beli, kind="stable")
+        self._urut_jual = np.argsort(self.jual, kind="stable")
+        self._beli_terurut = self.beli[self._urut_beli]
+        self._jual_terurut = self.jual[self._urut_jual]
+
+        # Status terpicu terakhir (untuk deteksi crossing)
+        self.status_beli = np.array([bool(a[4]) if len(a) > 4 else False for a in alerts], dtype=bool)
+        self.status_jual = np.array([bool(a[5]) if len(a) > 5 else False for a in alerts], dtype=bool)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _gabung(pos_beli, pos_jual):
+        """Gabungkan posisi BELI & JUAL, urut seperti loop per alert (BELI dulu)"""
+        kunci = np.concatenate((pos_beli * 2 + TIPE_BELI, pos_jual * 2 + TIPE_JUAL))
+        kunci.sort()
+        return kunci // 2, kunci % 2
+
+    def _posisi_terpicu(self, potong_beli, potong_jual):
+        return self._gabung(self._urut_beli[potong_beli:], self._urut_jual[:potong_jual])
+
+    def cari_terpicu(self, harga):
+        """Return (posisi_alert, tipe) untuk satu harga"""
+        potong_beli = np.searchsorted(self._beli_terurut, harga, side="left")
+        potong_jual = np.searchsorted(self._jual_terurut, harga, side="right")
+        return self._posisi_terpicu(potong_beli, potong_jual)
+
+    def cari_terpicu_batch(self, harga_list):
+        """Versi batch: satu searchsorted untuk semua tick. Return list (posisi, tipe) per tick"""
+        harga_arr = np.asarray(harga_list, dtype=np.float64)
+        potong_beli = np.searchsorted(self._beli_terurut, harga_arr, side="left")
+        potong_jual = np.searchsorted(self._jual_terurut, harga_arr, side="right")
+        return [self._posisi_terpicu(b, j) for b, j in zip(potong_beli, potong_jual)]
+
+    def proses_crossing(self, harga):
+        """Perbarui status terpicu untuk harga baru.
+        Return ((posisi, tipe) alert yang baru masuk zona, posisi alert yang statusnya berubah)"""
+        potong_beli = np.searchsorted(self._beli_terurut, harga, side="left")
+        potong_jual = np.searchsorted(self._jual_terurut, harga, side="right")
+        beli_sekarang = np.zeros(len(self), dtype=bool)
+        beli_sekarang[self._urut_beli[potong_beli:]] = True
+        jual_sekarang = np.zeros(len(self), dtype=bool)
+        jual_sekarang[self._urut_jual[:potong_jual]] = True
+
+        baru = self._gabung(
+            np.flatnonzero(beli_sekarang & ~self.status_beli),
+            np.flatnonzero(jual_sekarang & ~self.status_jual)
+        )
+        berubah = np.flatnonzero(
+            (beli_sekarang != self.status_beli) | (jual_sekarang != self.status_jual)
+        )
+        self.status_beli = beli_sekarang
+        self.status_jual = jual_sekarang
+        return baru, berubah
+
+    def ke_dict(self, harga, posisi, tipe):
+        """Ubah hasil pencarian menjadi list dict seperti PriceAlert.check_alert"""
+        hasil = []
+        for p, t in zip(posisi.tolist(), tipe.tolist()):
+            if t == TIPE_BELI:
+                target = int(self.beli[p])
+                pesan = (f"{self.nama[p]}: harga {_rp(harga)} sudah di bawah target "
+                         f"BELI {_rp(target)}. Waktunya beli!")
+            else:
+                target = int(self.jual[p])
+                pesan = (f"{self.nama[p]}: harga {_rp(harga)} sudah di atas target "
+                         f"JUAL {_rp(target)}. Waktunya jual!")
+            hasil.append({
+                "id": int(self.ids[p]),
+                "nama": self.nama[p],
+                "tipe": "BELI" if t == TIPE_BELI else "JUAL",
+                "harga_target": target,
+                "pesan": pesan,
+            })
+        return hasil
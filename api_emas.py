@@ -0,0 +1,353 @@
+"""
+API_EMAS.PY - REST API JSON headless untuk data emas
+Service lain cukup memanggil API ini, tidak perlu scraping halaman
+Streamlit. Server aiohttp (satu event loop) membaca database yang sama
+dengan dashboard lewat pool koneksi bersama (db_pool); query SQLite,
+serialisasi JSON dan kompresi gzip dijalankan di API_WORKER thread supaya
+event loop tidak pernah menunggu disk. Respons riwayat memakai ETag dari
+id tick terakhir: klien yang datanya masih sama mendapat 304 tanpa query,
+respons yang sama untuk klien lain diambil dari cache di memori.
+
+    python api_emas.py                 # butuh ENABLE_API = True di config.py
+    python api_emas.py --port 8080
+
+Endpoint:
+    GET    /api/harga                                  tick terakhir + statistik + status operasional
+    GET    /api/riwayat?mulai=&akhir=&resolusi=        OHLC (auto/tick/1m/1h/1d), epoch detik UTC
+    GET    /api/alerts?setelah_id=&limit=&nama=&status=
+    POST   /api/alerts                                 {"nama", "harga_beli", "harga_jual"}
+    GET    /api/alerts/{id}
+    PATCH  /api/alerts/{id}                            kolom yang diubah saja
+    DELETE /api/alerts/{id}
+    GET    /api/alerts/terpicu?limit=
+    GET    /api/berita?kategori=&cari=&sebelum=&limit= sebelum = "tanggal,id" dari respons sebelumnya
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from config import (
+    DB_HARGA,
+    DB_ALERTS,
+    DB_BERITA,
+    ENABLE_API,
+    API_HOST,
+    API_PORT,
+    API_WORKER,
+    API_MAKS_TITIK,
+    API_RENTANG_DEFAULT,
+    API_GZIP_MIN_BYTES,
+    API_GZIP_LEVEL,
+    API_CACHE_RIWAYAT,
+    ALERT_PER_HALAMAN,
+    BERITA_LIMIT,
+)
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from harga_parser import format_rupiah
+from news_berita import BeritaEmas
+from operasi_schedule import ZONA_WAKTU, OperasiSchedule
+from price_alert import PriceAlert
+from rollup_ohlc import LEBAR_TICK, RESOLUSI, ambil_ohlc, pilih_resolusi
+from statistik_harga import baca_statistik
+
+logger = logging.getLogger("api_emas")
+
+KOLOM_ALERT = ['id', 'nama', 'harga_beli', 'harga_jual', 'status', 'tgl_buat']
+KOLOM_OHLC = ['waktu_epoch', 'open', 'high', 'low', 'close']
+RESOLUSI_API = ["auto", "tick", *RESOLUSI]
+BATAS_LIMIT = 500  # Batas parameter limit untuk listing alert & berita
+
+
+# ============================================
+# HELPER REQUEST / RESPONSE
+# ============================================
+def kemas_json(data):
+    """Data -> (body JSON, body gzip atau None jika lebih kecil dari API_GZIP_MIN_BYTES)"""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body_gzip = gzip.compress(body, API_GZIP_LEVEL) if len(body) >= API_GZIP_MIN_BYTES else None
+    return body, body_gzip
+
+
+def _respon(request, kemasan, status=200, headers=None):
+    body, body_gzip = kemasan
+    headers = dict(headers or {})
+    if body_gzip is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = body_gzip
+            headers["Content-Encoding"] = "gzip"
+    return web.Response(body=body, status=status, headers=headers, content_type="application/json")
+
+
+def _etag_cocok(if_none_match, etag):
+    """Cocokkan header If-None-Match (daftar ETag dipisah koma, boleh weak W/ atau *)
+    dengan etag persis (perbandingan weak, RFC 9110)"""
+    for kandidat in if_none_match.split(","):
+        kandidat = kandidat.strip()
+        if kandidat == "*":
+            return True
+        if kandidat.startswith("W/"):
+            kandidat = kandidat[2:]
+        if kandidat == etag:
+            return True
+    return False
+
+
+def _error(status, pesan):
+    return web.json_response({"error": pesan}, status=status)
+
+
+def _param_int(request, nama, default=None, minimum=None, maksimum=None):
+    """Query parameter integer. Raise ValueError (-> 400) jika tidak valid"""
+    teks = request.query.get(nama, "").strip()
+    if not teks:
+        return default
+    try:
+        nilai = int(teks)
+    except ValueError:
+        raise ValueError(f"Parameter '{nama}' harus bilangan bulat")
+    if minimum is not None and nilai < minimum:
+        raise ValueError(f"Parameter '{nama}' minimal {minimum}")
+    if maksimum is not None and nilai > maksimum:
+        raise ValueError(f"Parameter '{nama}' maksimal {maksimum}")
+    return nilai
+
+
+def _baca_masukan_alert(data, wajib):
+    """Validasi body JSON alert. Return dict kolom yang diisi"""
+    if not isinstance(data, dict):
+        raise ValueError("Body harus objek JSON")
+    masukan = {}
+    if "nama" in data or wajib:
+        nama = data.get("nama")
+        if not isinstance(nama, str) or not nama.strip():
+            raise ValueError("'nama' wajib diisi")
+        masukan["nama"] = nama.strip()
+    for kolom in ("harga_beli", "harga_jual"):
+        if kolom in data or wajib:
+            nilai = data.get(kolom)
+            if isinstance(nilai, bool) or not isinstance(nilai, int) or nilai <= 0:
+                raise ValueError(f"'{kolom}' harus bilangan bulat positif (Rupiah)")
+            masukan[kolom] = nilai
+    if "status" in data and not wajib:
+        if not isinstance(data["status"], str) or not data["status"].strip():
+            raise ValueError("'status' harus teks")
+        masukan["status"] = data["status"].strip().upper()
+    return masukan
+
+
+async def _middleware_error(request, handler):
+    """Parameter / body tidak valid (ValueError, termasuk JSON rusak) -> 400 JSON"""
+    try:
+        return await handler(request)
+    except ValueError as e:
+        return _error(400, str(e))
+
+
+# ============================================
+# API
+# ============================================
+class ApiEmas:
+    def __init__(self, db_harga=DB_HARGA, db_alerts=DB_ALERTS, db_berita=DB_BERITA, worker=API_WORKER):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("REST API butuh aiohttp: pip install aiohttp")
+        self.pool_harga = get_pool(db_harga, migrasi=migrasi_db_harga)
+        self.alerts = PriceAlert(db_alerts)
+        self.berita = BeritaEmas(db_berita)
+        self.jadwal = OperasiSchedule()
+        self._executor = ThreadPoolExecutor(max_workers=worker, thread_name_prefix="api-emas")
+        self._cache_riwayat = OrderedDict()  # ETag -> (body, body_gzip)
+        self._cache_lock = threading.Lock()
+
+    async def _jalankan(self, fungsi, *args):
+        """Jalankan fungsi blocking (SQLite, gzip) di thread worker"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fungsi, *args)
+
+    def buat_app(self):
+        app = web.Application(middlewares=[web.middleware(_middleware_error)])
+        app.router.add_get("/api/harga", self.harga)
+        app.router.add_get("/api/riwayat", self.riwayat)
+        app.router.add_get("/api/alerts", self.daftar_alert)
+        app.router.add_post("/api/alerts", self.tambah_alert)
+        app.router.add_get("/api/alerts/terpicu", self.alert_terpicu)
+        app.router.add_get(r"/api/alerts/{id:\d+}", self.detail_alert)
+        app.router.add_patch(r"/api/alerts/{id:\d+}", self.ubah_alert)
+        app.router.add_delete(r"/api/alerts/{id:\d+}", self.hapus_alert)
+        app.router.add_get("/api/berita", self.daftar_berita)
+        app.on_cleanup.append(self._tutup)
+        return app
+
+    async def _tutup(self, app):
+        self._executor.shutdown(wait=False)
+
+    # ============================================
+    # HARGA & RIWAYAT
+    # ============================================
+    def _baca_harga(self):
+        with self.pool_harga.koneksi() as conn:
+            row = conn.execute("SELECT harga, waktu_epoch FROM harga_emas ORDER BY id DESC LIMIT 1").fetchone()
+            statistik = baca_statistik(conn)
+        is_operasi, pesan = self.jadwal.is_operasional()
+        data = {"harga": None, "harga_teks": None, "waktu_epoch": None, "waktu": None,
+                "operasional": is_operasi, "pesan": pesan, "statistik": statistik}
+        if row is not None:
+            harga, epoch = row
+            data.update(harga=harga, harga_teks=format_rupiah(harga), waktu_epoch=epoch,
+                        waktu=datetime.fromtimestamp(epoch, ZONA_WAKTU).isoformat(timespec="seconds"))
+        return kemas_json(data)
+
+    async def harga(self, request):
+        return _respon(request, await self._jalankan(self._baca_harga))
+
+    def _versi_harga(self):
+        """Id tick terakhir: berubah setiap ada tick baru (rollup ikut berubah lewat trigger)"""
+        return self.pool_harga.baca_satu("SELECT max(id) FROM harga_emas")[0] or 0
+
+    def _baca_riwayat(self, mulai, akhir, resolusi):
+        if akhir is None or mulai is None:
+            terakhir = self.pool_harga.baca_satu("SELECT max(waktu_epoch) FROM harga_emas")[0] or 0
+            akhir = terakhir if akhir is None else akhir
+            mulai = akhir - API_RENTANG_DEFAULT if mulai is None else mulai
+        if mulai > akhir:
+            raise ValueError("'mulai' harus <= 'akhir'")
+        # Auto dan batas titik memakai perkiraan lebar tick yang sama, jadi auto tidak pernah ditolak
+        if resolusi == "auto":
+            resolusi = pilih_resolusi(akhir - mulai, API_MAKS_TITIK, LEBAR_TICK)
+        lebar = LEBAR_TICK if resolusi == "tick" else RESOLUSI[resolusi][1]
+        if (akhir - mulai) / lebar > API_MAKS_TITIK:
+            raise ValueError(f"Rentang terlalu panjang untuk resolusi {resolusi} "
+                             f"(maks {API_MAKS_TITIK} titik), pakai resolusi lebih kasar atau auto")
+        with self.pool_harga.koneksi() as conn:
+            rows = ambil_ohlc(conn, mulai, akhir, resolusi)
+        return kemas_json({"resolusi": resolusi, "mulai": mulai, "akhir": akhir,
+                           "kolom": KOLOM_OHLC, "data": rows})
+
+    async def riwayat(self, request):
+        mulai = _param_int(request, "mulai")
+        akhir = _param_int(request, "akhir")
+        resolusi = request.query.get("resolusi", "auto")
+        if resolusi not in RESOLUSI_API:
+            raise ValueError(f"'resolusi' harus salah satu dari {', '.join(RESOLUSI_API)}")
+
+        # ETag dihitung sebelum query: data sama -> 304 tanpa membaca OHLC sama sekali
+        versi = await self._jalankan(self._versi_harga)
+        kunci = hashlib.blake2b(f"{mulai}|{akhir}|{resolusi}".encode(), digest_size=8).hexdigest()
+        etag = f'"{versi}-{kunci}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_cocok(request.headers.get("If-None-Match", ""), etag):
+            return web.Response(status=304, headers=headers)
+
+        with self._cache_lock:
+            kemasan = self._cache_riwayat.get(etag)
+            if kemasan is not None:
+                self._cache_riwayat.move_to_end(etag)
+        if kemasan is None:
+            kemasan = await self._jalankan(self._baca_riwayat, mulai, akhir, resolusi)
+            with self._cache_lock:
+                self._cache_riwayat[etag] = kemasan
+                while len(self._cache_riwayat) > API_CACHE_RIWAYAT:
+                    self._cache_riwayat.popitem(last=False)
+        return _respon(request, kemasan, headers=headers)
+
+    # ============================================
+    # PRICE ALERT
+    # ============================================
+    async def daftar_alert(self, request):
+        setelah_id = _param_int(request, "setelah_id", 0, minimum=0)
+        limit = _param_int(request, "limit", ALERT_PER_HALAMAN, minimum=1, maksimum=BATAS_LIMIT)
+        rows = await self._jalankan(self.alerts.get_alerts_page, setelah_id, limit,
+                                    request.query.get("nama") or None, request.query.get("status") or None)
+        data = [dict(zip(KOLOM_ALERT, row)) for row in rows]
+        berikutnya = data[-1]["id"] if len(data) == limit else None
+        return _respon(request, kemas_json({"data": data, "berikutnya": berikutnya}))
+
+    async def detail_alert(self, request):
+        alert_id = int(request.match_info["id"])
+        row = await self._jalankan(self.alerts.get_alert, alert_id)
+        if row is None:
+            return _error(404, f"Alert #{alert_id} tidak ditemukan")
+        return _respon(request, kemas_json(dict(zip(KOLOM_ALERT, row))))
+
+    async def tambah_alert(self, request):
+        masukan = _baca_masukan_alert(await request.json(), wajib=True)
+        alert_id = await self._jalankan(
+            self.alerts.tambah_alert, masukan["nama"], masukan["harga_beli"], masukan["harga_jual"]
+        )
+        row = await self._jalankan(self.alerts.get_alert, alert_id)
+        return _respon(request, kemas_json(dict(zip(KOLOM_ALERT, row))), status=201,
+                       headers={"Location": f"/api/alerts/{alert_id}"})
+
+    async def ubah_alert(self, request):
+        alert_id = int(request.match_info["id"])
+        masukan = _baca_masukan_alert(await request.json(), wajib=False)
+        if not await self._jalankan(lambda: self.alerts.ubah_alert(alert_id, **masukan)):
+            return _error(404, f"Alert #{alert_id} tidak ditemukan")
+        row = await self._jalankan(self.alerts.get_alert, alert_id)
+        return _respon(request, kemas_json(dict(zip(KOLOM_ALERT, row))))
+
+    async def hapus_alert(self, request):
+        alert_id = int(request.match_info["id"])
+        if not await self._jalankan(self.alerts.hapus_alert, alert_id):
+            return _error(404, f"Alert #{alert_id} tidak ditemukan")
+        return web.Response(status=204)
+
+    async def alert_terpicu(self, request):
+        limit = _param_int(request, "limit", 20, minimum=1, maksimum=BATAS_LIMIT)
+        data = await self._jalankan(self.alerts.get_alert_terpicu_terbaru, limit)
+        return _respon(request, kemas_json({"data": data}))
+
+    # ============================================
+    # BERITA
+    # ============================================
+    async def daftar_berita(self, request):
+        limit = _param_int(request, "limit", BERITA_LIMIT, minimum=1, maksimum=BATAS_LIMIT)
+        sebelum = request.query.get("sebelum", "").strip()
+        if sebelum:
+            tanggal, _, id_ = sebelum.rpartition(",")
+            if not tanggal or not id_.isdigit():
+                raise ValueError("'sebelum' harus berformat 'tanggal,id'")
+            sebelum = (tanggal, int(id_))
+        data = await self._jalankan(
+            lambda: self.berita.get_berita_page(sebelum=sebelum or None, limit=limit,
+                                                kategori=request.query.get("kategori") or None,
+                                                cari=request.query.get("cari") or None)
+        )
+        berikutnya = f"{data[-1]['tanggal']},{data[-1]['id']}" if len(data) == limit else None
+        return _respon(request, await self._jalankan(kemas_json, {"data": data, "berikutnya": berikutnya}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="REST API JSON data emas")
+    parser.add_argument("--host", default=API_HOST, help="Alamat bind server")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Port server")
+    parser.add_argument("--db", default=DB_HARGA, help="Path database harga")
+    parser.add_argument("--db-alerts", default=DB_ALERTS, help="Path database price alert")
+    parser.add_argument("--db-berita", default=DB_BERITA, help="Path database berita")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    if not ENABLE_API:
+        logger.error("REST API dimatikan, set ENABLE_API = True di config.py")
+        return 1
+    api = ApiEmas(args.db, args.db_alerts, args.db_berita)
+    # access_log dimatikan: log per request terlalu mahal untuk ratusan request/detik
+    web.run_app(api.buat_app(), host=args.host, port=args.port, access_log=None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
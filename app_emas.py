@@ -1,18 +1,27 @@
 import streamlit as st
+import html
 import sqlite3
 import pandas as pd
-import requests
-import re
 from datetime import datetime, timedelta
-try:
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except:
-    PLOTLY_AVAILABLE = False
 
+from config import DB_HARGA, ALERT_PER_HALAMAN, BERITA_LIMIT, DEFAULT_REFRESH_INTERVAL
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from history_cache import HistoryCache
+from chart_emas import PLOTLY_AVAILABLE, RENTANG_CHART, KOLOM_CHART, ambil_data_chart, buat_figure
 from news_berita import BeritaEmas
-from price_alert import PriceAlert
-from operasi_schedule import OperasiSchedule
+from kolektor_berita import DDGS_AVAILABLE, get_kolektor
+from price_alert import PriceAlert, STATUS_AKTIF
+from operasi_schedule import NAMA_HARI, OperasiSchedule
+from price_poller import get_poller, baca_harga_terbaru
+from sumber_harga import AIOHTTP_AVAILABLE, get_agregator
+from export_data import (
+    FORMAT_EKSPOR, PARQUET_AVAILABLE, EXCEL_AVAILABLE, EXCEL_MAKS_BARIS,
+    rentang_data, hitung_baris, tanggal_ke_epoch, ekspor_ke_spool,
+)
+from rollup_ohlc import OFFSET_LOKAL
+from statistik_harga import JENDELA_STATISTIK, baca_statistik
+from indikator import INDIKATOR, IndikatorCache
 
 # ============================================
 # KONFIGURASI STREAMLIT
@@ -181,30 +190,70 @@ berita_emas, price_alerts, operasi_schedule = load_modules()
 # ============================================
 # FUNGSI AMBIL DATA
 # ============================================
-@st.cache_data(ttl=300)
+@st.cache_resource
+def siapkan_database():
+    """Buat pool koneksi database harga + migrasi skema sekali per proses"""
+    try:
+        return get_pool(DB_HARGA, migrasi=migrasi_db_harga)
+    except sqlite3.Error:
+        return None
+
+siapkan_database()
+
+@st.cache_resource
+def load_history_cache():
+    """Ring buffer riwayat harga bersama untuk semua sesi"""
+    return HistoryCache(DB_HARGA)
+
 def load_data():
-    """Load data dari database"""
+    """Load data terakhir dari cache riwayat (hanya baris baru yang dibaca dari database)"""
+    return load_history_cache().get_dataframe()
+
+@st.cache_data(max_entries=len(RENTANG_CHART) * 4)
+def load_chart_data(rentang, versi):
+    """Load OHLC untuk rentang chart, resolusi rollup dipilih otomatis.
+    `versi` (id tick terakhir) membuat cache hanya invalid jika ada data baru"""
     try:
-        conn = sqlite3.connect("riwayat_emas.db")
-        df = pd.read_sql_query(
-            "SELECT waktu, harga FROM harga_emas ORDER BY id DESC LIMIT 100",
-            conn
-        )
-        conn.close()
-        return df.iloc[::-1] if not df.empty else pd.DataFrame(columns=['waktu', 'harga'])
+        with get_pool(DB_HARGA).koneksi() as conn:
+            return ambil_data_chart(conn, rentang)
     except:
-        return pd.DataFrame(columns=['waktu', 'harga'])
+        return pd.DataFrame(columns=KOLOM_CHART), "tick"
 
-def get_live_price():
-    """Ambil harga emas terbaru"""
+def ekspor_bytes(format, mulai, akhir):
+    """Isi file export sebagai bytes. File sementara (spool) langsung ditutup,
+    tidak menunggu garbage collector"""
+    with ekspor_ke_spool(format, DB_HARGA, mulai, akhir) as f:
+        return f.read()
+
+@st.cache_data(max_entries=4)
+def load_excel(mulai, akhir, versi):
+    """File xlsx rentang tanggal. `versi` (id tick terakhir) membuat klik berulang
+    tanpa data baru memakai hasil yang sama, tidak serialisasi ulang"""
+    return ekspor_bytes("xlsx", mulai, akhir)
+
+@st.cache_resource
+def load_indikator_cache():
+    """Seri indikator inkremental bersama untuk semua sesi"""
+    return IndikatorCache(DB_HARGA)
+
+@st.cache_data(max_entries=len(INDIKATOR) * 4)
+def load_indikator(nama, resolusi, mulai, versi):
+    """Indikator untuk chart. `versi` (id tick terakhir) membuat cache hanya invalid
+    jika ada data baru, dan saat itu pun hanya bucket baru yang dihitung"""
+    return load_indikator_cache().ambil(nama, resolusi, mulai)
+
+@st.cache_data(max_entries=2)
+def load_statistik(versi):
+    """Statistik per jendela dari tabel statistik_harga (diperbarui worker ingest)"""
     try:
-        url = "https://www.hargaemas.com/"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=5)
-        match = re.search(r'2\.9[0-9]{2}\.[0-9]{3}', response.text)
-        return match.group(0) if match else "N/A"
+        with get_pool(DB_HARGA).koneksi() as conn:
+            return baca_statistik(conn)
     except:
-        return "N/A"
+        return {}
+
+def get_live_price():
+    """Ambil harga emas terbaru dari snapshot poller bersama (tanpa I/O jaringan)"""
+    return baca_harga_terbaru()
 
 def format_harga(harga):
     """Format harga ke Rp"""
@@ -212,10 +261,16 @@ def format_harga(harga):
         return harga
     return f"Rp {int(harga):,}".replace(",", ".")
 
+def format_epoch(epoch):
+    """Epoch -> teks jam lokal (TIMEZONE)"""
+    if epoch is None or pd.isna(epoch):
+        return "-"
+    return pd.Timestamp(int(epoch) + OFFSET_LOKAL, unit='s').strftime("%Y-%m-%d %H:%M")
+
 def create_interactive_chart(df):
     """Buat chart interaktif dengan Plotly atau Streamlit Line Chart"""
     if df.empty:
-        st.warning("📊 Database kosong. Jalankan aplikasi desktop untuk mengisi data.")
+        st.warning("📊 Database kosong. Jalankan `python ingest_harga.py` untuk mengisi data.")
         return None
     
     if PLOTLY_AVAILABLE:
@@ -256,67 +311,15 @@ def create_interactive_chart(df):
     else:
         # Fallback ke chart bawaan Streamlit
         return "streamlit"
-def create_interactive_chart(df):
-    """Buat chart interaktif ala TradingView dengan navigasi rentang waktu"""
+def create_interactive_chart(df, gaya="Garis", indikator=None):
+    """Buat chart interaktif ala TradingView (garis atau candlestick OHLC + indikator opsional)"""
     if df.empty:
-        st.warning("📊 Database kosong. Jalankan aplikasi desktop untuk mengisi data.")
+        st.warning("📊 Database kosong. Jalankan `python ingest_harga.py` untuk mengisi data.")
         return None
-    
-    # Pastikan kolom waktu adalah format datetime
-    df['waktu'] = pd.to_datetime(df['waktu'])
-    df = df.sort_values('waktu')
-
-    fig = go.Figure()
-    
-    # Menambahkan Garis Utama (Line Chart)
-    fig.add_trace(go.Scatter(
-        x=df['waktu'],
-        y=df['harga'],
-        mode='lines',
-        name='Harga Emas',
-        line=dict(color='#FFD700', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(255, 215, 0, 0.15)',
-        hovertemplate='<b>Waktu:</b> %{x}<br><b>Harga:</b> Rp %{y:,.0f}<extra></extra>'
-    ))
-    
-    # Konfigurasi Layout agar Mirip Trading Chart
-    fig.update_layout(
-        template='plotly_dark',
-        hovermode='x unified',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=10, r=10, t=40, b=10),
-        height=500,
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            # FITUR RANGESELECTOR: Tombol navigasi waktu
-            rangeselector=dict(
-                buttons=list([
-                    dict(count=1, label="1 Jam", step="hour", stepmode="backward"),
-                    dict(count=1, label="1 Hari", step="day", stepmode="backward"),
-                    dict(count=7, label="1 Minggu", step="day", stepmode="backward"),
-                    dict(count=1, label="1 Bulan", step="month", stepmode="backward"),
-                    dict(count=1, label="1 Tahun", step="year", stepmode="backward"),
-                    dict(step="all", label="Semua")
-                ]),
-                bgcolor="#16213e",
-                activecolor="#FFD700",
-                font=dict(color="white", size=11)
-            ),
-            rangeslider=dict(visible=False), # Slider di bawah (opsional)
-            type='date'
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            side='right', # Harga biasanya di kanan pada chart trading
-            tickformat=",.0f"
-        )
-    )
-    
-    return fig
+    if not PLOTLY_AVAILABLE:
+        # Fallback ke chart bawaan Streamlit (tanpa candlestick & indikator)
+        return "streamlit"
+    return buat_figure(df, gaya, indikator)
 
 # ============================================
 # HEADER UTAMA
@@ -345,30 +348,38 @@ status_html = f"""
 st.markdown(status_html, unsafe_allow_html=True)
 
 if not is_operasi:
-    st.error("""
-    ⏰ Sistem Maintenance Rutin
-    - Website ditutup pada hari Sabtu & Minggu
-    - Dibuka kembali Senin jam 00:00 WIB
+    # Jadwal buka dari transisi yang sudah dihitung (HARI_TUTUP + file hari libur)
+    status_tutup = operasi_schedule.get_status_operasi()
+    sisa_tutup = operasi_schedule.detik_sampai_buka()
+    if status_tutup["transisi"] == "-":
+        info_buka = "- Jadwal buka kembali belum ditentukan"
+    else:
+        jam_tutup, menit_tutup = divmod(int(sisa_tutup // 60), 60)
+        info_buka = (f"- Dibuka kembali {status_tutup['transisi']} WIB "
+                     f"(sekitar {jam_tutup} jam {menit_tutup} menit lagi)")
+    st.error(f"""
+    ⏰ {pesan_operasi}
+    {info_buka}
     - Terima kasih atas pengertian Anda!
     """)
 
 # ============================================
-# TAB NAVIGASI
+# LIVE UPDATE (FRAGMENT)
 # ============================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Dashboard",
-    "📰 Berita & Analisis",
-    "🔔 Price Alert",
-    "📥 Download",
-    "⚙️ Pengaturan"
-])
+# Hanya metrik harga & grafik yang dijalankan ulang setiap interval refresh,
+# bagian lain halaman tetap statis. Interval diatur slider di tab Pengaturan.
+if "refresh_interval" not in st.session_state:
+    st.session_state.refresh_interval = DEFAULT_REFRESH_INTERVAL
+if "live_update" not in st.session_state:
+    st.session_state.live_update = True
+# Ditulis ulang supaya nilai widget tetap ada walau widget-nya tidak dirender
+st.session_state.refresh_interval = st.session_state.refresh_interval
+st.session_state.live_update = st.session_state.live_update
+interval_live = st.session_state.refresh_interval if st.session_state.live_update else None
 
-# ============================================
-# TAB 1: DASHBOARD UTAMA
-# ============================================
-with tab1:
-    st.markdown("###  Dashboard Utama")
-    
+@st.fragment(run_every=interval_live)
+def tampilkan_harga_live():
+    """Metrik harga dari snapshot poller bersama (tanpa I/O jaringan)"""
     # Load data
     df_history = load_data()
     live_price_str = get_live_price()
@@ -379,6 +390,12 @@ with tab1:
     except:
         live_price = None
     
+    # Peringatan jika harga dari poller sudah basi
+    snapshot = get_poller().get_snapshot()
+    if live_price_str != "N/A" and snapshot.is_stale():
+        st.warning(f"⚠️ Harga terakhir diambil {int(snapshot.umur() // 60)} menit lalu. "
+                   f"Sumber harga sedang bermasalah: {snapshot.error_terakhir}")
+    
     # Kalkulasi perubahan harga
     price_change = None
     price_change_pct = None
@@ -450,35 +467,66 @@ with tab1:
                 <p style="font-size: 1.5em; color: #FFD700;">-</p>
             </div>
             """, unsafe_allow_html=True)
-    
-    st.markdown("---")
+
+@st.fragment(run_every=interval_live)
+def tampilkan_grafik():
+    """Grafik, statistik & tabel. Cache chart berbasis versi data,
+    jadi rerun tanpa tick baru tidak membaca ulang database"""
+    df_history = load_data()
     
     # Grafik Utama
     st.markdown("### 📈 Grafik Pergerakan Harga")
-    fig = create_interactive_chart(df_history)
+    col_rentang, col_gaya = st.columns([3, 1])
+    with col_rentang:
+        rentang_chart = st.radio("Rentang", list(RENTANG_CHART), index=1,
+                                 horizontal=True, key="rentang_chart")
+    with col_gaya:
+        gaya_chart = st.radio("Tipe Chart", ["Garis", "Candlestick"],
+                              horizontal=True, key="gaya_chart")
+    indikator_chart = st.multiselect("Indikator", list(INDIKATOR), key="indikator_chart")
+    
+    versi_data = load_history_cache().versi
+    df_chart, resolusi_chart = load_chart_data(rentang_chart, versi_data)
+    overlay = {}
+    if not df_chart.empty:
+        for nama in indikator_chart:
+            overlay[nama] = load_indikator(nama, resolusi_chart, int(df_chart['waktu_epoch'].iloc[0]), versi_data)
+    fig = create_interactive_chart(df_chart, gaya_chart, overlay)
     if fig:
         if fig == "streamlit":
             # Gunakan chart bawaan Streamlit (fallback)
-            st.line_chart(data=df_history, x='waktu', y='harga', use_container_width=True)
+            st.line_chart(data=df_chart, x='waktu', y='harga', use_container_width=True)
         else:
             # Gunakan Plotly chart
             st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Resolusi: {resolusi_chart} • {len(df_chart)} titik")
     
-    # Statistik
+    # Statistik (dihitung worker ingest per tick, di sini hanya dibaca)
     st.markdown("### 📊 Statistik Harga")
-    if not df_history.empty:
+    statistik = load_statistik(load_history_cache().versi)
+    if statistik:
+        jendela_stat = st.radio(
+            "Jendela",
+            list(statistik),
+            format_func=lambda k: JENDELA_STATISTIK[k][0],
+            horizontal=True,
+            key="jendela_statistik",
+            label_visibility="collapsed"
+        )
+        stat = statistik[jendela_stat]
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.metric("Harga Tertinggi", format_harga(df_history['harga'].max()))
+            st.metric("Harga Tertinggi", format_harga(stat['maksimum']) if stat['jumlah'] else "-")
         with col2:
-            st.metric("Harga Terendah", format_harga(df_history['harga'].min()))
+            st.metric("Harga Terendah", format_harga(stat['minimum']) if stat['jumlah'] else "-")
         with col3:
-            st.metric("Harga Rata-rata", format_harga(df_history['harga'].mean()))
+            st.metric("Harga Rata-rata", format_harga(stat['rata']) if stat['jumlah'] else "-",
+                      f"σ {format_harga(stat['stddev'])}" if stat['jumlah'] else None, delta_color="off")
         with col4:
-            st.metric("Total Entry", len(df_history))
+            st.metric("Total Entry", f"{stat['jumlah']:,}".replace(",", "."))
         with col5:
-            st.metric("Update Terakhir", df_history['waktu'].iloc[-1])
+            st.metric("Update Terakhir", format_epoch(stat['epoch_akhir']))
     
     # Data Tabel
     st.markdown("### 📋 Tabel Data Terakhir")
@@ -487,14 +535,22 @@ with tab1:
         display_df['harga'] = display_df['harga'].apply(lambda x: format_harga(x))
         st.dataframe(display_df, use_container_width=True, height=400)
 
+# ============================================
+# TAB 1: DASHBOARD UTAMA
+# ============================================
+def halaman_dashboard():
+    st.markdown("###  Dashboard Utama")
+    tampilkan_harga_live()
+    st.markdown("---")
+    tampilkan_grafik()
+
 # ============================================
 # TAB 2: BERITA & ANALISIS
 # ============================================
-with tab2:
+def halaman_berita():
     st.markdown("### 📰 Berita & Analisis Emas")
     
-    # Filter kategori
-    all_berita = berita_emas.get_berita_list()
+    # Filter kategori & pencarian (FTS5 di database berita)
     kategori_list = berita_emas.get_kategori_list()
     
     col1, col2, col3 = st.columns([2, 2, 2])
@@ -506,14 +562,35 @@ with tab2:
         )
     
     with col2:
-        if st.button("🔄 Refresh Berita"):
-            st.cache_data.clear()
+        cari_berita = st.text_input("Cari Berita", key="cari_berita").strip() or None
     
-    # Tampilkan berita
-    if kategori_filter == "Semua Berita":
-        berita_display = all_berita
-    else:
-        berita_display = berita_emas.get_berita_by_kategori(kategori_filter)
+    with col3:
+        # Pengambilan berita jalan di thread kolektor, tombol hanya memajukan jadwalnya
+        kolektor = get_kolektor()
+        if st.button("🔄 Refresh Berita", disabled=not DDGS_AVAILABLE):
+            kolektor.picu()
+            st.rerun()
+        status_kolektor = kolektor.get_status()
+        if status_kolektor.waktu is not None:
+            st.caption(f"Dikumpulkan {datetime.fromtimestamp(status_kolektor.waktu):%H:%M} • "
+                       f"{status_kolektor.baru} berita baru")
+        elif not DDGS_AVAILABLE:
+            st.caption("Untuk mengumpulkan berita otomatis, jalankan: pip install duckduckgo_search")
+    kategori_filter = None if kategori_filter == "Semua Berita" else kategori_filter
+    
+    # Keyset pagination: simpan kursor (tanggal, id) awal tiap halaman yang sudah dibuka
+    filter_aktif = (kategori_filter, cari_berita)
+    if st.session_state.get('berita_filter') != filter_aktif:
+        st.session_state.berita_filter = filter_aktif
+        st.session_state.berita_cursor = [None]
+    cursor_stack = st.session_state.berita_cursor
+    
+    berita_display = berita_emas.get_berita_page(
+        sebelum=cursor_stack[-1],
+        limit=BERITA_LIMIT,
+        kategori=kategori_filter,
+        cari=cari_berita
+    )
     
     if berita_display:
         for idx, berita in enumerate(berita_display):
@@ -523,20 +600,43 @@ with tab2:
                 "Netral": "badge-netral"
             }.get(berita['dampak'], "badge-netral")
             
+            judul = (f'<a href="{html.escape(berita["url"])}" target="_blank">{html.escape(berita["judul"])}</a>'
+                     if berita['url'] else html.escape(berita['judul']))
+            sumber = f" | 📰 {html.escape(berita['sumber'])}" if berita['sumber'] else ""
+            label_dampak = berita['dampak'] or "Belum dinilai"
+            if berita['keyakinan'] is not None:
+                # Dinilai model lokal (klasifikasi_berita.py)
+                label_dampak += f" 🤖 {berita['keyakinan']:.0%}"
             st.markdown(f"""
             <div class="news-card">
-                <h4>{berita['judul']}</h4>
-                <p>{berita['deskripsi']}</p>
+                <h4>{judul}</h4>
+                <p>{html.escape(berita['deskripsi'])}</p>
                 <div style="margin-top: 10px;">
-                    <span class="alert-badge {badge_class}">{berita['dampak']}</span>
+                    <span class="alert-badge {badge_class}">{label_dampak}</span>
                     <span style="color: #999; font-size: 0.9em;">
-                        📅 {berita['tanggal']} | 🏷️ {berita['kategori']}
+                        📅 {berita['tanggal']} | 🏷️ {berita['kategori']}{sumber}
                     </span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
+        
+        total_berita = berita_emas.hitung_berita(kategori=kategori_filter, cari=cari_berita)
+        st.caption(f"Halaman {len(cursor_stack)} • {total_berita} berita")
+        col_prev, col_next = st.columns(2)
+        with col_prev:
+            if st.button("⬅️ Sebelumnya", disabled=len(cursor_stack) == 1,
+                         use_container_width=True, key="berita_sebelumnya"):
+                cursor_stack.pop()
+                st.rerun()
+        with col_next:
+            ada_berikutnya = len(berita_display) == BERITA_LIMIT
+            if st.button("Berikutnya ➡️", disabled=not ada_berikutnya,
+                         use_container_width=True, key="berita_berikutnya"):
+                terakhir = berita_display[-1]
+                cursor_stack.append((terakhir['tanggal'], terakhir['id']))
+                st.rerun()
     else:
-        st.info("Tidak ada berita untuk kategori ini.")
+        st.info("Tidak ada berita untuk filter ini.")
     
     # Form tambah berita
     st.markdown("---")
@@ -563,16 +663,20 @@ with tab2:
     
     if st.button("📤 Tambahkan Berita"):
         if judul_berita and deskripsi_berita and kategori_berita:
-            berita_emas.add_berita(judul_berita, deskripsi_berita, kategori_berita, dampak_berita)
-            st.success("✅ Berita berhasil ditambahkan!")
-            st.rerun()
+            try:
+                berita_emas.add_berita(judul_berita, deskripsi_berita, kategori_berita, dampak_berita)
+            except ValueError as e:
+                st.error(f"⚠️ {e}")
+            else:
+                st.success("✅ Berita berhasil ditambahkan!")
+                st.rerun()
         else:
             st.error("⚠️ Mohon isi semua field terlebih dahulu!")
 
 # ============================================
 # TAB 3: PRICE ALERT
 # ============================================
-with tab3:
+def halaman_alert():
     st.markdown("### 🔔 Price Alert - Notifikasi Harga")
     st.write("Atur harga target untuk memberi tahu Anda kapan waktu yang tepat untuk beli atau jual emas!")
     
@@ -593,23 +697,51 @@ with tab3:
                 st.error("⚠️ Mohon isi nama Anda!")
     
     with col2:
-        st.markdown("### 📋 Alert Aktif Anda")
-        # Untuk demo, tampilkan semua alert
-        alerts = price_alerts.get_semua_alerts()
+        st.markdown("### 📋 Daftar Alert")
+        col_nama, col_status = st.columns(2)
+        with col_nama:
+            filter_nama = st.text_input("Filter Nama", key="filter_nama_alert").strip() or None
+        with col_status:
+            filter_status = st.selectbox(
+                "Filter Status",
+                ["Semua"] + price_alerts.get_status_list(),
+                key="filter_status_alert"
+            )
+        filter_status = None if filter_status == "Semua" else filter_status
         
-        if alerts:
-            for alert in alerts:
-                alert_id, nama, beli, jual, status, tgl_buat = alert[:6]
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #0f3460 0%, #16213e 100%);
-                            border-left: 5px solid #FFD700; padding: 15px; margin: 10px 0;
-                            border-radius: 8px; color: white;">
-                    <strong>👤 {nama}</strong> (ID: #{alert_id})<br>
-                    🛍️ BELI di: <span style="color: #00d084;">Rp {beli:,}</span><br>
-                    💰 JUAL di: <span style="color: #ff6b6b;">Rp {jual:,}</span><br>
-                    <small style="color: #999;">Dibuat: {tgl_buat}</small>
-                </div>
-                """, unsafe_allow_html=True)
+        # Keyset pagination: simpan id awal tiap halaman yang sudah dibuka
+        filter_aktif = (filter_nama, filter_status)
+        if st.session_state.get('alert_filter') != filter_aktif:
+            st.session_state.alert_filter = filter_aktif
+            st.session_state.alert_cursor = [0]
+        cursor_stack = st.session_state.alert_cursor
+        
+        total_alert = price_alerts.hitung_alerts(nama=filter_nama, status=filter_status)
+        halaman = price_alerts.get_alerts_page(
+            setelah_id=cursor_stack[-1],
+            limit=ALERT_PER_HALAMAN,
+            nama=filter_nama,
+            status=filter_status
+        )
+        
+        if halaman:
+            st.dataframe(
+                pd.DataFrame(halaman, columns=['ID', 'Nama', 'Target BELI', 'Target JUAL', 'Status', 'Dibuat']),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(f"Halaman {len(cursor_stack)} • {total_alert} alert")
+            
+            col_prev, col_next = st.columns(2)
+            with col_prev:
+                if st.button("⬅️ Sebelumnya", disabled=len(cursor_stack) == 1, use_container_width=True):
+                    cursor_stack.pop()
+                    st.rerun()
+            with col_next:
+                ada_berikutnya = len(halaman) == ALERT_PER_HALAMAN
+                if st.button("Berikutnya ➡️", disabled=not ada_berikutnya, use_container_width=True):
+                    cursor_stack.append(halaman[-1][0])
+                    st.rerun()
         else:
             st.info("Belum ada alert aktif. Buat alert baru untuk memulai!")
     
@@ -631,10 +763,18 @@ with tab3:
             </div>
             """, unsafe_allow_html=True)
             
-            if alerts:
+            if price_alerts.hitung_alerts(status=STATUS_AKTIF):
                 st.markdown("#### ⚠️ Alert Terpicu")
-                triggered = price_alerts.check_alert(live_price)
+                # Alert diproses worker ingest saat harga melewati target (sekali per crossing)
+                triggered = price_alerts.get_alert_terpicu_terbaru(limit=10)
                 if triggered:
+                    id_terbaru = triggered[0]['id']
+                    if 'alert_terpicu_dilihat' in st.session_state:
+                        for alert in triggered:
+                            if alert['id'] > st.session_state.alert_terpicu_dilihat:
+                                st.toast(alert['pesan'], icon="🔔")
+                    st.session_state.alert_terpicu_dilihat = id_terbaru
+                    
                     for alert in triggered:
                         if alert['tipe'] == 'BELI':
                             st.success(f"🟢 {alert['pesan']}")
@@ -646,65 +786,109 @@ with tab3:
 # ============================================
 # TAB 4: DOWNLOAD
 # ============================================
-with tab4:
+def halaman_download():
     st.markdown("### 📥 Download Data")
     
-    df_history = load_data()
+    epoch_awal, epoch_akhir = rentang_data(DB_HARGA)
+    if epoch_awal is not None:
+        tgl_awal = pd.Timestamp(epoch_awal + OFFSET_LOKAL, unit='s').date()
+        tgl_akhir = pd.Timestamp(epoch_akhir + OFFSET_LOKAL, unit='s').date()
+        rentang_tgl = st.date_input(
+            "Rentang Tanggal",
+            value=(tgl_awal, tgl_akhir),
+            min_value=tgl_awal,
+            max_value=tgl_akhir,
+            key="export_rentang"
+        )
+        # Saat user baru memilih tanggal awal, date_input hanya berisi satu tanggal
+        mulai = tanggal_ke_epoch(rentang_tgl[0]) if rentang_tgl else None
+        akhir = tanggal_ke_epoch(rentang_tgl[-1], akhir_hari=True) if rentang_tgl else None
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("### 📊 Export ke CSV")
-        if not df_history.empty:
-            csv = df_history.to_csv(index=False).encode('utf-8')
+        st.markdown("### 📊 Export Riwayat Harga")
+        if epoch_awal is not None:
+            format_export = st.selectbox(
+                "Format",
+                ["csv", "csv.gz", "parquet"],
+                format_func=lambda f: {"csv": "CSV", "csv.gz": "CSV (gzip)", "parquet": "Parquet"}[f],
+                key="export_format"
+            )
+            ekstensi, mime = FORMAT_EKSPOR[format_export]
+            # File baru dibuat saat tombol diklik (callable), streaming per chunk dari database
             st.download_button(
-                label="📥 Download CSV",
-                data=csv,
-                file_name=f'data_emas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                mime='text/csv',
+                label="📥 Download",
+                data=lambda: ekspor_bytes(format_export, mulai, akhir),
+                file_name=f'data_emas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{ekstensi}',
+                mime=mime,
+                disabled=format_export == "parquet" and not PARQUET_AVAILABLE,
                 use_container_width=True
             )
+            if not PARQUET_AVAILABLE:
+                st.caption("Untuk export Parquet, jalankan: pip install pyarrow")
         else:
             st.warning("Database kosong.")
     
     with col2:
         st.markdown("### 📋 Export ke Excel")
-        if not df_history.empty:
-            # Perlu install openpyxl untuk Excel
-            try:
-                excel_data = df_history.to_excel(
-                    f'data_emas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
-                    index=False
-                )
-                st.success("✅ File Excel siap diunduh dari folder aplikasi!")
-            except:
+        if epoch_awal is not None:
+            if not EXCEL_AVAILABLE:
                 st.info("Untuk export Excel, jalankan: pip install openpyxl")
+            elif hitung_baris(DB_HARGA, mulai, akhir) > EXCEL_MAKS_BARIS:
+                st.warning(f"Rentang berisi lebih dari {EXCEL_MAKS_BARIS:,} baris (batas Excel). Pilih rentang lebih pendek atau pakai CSV/Parquet.")
+            else:
+                versi = load_history_cache().versi
+                st.download_button(
+                    label="📥 Download Excel",
+                    data=lambda: load_excel(mulai, akhir, versi),
+                    file_name=f'data_emas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
+                    mime=FORMAT_EKSPOR["xlsx"][1],
+                    use_container_width=True
+                )
         else:
             st.warning("Database kosong.")
     
     st.markdown("---")
     st.markdown("### 📈 Ringkasan Data")
-    if not df_history.empty:
+    statistik = load_statistik(load_history_cache().versi)
+    if statistik:
+        df_ringkasan = pd.DataFrame(statistik.values())
+        df_ringkasan['jendela'] = df_ringkasan['jendela'].map(lambda k: JENDELA_STATISTIK[k][0])
+        df_ringkasan['epoch_awal'] = df_ringkasan['epoch_awal'].map(format_epoch)
+        df_ringkasan['epoch_akhir'] = df_ringkasan['epoch_akhir'].map(format_epoch)
         st.dataframe(
-            df_history.describe().T,
+            df_ringkasan.rename(columns={'epoch_awal': 'dari', 'epoch_akhir': 'sampai'}).set_index('jendela'),
             use_container_width=True
         )
 
 # ============================================
 # TAB 5: PENGATURAN
 # ============================================
-with tab5:
+def halaman_pengaturan():
     st.markdown("### ⚙️ Pengaturan Sistem")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 🔄 Pengaturan Update Data")
-        refresh_interval = st.slider("Interval Refresh (detik)", 30, 300, 60)
-        st.info(f"Data akan di-refresh setiap {refresh_interval} detik")
+        st.toggle("Live update", key="live_update",
+                  help="Metrik harga & grafik di Dashboard diperbarui otomatis tanpa reload halaman")
+        refresh_interval = st.slider("Interval Refresh (detik)", 30, 300, key="refresh_interval",
+                                     disabled=not st.session_state.live_update)
+        if st.session_state.live_update:
+            st.info(f"Harga & grafik di-refresh setiap {refresh_interval} detik")
+        else:
+            st.info("Live update mati, data diperbarui saat halaman dimuat ulang")
+        snapshot = get_poller().get_snapshot()
+        if snapshot.jeda:
+            # Interval di atas hanya untuk tampilan; fetch ke sumber mengikuti volatilitas harga
+            st.caption(f"Harga dari sumber diambil ulang sekitar {snapshot.jeda:.0f} detik "
+                       "setelah fetch terakhir (adaptif)")
         
         if st.button("🔄 Refresh Data Sekarang", use_container_width=True):
-            st.cache_data.clear()
+            # Cache turunan (chart) ikut invalid otomatis karena versi berubah
+            load_history_cache().refresh(paksa=True)
             st.rerun()
     
     with col2:
@@ -715,6 +899,7 @@ with tab5:
         **Waktu:** {status_info['waktu_sekarang']}
         **Hari:** {status_info['hari']}
         **Jam:** {status_info['jam']}
+        **Status berubah:** {status_info['transisi']}
         """)
     
     st.markdown("---")
@@ -728,9 +913,18 @@ with tab5:
     with col3:
         st.metric("Versi App", "2.0 Pro")
     
+    st.markdown("#### 🌐 Sumber Harga")
+    if AIOHTTP_AVAILABLE:
+        # Statistik milik proses dashboard (poller bersama), bukan worker ingest
+        df_sumber = pd.DataFrame.from_dict(get_agregator().get_statistik(), orient='index')
+        st.dataframe(df_sumber, use_container_width=True)
+    else:
+        st.info("Untuk ambil harga dari beberapa sumber paralel, jalankan: pip install aiohttp")
+    
     st.markdown("---")
     st.markdown("#### 💡 Tips & Panduan")
-    st.info("""
+    hari_tutup = ", ".join(NAMA_HARI[h] for h in sorted(operasi_schedule.hari_tutup)) or "-"
+    st.info(f"""
     **📱 Akses dari Mobile:**
     - Pastikan laptop dan HP terhubung ke WiFi yang sama
     - Buka di browser: http://[IP-LAPTOP]:8501
@@ -741,14 +935,32 @@ with tab5:
     - Alert akan notif ketika harga mencapai target
     
     **🔄 Update Otomatis:**
-    - Gunakan aplikasi desktop (emas.py) untuk auto-update harga
+    - Jalankan worker `python ingest_harga.py` untuk auto-update harga
     - Website akan menampilkan data real-time
     
     **📅 Jadwal Operasional:**
-    - Senin-Jumat: Website OPERASIONAL 24 jam
-    - Sabtu-Minggu: Website TUTUP untuk maintenance
+    - Tutup setiap: {hari_tutup}, dan hari libur di `{operasi_schedule.file_libur}`
+    - Buka kembali jam {operasi_schedule.jam_buka:02d}:{operasi_schedule.menit_buka:02d} WIB di hari operasional
     """)
 
+# ============================================
+# TAB NAVIGASI
+# ============================================
+# Tab melacak tab aktif (on_change="rerun"), jadi hanya halaman yang sedang
+# dilihat yang memuat data & dirender; tab tersembunyi tidak dijalankan.
+HALAMAN = {
+    "📊 Dashboard": halaman_dashboard,
+    "📰 Berita & Analisis": halaman_berita,
+    "🔔 Price Alert": halaman_alert,
+    "📥 Download": halaman_download,
+    "⚙️ Pengaturan": halaman_pengaturan,
+}
+
+for tab, halaman in zip(st.tabs(list(HALAMAN), key="tab_aktif", on_change="rerun"), HALAMAN.values()):
+    if tab.open:
+        with tab:
+            halaman()
+
 # ============================================
 # FOOTER
 # ============================================
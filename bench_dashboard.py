@@ -0,0 +1,650 @@
+"""
+BENCH_DASHBOARD.PY - Benchmark offline untuk jalur data dashboard
+Semua data dibuat sintetis di folder sementara dan scraping diarahkan ke
+server HTTP lokal, jadi hasilnya bisa diulang tanpa koneksi internet.
+
+    python bench_dashboard.py
+    python bench_dashboard.py --ukuran 1e3,1e5,1e7 --data-dir bench_data
+    python bench_dashboard.py --output hasil_sebelum.json
+
+Parser harga diukur dengan korpus halaman di corpus_harga/ (nilai yang
+benar ada di corpus_harga/harapan.json). Hasil ditulis sebagai JSON
+(default bench_output.json) supaya bisa dibandingkan antar perubahan.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+
+from config import HARGA_REGEX_PATTERN, HARGA_CHUNK_BYTES, BERITA_WORKER
+from api_emas import ApiEmas
+from chart_emas import PLOTLY_AVAILABLE, RENTANG_CHART, ambil_data_chart, buat_figure
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from export_data import FORMAT_EKSPOR, EXCEL_MAKS_BARIS, ekspor
+from history_cache import HistoryCache
+from harga_parser import AturanCSS, AturanRegex, ParserHarga, buat_parser_default
+from indikator import INDIKATOR, IndikatorCache
+from jadwal_polling import PenjadwalAdaptif, get_budget
+from klasifikasi_berita import OLLAMA_AVAILABLE, PengklasifikasiBerita
+from kolektor_berita import KolektorBerita
+from news_berita import BeritaEmas, hash_konten
+from price_alert import PriceAlert
+from price_poller import ambil_harga_live
+from statistik_harga import StatistikHarga, baca_statistik
+from sumber_harga import AIOHTTP_AVAILABLE, AgregatorHarga, Sumber
+
+HARGA_AWAL = 2700000  # Sama dengan seed chart_hourly.py
+
+
+# ============================================
+# DATA SINTETIS
+# ============================================
+def buat_riwayat_sintetis(db_path, jumlah, interval=60, seed=42):
+    """Isi harga_emas dengan random walk ala chart_hourly.py (langkah -20rb..+30rb),
+    digeser supaya rata-rata langkah nol dan harga tidak melayang untuk jutaan tick"""
+    rng = np.random.default_rng(seed)
+    akhir = int(time.time()) // interval * interval
+    epoch = akhir - interval * np.arange(jumlah - 1, -1, -1, dtype=np.int64)
+    langkah = rng.integers(-20000, 30001, size=jumlah) - 5000
+    harga = np.maximum(HARGA_AWAL + np.cumsum(langkah) // 10, 100000)
+
+    conn = sqlite3.connect(db_path)
+    # Kolom waktu_epoch dibuat langsung, index & rollup diisi sekaligus oleh migrasi
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS harga_emas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        waktu TEXT,
+        harga INTEGER,
+        waktu_epoch INTEGER
+    )
+    """)
+    potong = 100000
+    for i in range(0, jumlah, potong):
+        e = epoch[i:i + potong]
+        teks = np.datetime_as_string(e.astype("datetime64[s]"), unit="s")
+        conn.executemany(
+            "INSERT INTO harga_emas (waktu, harga, waktu_epoch) VALUES (?, ?, ?)",
+            zip(np.char.replace(teks, "T", " ").tolist(), harga[i:i + potong].tolist(), e.tolist())
+        )
+    conn.commit()
+    migrasi_db_harga(conn)
+    conn.close()
+
+
+def buat_alert_sintetis(db_path, jumlah, seed=42):
+    rng = np.random.default_rng(seed)
+    beli = rng.integers(2500, 3000, size=jumlah) * 1000
+    jual = beli + rng.integers(10, 300, size=jumlah) * 1000
+    alerts = PriceAlert(db_path)
+    with alerts.pool.transaksi() as conn:
+        conn.executemany(
+            "INSERT INTO alerts (nama, harga_beli, harga_jual, status, tgl_buat) VALUES (?, ?, ?, 'AKTIF', ?)",
+            ((f"user{i % 500}", int(b), int(j), "2026-01-01 00:00:00")
+             for i, (b, j) in enumerate(zip(beli, jual)))
+        )
+    return alerts
+
+
+def buat_berita_sintetis(db_path, jumlah, seed=42):
+    rng = np.random.default_rng(seed)
+    kategori = ["Suku Bunga", "Geopolitik", "Ekonomi", "Pasar", "Nilai Tukar"]
+    kata = ["emas", "dolar", "inflasi", "bank", "sentral", "cadangan", "investor", "harga", "naik", "turun"]
+    berita = BeritaEmas(db_path)
+    rows = []
+    for i in range(jumlah):
+        judul, deskripsi = " ".join(rng.choice(kata, 5)), " ".join(rng.choice(kata, 20))
+        rows.append((judul, deskripsi, kategori[i % len(kategori)],
+                     str(np.datetime64("2020-01-01") + int(rng.integers(0, 2000))), hash_konten(judul, deskripsi)))
+    with berita.pool.transaksi() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO berita (judul, deskripsi, kategori, tanggal, dampak, hash_konten) "
+            "VALUES (?, ?, ?, ?, 'Netral', ?)",
+            rows
+        )
+    return berita
+
+
+# ============================================
+# SERVER HTTP LOKAL PENGGANTI HARGAEMAS.COM
+# ============================================
+HALAMAN_HARGA = """<html><body><h1>Harga Emas Hari Ini</h1>
+<table><tr><td>Emas 1 gram</td><td class="harga">Rp 2.951.000</td></tr></table>
+{isi}</body></html>"""
+
+
+class _HandlerStub(BaseHTTPRequestHandler):
+    """Path menentukan perilaku: /ok, /lambat, /timeout, /error, /tanpa-harga.
+    Query ?harga=2.955.000 mengganti harga di halaman (untuk uji multi-sumber),
+    ?validator=0 mematikan ETag/Last-Modified (memaksa jalur hash body)"""
+    protocol_version = "HTTP/1.1"  # Keep-alive, supaya pemakaian ulang koneksi ikut terukur
+    disable_nagle_algorithm = True  # Header & body ditulis terpisah, tanpa ini kena delayed ACK ~40 ms
+    jeda_lambat = 0.3
+    jeda_timeout = 2.0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path
+        if path == "/berita":
+            self._kirim_berita(parse_qs(url.query).get("q", [""])[0])
+            return
+        if path == "/lambat":
+            time.sleep(self.jeda_lambat)
+        elif path == "/timeout":
+            time.sleep(self.jeda_timeout)
+        if path == "/error":
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        isi = "<p>lorem ipsum</p>" * 2000  # Kira-kira seukuran halaman asli
+        body = HALAMAN_HARGA.format(isi=isi)
+        harga = parse_qs(url.query).get("harga")
+        if harga:
+            body = body.replace("2.951.000", harga[0])
+        if path == "/tanpa-harga":
+            body = body.replace("2.951.000", "-")
+        data = body.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        pakai_validator = parse_qs(url.query).get("validator") != ["0"]
+        if pakai_validator and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        if pakai_validator:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        """/api/chat ala ollama: setiap berita bernomor di prompt dijawab label bergiliran"""
+        if urlsplit(self.path).path != "/api/chat":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        permintaan = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        time.sleep(0.05)  # Latensi inferensi
+        nomor = re.findall(r"^(\d+)\. ", permintaan["messages"][-1]["content"], re.MULTILINE)
+        label = ("Positif", "Negatif", "Netral")
+        jawaban = {"hasil": [{"no": int(n), "dampak": label[int(n) % 3], "keyakinan": 0.75} for n in nomor]}
+        data = json.dumps({
+            "model": permintaan.get("model"),
+            "created_at": datetime.now().isoformat(),
+            "message": {"role": "assistant", "content": json.dumps(jawaban)},
+            "done": True,
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _kirim_berita(self, query):
+        """Hasil pencarian berita (JSON) dari kumpulan 60 artikel tetap, antar query
+        sebagian tumpang tindih; sebagian artikel dimuat ulang situs lain (URL beda, isi sama)"""
+        time.sleep(0.05)  # Latensi mesin pencari
+        mulai = int(hashlib.md5(query.encode("utf-8")).hexdigest(), 16) % 40
+        artikel = []
+        for i in range(mulai, mulai + 20):
+            for situs in ("berita.example", "cermin.example") if i % 7 == 0 else ("berita.example",):
+                artikel.append({
+                    "judul": f"Harga emas bergerak, laporan {i}",
+                    "deskripsi": f"Ringkasan pergerakan harga emas nomor {i} untuk investor.",
+                    "url": f"https://{situs}/artikel/{i}?utm_source=bench",
+                    "tanggal": f"2026-02-{i % 28 + 1:02d}",
+                    "sumber": situs,
+                })
+        data = json.dumps(artikel).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ServerStub(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Klien sengaja memutus koneksi pada mode /timeout (BrokenPipe) -> abaikan
+        pass
+
+
+def jalankan_server_stub():
+    server = _ServerStub(("127.0.0.1", 0), _HandlerStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ============================================
+# PENGUKURAN
+# ============================================
+def ukur(fungsi, ulang):
+    """Jalankan fungsi beberapa kali, return statistik durasi (ms) + error terakhir"""
+    durasi, error = [], None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        try:
+            fungsi()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        durasi.append((time.perf_counter() - mulai) * 1000)
+    return {
+        "ulang": ulang,
+        "min_ms": round(min(durasi), 3),
+        "median_ms": round(statistics.median(durasi), 3),
+        "mean_ms": round(statistics.fmean(durasi), 3),
+        "error": error,
+    }
+
+
+def bench_riwayat(db_path, ukuran, ulang, hasil):
+    def catat(nama, fungsi, n=ulang):
+        r = ukur(fungsi, n)
+        r.update(nama=nama, ukuran=ukuran)
+        hasil.append(r)
+        print(f"  {nama:<32} median {r['median_ms']:>10.3f} ms" + (f"  ({r['error']})" if r["error"] else ""))
+
+    catat("load_data_awal", lambda: HistoryCache(db_path, min_interval=0).get_dataframe())
+
+    cache = HistoryCache(db_path, min_interval=0)
+    df = cache.get_dataframe()
+    catat("load_data_tanpa_baris_baru", cache.get_dataframe)
+
+    pool = get_pool(db_path)
+
+    def pakai_conn(fungsi, *args):
+        """Pinjam koneksi per panggilan, sama seperti dashboard"""
+        with pool.koneksi() as conn:
+            return fungsi(conn, *args)
+
+    for rentang in RENTANG_CHART:
+        catat(f"chart_data[{rentang}]", lambda r=rentang: pakai_conn(ambil_data_chart, r))
+
+    df_chart, _ = pakai_conn(ambil_data_chart, "Semua")
+    if PLOTLY_AVAILABLE:
+        catat("chart_figure_garis", lambda: buat_figure(df_chart, "Garis"))
+        catat("chart_figure_candlestick", lambda: buat_figure(df_chart, "Candlestick"))
+
+    _, resolusi = pakai_conn(ambil_data_chart, "1 Minggu")
+    for nama in INDIKATOR:
+        catat(f"indikator_backfill[{nama}]", lambda n=nama: IndikatorCache(db_path).ambil(n, resolusi))
+    indikator = IndikatorCache(db_path)
+    semua = {nama: indikator.ambil(nama, resolusi) for nama in INDIKATOR}
+    catat("indikator_tanpa_bucket_baru", lambda: [indikator.ambil(nama, resolusi) for nama in INDIKATOR])
+    if PLOTLY_AVAILABLE:
+        catat("chart_figure_semua_indikator", lambda: buat_figure(df_chart, "Candlestick", semua))
+
+    def statistik():
+        df['harga'].max(), df['harga'].min(), df['harga'].mean(), len(df)
+        df.describe()
+    catat("statistik_dataframe", statistik)
+    catat("statistik_tabel", lambda: pakai_conn(baca_statistik))
+    catat("statistik_muat_dari_db", lambda: pakai_conn(StatistikHarga().muat_dari_db), n=max(1, ulang // 2))
+
+    stat = pakai_conn(StatistikHarga().muat_dari_db)
+    def tambah_1000_tick():
+        awal = stat.epoch_terakhir or 0
+        for i in range(1, 1001):
+            stat.tambah(awal + i * 60, 2950000 + i)
+    catat("statistik_tambah_1000_tick", tambah_1000_tick)
+    catat("export_csv_load_data", lambda: df.to_csv(index=False).encode('utf-8'))
+
+    if ukuran <= 10 ** 6:
+        def export_penuh():
+            semua = pakai_conn(lambda conn: pd.read_sql_query("SELECT waktu, harga FROM harga_emas ORDER BY id", conn))
+            semua.to_csv(index=False).encode('utf-8')
+        catat("export_csv_semua", export_penuh, n=max(1, ulang // 2))
+
+    def export_stream(fmt):
+        with open(os.devnull, "wb") as f:
+            ekspor(f, fmt, db_path)
+    for fmt in FORMAT_EKSPOR:
+        if fmt == "xlsx" and ukuran > EXCEL_MAKS_BARIS:
+            continue
+        catat(f"export_stream[{fmt}]", lambda f=fmt: export_stream(f), n=max(1, ulang // 2))
+
+
+def bench_alert(db_path, jumlah, ulang, hasil):
+    alerts = buat_alert_sintetis(db_path, jumlah)
+    # Tick bergerak pelan (random walk) seperti harga sungguhan
+    rng = np.random.default_rng(7)
+    ticks = (2950000 + np.cumsum(rng.integers(-2000, 2001, size=100))).tolist()
+
+    def catat(nama, fungsi):
+        r = ukur(fungsi, ulang)
+        r.update(nama=nama, ukuran=jumlah)
+        hasil.append(r)
+        print(f"  {nama:<32} median {r['median_ms']:>10.3f} ms")
+
+    catat("alert_check_1_tick", lambda: alerts.check_alert(2950000))
+    catat("alert_check_batch_100_tick", lambda: alerts.check_alert_batch(ticks))
+    catat("alert_proses_crossing_100_tick", lambda: alerts.proses_ticks(list(enumerate(ticks))))
+
+
+def bench_fetch(url_dasar, ulang, hasil):
+    # "ok" berulang -> 304 (ETag), "ok?validator=0" berulang -> body sama, parsing dilewati
+    for mode in ("ok", "ok?validator=0", "lambat", "tanpa-harga", "error", "timeout"):
+        r = ukur(lambda m=mode: ambil_harga_live(timeout=1, url=f"{url_dasar}/{m}"), ulang)
+        r.update(nama=f"fetch[{mode}]", ukuran=None)
+        hasil.append(r)
+        print(f"  fetch[{mode}]".ljust(34) + f" median {r['median_ms']:>10.3f} ms  {r['error'] or 'OK'}")
+
+
+def bench_agregasi(url_dasar, ulang, hasil):
+    """Multi-sumber: 2 sumber cepat, 1 lambat, 1 error, 1 timeout (deadline 1 detik)"""
+    def sumber():
+        return [
+            Sumber("cepat-1", f"{url_dasar}/ok", deadline=1),
+            Sumber("cepat-2", f"{url_dasar}/ok?harga=2.955.000", deadline=1),
+            Sumber("lambat", f"{url_dasar}/lambat?harga=2.960.000", deadline=1),
+            Sumber("error", f"{url_dasar}/error", deadline=1),
+            Sumber("timeout", f"{url_dasar}/timeout", deadline=1),
+        ]
+    for kuorum in (2, 5):
+        agregator = AgregatorHarga(sumber(), kuorum=kuorum)
+        r = ukur(agregator.ambil, ulang)
+        r.update(nama=f"agregasi[kuorum={kuorum}]", ukuran=len(agregator.sumber),
+                 statistik_sumber=agregator.get_statistik())
+        hasil.append(r)
+        print(f"  agregasi[kuorum={kuorum}]".ljust(34) + f" median {r['median_ms']:>10.3f} ms  "
+              f"{agregator.ambil().teks}")
+        agregator.tutup()
+
+
+def bench_kolektor(url_dasar, ulang, hasil):
+    """Satu putaran kolektor berita ke server lokal: serial vs paralel, database baru vs dedup"""
+    def cari(query):
+        response = requests.get(f"{url_dasar}/berita", params={"q": query}, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    for worker in (1, BERITA_WORKER):
+        db_berita = os.path.join(tempfile.mkdtemp(prefix="bench_kolektor_"), "berita.db")
+        kolektor = KolektorBerita(BeritaEmas(db_berita), cari=cari, worker=worker)
+        for tahap in ("baru", "dedup"):
+            status = []
+            r = ukur(lambda: status.append(kolektor.kumpulkan_sekali()), 1 if tahap == "baru" else ulang)
+            r.update(nama=f"kolektor_berita[{tahap},worker={worker}]", ukuran=len(kolektor.query),
+                     diterima=status[0].diterima, baru=status[0].baru)
+            hasil.append(r)
+            print(f"  kolektor_berita[{tahap},worker={worker}]".ljust(34) +
+                  f" median {r['median_ms']:>10.3f} ms  {status[0].diterima} diterima, {status[0].baru} baru")
+
+
+def bench_klasifikasi(url_dasar, hasil):
+    """Klasifikasi berita dengan endpoint ollama stub: putaran pertama ke model, ulangan dari cache"""
+    berita = buat_berita_sintetis(os.path.join(tempfile.mkdtemp(prefix="bench_klasifikasi_"), "berita.db"), 200)
+    with berita.pool.transaksi() as conn:
+        conn.execute("UPDATE berita SET dampak = NULL")
+    pengklasifikasi = PengklasifikasiBerita(berita, host=url_dasar)
+    for tahap in ("model", "cache"):
+        status = []
+
+        def putaran():
+            status.append(pengklasifikasi.klasifikasi_sekali(maks=1000))
+
+        r = ukur(putaran, 1)
+        r.update(nama=f"klasifikasi_berita[{tahap}]", ukuran=200, hasil=status[0]._asdict())
+        hasil.append(r)
+        print(f"  klasifikasi_berita[{tahap}]".ljust(34) + f" median {r['median_ms']:>10.3f} ms  {status[0]}")
+        # Kosongkan label supaya putaran kedua harus memakai cache hash konten
+        with berita.pool.transaksi() as conn:
+            conn.execute("UPDATE berita SET dampak = NULL, keyakinan = NULL")
+
+
+def buat_hari_sintetis(seed=42):
+    """Harga per detik selama 8 jam buka: periode datar, tenang dan ramai bergantian"""
+    rng = np.random.default_rng(seed)
+    # (durasi detik, volatilitas relatif per sqrt(detik))
+    periode = [(3 * 3600, 0), (3600, 3e-4), (2 * 3600, 3e-5), (3600, 3e-4), (3600, 0)]
+    langkah = np.concatenate([rng.normal(0, vol, durasi) for durasi, vol in periode])
+    harga = HARGA_AWAL * np.exp(np.cumsum(langkah))
+    return (np.round(harga / 1000) * 1000).astype(np.int64)
+
+
+def simulasi_polling(harga, penjadwal=None, interval=60):
+    """Poll harga[t] dengan jam simulasi. Return (jumlah request, rata-rata selisih rupiah
+    harga tampil vs harga sebenarnya, selisih maksimum)"""
+    tampil = np.empty_like(harga)
+    t, jumlah = 0, 0
+    while t < len(harga):
+        jumlah += 1
+        if penjadwal is not None:
+            penjadwal.catat(int(harga[t]), t)
+            jeda = penjadwal.jeda_berikutnya()
+        else:
+            jeda = interval
+        akhir = min(t + max(int(jeda), 1), len(harga))
+        tampil[t:akhir] = harga[t]
+        t = akhir
+    selisih = np.abs(tampil - harga)
+    return jumlah, float(selisih.mean()), int(selisih.max())
+
+
+def bench_polling(hasil):
+    """Interval tetap vs adaptif pada satu hari sintetis: jumlah request dan kesegaran harga"""
+    harga = buat_hari_sintetis()
+    for nama, penjadwal, interval in (("tetap_60s", None, 60), ("tetap_15s", None, 15),
+                                      ("adaptif", PenjadwalAdaptif(interval_dasar=60), None)):
+        mulai = time.perf_counter()
+        jumlah, rata, maks = simulasi_polling(harga, penjadwal, interval)
+        waktu_ms = (time.perf_counter() - mulai) * 1000
+        hasil.append({"nama": f"polling[{nama}]", "ukuran": len(harga), "median_ms": waktu_ms,
+                      "request": jumlah, "selisih_rata": rata, "selisih_maks": maks, "error": None})
+        print(f"  polling[{nama}]".ljust(34) + f" {jumlah:>6} request  selisih rata-rata Rp {rata:,.0f}"
+              f"  maks Rp {maks:,}")
+
+
+def bench_parser(corpus_dir, ulang, hasil):
+    """Waktu parse per halaman korpus + cek hasil terhadap harapan.json"""
+    with open(os.path.join(corpus_dir, "harapan.json"), encoding="utf-8") as f:
+        harapan = json.load(f)
+    parser_regex = buat_parser_default()
+    parser_css = ParserHarga([AturanCSS("td.harga"), AturanRegex(HARGA_REGEX_PATTERN)])
+    regex_lama = re.compile(r'2\.9[0-9]{2}\.[0-9]{3}')
+
+    def hasil_parse(fungsi):
+        try:
+            return fungsi().nilai
+        except ValueError:
+            return None
+
+    for nama_file, nilai_harapan in harapan.items():
+        with open(os.path.join(corpus_dir, nama_file), encoding="utf-8") as f:
+            html = f.read()
+        data = html.encode("utf-8")
+        chunks = [data[i:i + HARGA_CHUNK_BYTES] for i in range(0, len(data), HARGA_CHUNK_BYTES)]
+        jalur = {
+            "regex": lambda: parser_regex.parse(html),
+            "regex_stream": lambda: parser_regex.parse_stream(chunks),
+            "css": lambda: parser_css.parse(html),
+        }
+        for nama, fungsi in jalur.items():
+            r = ukur(fungsi, ulang)
+            r.update(nama=f"parse_{nama}[{nama_file}]", ukuran=len(data),
+                     cocok=hasil_parse(fungsi) == nilai_harapan)
+            hasil.append(r)
+            print(f"  parse_{nama}[{nama_file}]".ljust(60) + f" median {r['median_ms']:>8.3f} ms"
+                  + ("" if r["cocok"] else "  TIDAK COCOK"))
+        # Pembanding: regex lama (hanya 2.900.000 - 2.999.999)
+        match = regex_lama.search(html)
+        lama = int(match.group(0).replace(".", "")) if match else None
+        r = ukur(lambda: regex_lama.search(html), ulang)
+        r.update(nama=f"parse_regex_lama[{nama_file}]", ukuran=len(data), cocok=lama == nilai_harapan)
+        hasil.append(r)
+
+
+def info_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def bench_berita(db_path, jumlah, ulang, hasil):
+    berita = buat_berita_sintetis(db_path, jumlah)
+    halaman_1 = berita.get_berita_page()
+    kursor = (halaman_1[-1]["tanggal"], halaman_1[-1]["id"])
+
+    def catat(nama, fungsi):
+        r = ukur(fungsi, ulang)
+        r.update(nama=nama, ukuran=jumlah)
+        hasil.append(r)
+        print(f"  {nama:<32} median {r['median_ms']:>10.3f} ms")
+
+    catat("berita_halaman_1", berita.get_berita_page)
+    catat("berita_halaman_2", lambda: berita.get_berita_page(sebelum=kursor))
+    catat("berita_kategori", lambda: berita.get_berita_page(kategori="pasar"))
+    catat("berita_cari", lambda: berita.get_berita_page(cari="inflasi cadangan"))
+    catat("berita_hitung_cari", lambda: berita.hitung_berita(cari="inflasi cadangan"))
+    catat("berita_daftar_kategori", berita.get_kategori_list)
+
+
+def bench_api(db_harga, db_alert, db_berita, hasil, jumlah=2000, paralel=50):
+    """Request/detik REST API (server & klien di satu event loop, jadi batas bawah)"""
+    import aiohttp
+    from aiohttp import web
+
+    async def jalankan():
+        runner = web.AppRunner(ApiEmas(db_harga, db_alert, db_berita).buat_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url_dasar = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{url_dasar}/api/riwayat?resolusi=1m") as r:
+                etag = r.headers["ETag"]
+            kasus = [
+                ("harga", "/api/harga", {}),
+                ("riwayat_gzip", "/api/riwayat?resolusi=1m", {"Accept-Encoding": "gzip"}),
+                ("riwayat_304", "/api/riwayat?resolusi=1m", {"If-None-Match": etag}),
+                ("alerts", "/api/alerts", {}),
+                ("berita", "/api/berita", {}),
+            ]
+            batas = asyncio.Semaphore(paralel)
+
+            async def satu(path, headers):
+                async with batas:
+                    async with session.get(url_dasar + path, headers=headers) as r:
+                        await r.read()
+
+            for nama, path, headers in kasus:
+                mulai = time.perf_counter()
+                await asyncio.gather(*[satu(path, headers) for _ in range(jumlah)])
+                detik = time.perf_counter() - mulai
+                hasil.append({"nama": f"api[{nama}]", "ukuran": jumlah, "median_ms": detik / jumlah * 1000,
+                              "request_per_detik": jumlah / detik, "error": None})
+                print(f"  api[{nama}]".ljust(34) + f" {jumlah / detik:>10.0f} request/detik")
+        await runner.cleanup()
+
+    asyncio.run(jalankan())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline dashboard emas")
+    parser.add_argument("--ukuran", default="1e3,1e5",
+                        help="Jumlah tick sintetis, dipisah koma (mis. 1e3,1e5,1e7)")
+    parser.add_argument("--alert-maks", type=float, default=1e4,
+                        help="Batas jumlah alert sintetis per ukuran")
+    parser.add_argument("--ulang", type=int, default=5, help="Pengulangan per pengukuran")
+    parser.add_argument("--data-dir", default=None,
+                        help="Simpan/pakai ulang database sintetis di folder ini")
+    parser.add_argument("--output", default="bench_output.json", help="File hasil JSON")
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_harga"),
+                        help="Folder korpus halaman HTML untuk benchmark parser")
+    args = parser.parse_args(argv)
+
+    daftar_ukuran = [int(float(u)) for u in args.ukuran.split(",")]
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="bench_emas_")
+    os.makedirs(data_dir, exist_ok=True)
+    hasil = []
+
+    server, url_dasar = jalankan_server_stub()
+    get_budget(url_dasar, per_jam=10 ** 9)  # Budget host stub praktis tanpa batas
+    print("# Fetch (server lokal)")
+    bench_fetch(url_dasar, args.ulang, hasil)
+    print("# Kolektor berita (server lokal)")
+    bench_kolektor(url_dasar, args.ulang, hasil)
+    if OLLAMA_AVAILABLE:
+        print("# Klasifikasi berita (ollama stub)")
+        bench_klasifikasi(url_dasar, hasil)
+    if AIOHTTP_AVAILABLE:
+        print("# Agregasi multi-sumber (server lokal)")
+        bench_agregasi(url_dasar, args.ulang, hasil)
+    server.shutdown()
+
+    print("# Polling adaptif (jam simulasi)")
+    bench_polling(hasil)
+
+    print("# Parser harga (korpus HTML)")
+    bench_parser(args.corpus, args.ulang, hasil)
+
+    for ukuran in daftar_ukuran:
+        db_harga = os.path.join(data_dir, f"harga_{ukuran}.db")
+        if not os.path.exists(db_harga):
+            print(f"# Membuat {ukuran:,} tick sintetis...")
+            mulai = time.perf_counter()
+            buat_riwayat_sintetis(db_harga, ukuran)
+            print(f"  selesai dalam {time.perf_counter() - mulai:.1f} detik")
+        print(f"# Riwayat {ukuran:,} tick")
+        bench_riwayat(db_harga, ukuran, args.ulang, hasil)
+
+        jumlah_alert = int(min(ukuran, args.alert_maks))
+        db_alert = os.path.join(tempfile.mkdtemp(prefix="bench_alert_"), "alerts.db")
+        print(f"# Price alert {jumlah_alert:,} baris")
+        bench_alert(db_alert, jumlah_alert, args.ulang, hasil)
+
+        db_berita = os.path.join(tempfile.mkdtemp(prefix="bench_berita_"), "berita.db")
+        print(f"# Berita {jumlah_alert:,} baris")
+        bench_berita(db_berita, jumlah_alert, args.ulang, hasil)
+
+        if AIOHTTP_AVAILABLE:
+            print(f"# REST API ({ukuran:,} tick)")
+            bench_api(db_harga, db_alert, db_berita, hasil)
+
+    laporan = {
+        "meta": {
+            "waktu": datetime.now().isoformat(timespec="seconds"),
+            "git": info_git(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "ukuran": daftar_ukuran,
+            "ulang": args.ulang,
+        },
+        "hasil": hasil,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
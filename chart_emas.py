@@ -0,0 +1,150 @@
+"""
+CHART_EMAS.PY - Data & figure chart harga emas (tanpa dependensi Streamlit)
+Dipakai oleh dashboard (app_emas.py) dan benchmark (bench_dashboard.py).
+Plotly opsional: tanpa plotly data chart tetap tersedia, dashboard
+memakai chart bawaan Streamlit.
+"""
+import pandas as pd
+
+try:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+from history_cache import epoch_ke_waktu
+from indikator import INDIKATOR
+from rollup_ohlc import pilih_resolusi, ambil_ohlc
+
+# Pilihan rentang chart -> lama rentang dalam detik (None = semua data)
+RENTANG_CHART = {
+    "1 Jam": 3600,
+    "1 Hari": 86400,
+    "1 Minggu": 7 * 86400,
+    "1 Bulan": 30 * 86400,
+    "1 Tahun": 365 * 86400,
+    "Semua": None,
+}
+
+KOLOM_CHART = ['waktu', 'waktu_epoch', 'open', 'high', 'low', 'close', 'harga']
+
+
+def ambil_data_chart(conn, rentang):
+    """OHLC untuk rentang chart, resolusi rollup dipilih otomatis. Return (df, resolusi)"""
+    mulai, akhir = conn.execute(
+        "SELECT min(waktu_epoch), max(waktu_epoch) FROM harga_emas"
+    ).fetchone()
+    if akhir is None:
+        return pd.DataFrame(columns=KOLOM_CHART), "tick"
+    if RENTANG_CHART[rentang] is not None:
+        mulai = max(mulai, akhir - RENTANG_CHART[rentang])
+    resolusi = pilih_resolusi(akhir - mulai)
+    rows = ambil_ohlc(conn, mulai, akhir, resolusi)
+
+    df = pd.DataFrame(rows, columns=['waktu_epoch', 'open', 'high', 'low', 'close'])
+    df['waktu'] = epoch_ke_waktu(df['waktu_epoch'])
+    df['harga'] = df['close']
+    return df[KOLOM_CHART], resolusi
+
+
+# Warna garis overlay indikator
+WARNA_INDIKATOR = {
+    "sma": "#4FC3F7",
+    "ema": "#BA68C8",
+    "tengah": "#90A4AE",
+    "atas": "#90A4AE",
+    "bawah": "#90A4AE",
+    "rsi": "#FFB74D",
+    "macd": "#4FC3F7",
+    "sinyal": "#FF8A65",
+}
+
+
+def _tambah_indikator(fig, nama, df_ind, baris):
+    """Garis indikator di panel harga (baris 1) atau panel sendiri"""
+    for kolom in INDIKATOR[nama][0].kolom:
+        if kolom == "histogram":
+            fig.add_trace(go.Bar(
+                x=df_ind['waktu'], y=df_ind[kolom], name=f"{nama} hist",
+                marker_color=['#00d084' if v >= 0 else '#ff6b6b' for v in df_ind[kolom].fillna(0)],
+                opacity=0.6
+            ), row=baris, col=1)
+            continue
+        fig.add_trace(go.Scatter(
+            x=df_ind['waktu'], y=df_ind[kolom], mode='lines',
+            name=nama if len(INDIKATOR[nama][0].kolom) == 1 else f"{nama} {kolom}",
+            line=dict(color=WARNA_INDIKATOR.get(kolom), width=1.2,
+                      dash='dot' if kolom in ("atas", "bawah") else None),
+            hovertemplate=f'{nama} {kolom}: %{{y:,.2f}}<extra></extra>'
+        ), row=baris, col=1)
+    if nama.startswith("RSI"):
+        for batas in (30, 70):
+            fig.add_hline(y=batas, line=dict(color='rgba(255, 255, 255, 0.3)', dash='dash'), row=baris, col=1)
+
+
+def buat_figure(df, gaya="Garis", indikator=None):
+    """Figure Plotly ala TradingView (garis atau candlestick OHLC).
+    `indikator` opsional: dict nama INDIKATOR -> DataFrame dari IndikatorCache"""
+    if not PLOTLY_AVAILABLE:
+        raise RuntimeError("Figure chart butuh plotly: pip install plotly")
+    indikator = indikator or {}
+    panel = [nama for nama in indikator if INDIKATOR[nama][2] == "panel"]
+    fig = make_subplots(
+        rows=1 + len(panel), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        row_heights=[0.7] + [0.3] * len(panel) if panel else None
+    )
+
+    if gaya == "Candlestick":
+        fig.add_trace(go.Candlestick(
+            x=df['waktu'],
+            open=df['open'],
+            high=df['high'],
+            low=df['low'],
+            close=df['close'],
+            name='Harga Emas',
+            increasing_line_color='#00d084',
+            decreasing_line_color='#ff6b6b'
+        ), row=1, col=1)
+    else:
+        # Menambahkan Garis Utama (Line Chart) dari harga close
+        fig.add_trace(go.Scatter(
+            x=df['waktu'],
+            y=df['harga'],
+            mode='lines',
+            name='Harga Emas',
+            line=dict(color='#FFD700', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(255, 215, 0, 0.15)',
+            hovertemplate='<b>Waktu:</b> %{x}<br><b>Harga:</b> Rp %{y:,.0f}<extra></extra>'
+        ), row=1, col=1)
+
+    for nama, df_ind in indikator.items():
+        baris = 2 + panel.index(nama) if nama in panel else 1
+        _tambah_indikator(fig, nama, df_ind, baris)
+
+    # Konfigurasi Layout agar Mirip Trading Chart
+    fig.update_layout(
+        template='plotly_dark',
+        hovermode='x unified',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=40, b=10),
+        height=500 + 150 * len(panel),
+        showlegend=bool(indikator),
+    )
+    fig.update_xaxes(
+        showgrid=True,
+        gridcolor='rgba(255, 255, 255, 0.1)',
+        # Rentang waktu dipilih di server (RENTANG_CHART) agar data sesuai resolusi
+        rangeslider=dict(visible=False), # Slider di bawah (opsional)
+        type='date'
+    )
+    fig.update_yaxes(
+        showgrid=True,
+        gridcolor='rgba(255, 255, 255, 0.1)',
+        side='right', # Harga biasanya di kanan pada chart trading
+    )
+    fig.update_yaxes(tickformat=",.0f", row=1, col=1)
+
+    return fig
@@ -6,6 +6,9 @@ from datetime import datetime, timedelta
 import random
 import os
 
+from config import TIMEZONE
+from db_schema import migrasi_db_harga
+
 st.set_page_config(page_title="Harga Emas", layout="wide")
 st.title("📈 Grafik Harga Emas per Jam")
 
@@ -19,14 +22,8 @@ else:
 
 cursor = conn.cursor()
 
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS harga_emas (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    waktu TEXT,
-    harga INTEGER
-)
-""")
-conn.commit()
+# Buat tabel + migrasi ke skema terbaru (waktu_epoch terindex)
+migrasi_db_harga(conn)
 
 # =========================
 # ISI DATA 24 JAM PASTI
@@ -41,8 +38,8 @@ if cursor.fetchone()[0] < 2:
         waktu = now - timedelta(hours=23 - i)
 
         cursor.execute(
-            "INSERT INTO harga_emas (waktu, harga) VALUES (?, ?)",
-            (waktu, harga)
+            "INSERT INTO harga_emas (waktu, waktu_epoch, harga) VALUES (?, ?, ?)",
+            (waktu, int(waktu.timestamp()), harga)
         )
     conn.commit()
 
@@ -50,10 +47,10 @@ if cursor.fetchone()[0] < 2:
 # AMBIL DATA
 # =========================
 df = pd.read_sql(
-    "SELECT waktu, harga FROM harga_emas ORDER BY waktu ASC",
+    "SELECT waktu_epoch, harga FROM harga_emas ORDER BY waktu_epoch ASC",
     conn
 )
-df["waktu"] = pd.to_datetime(df["waktu"])
+df["waktu"] = pd.to_datetime(df["waktu_epoch"], unit="s", utc=True).dt.tz_convert(TIMEZONE).dt.tz_localize(None)
 
 st.write("JUMLAH DATA:", len(df))
 
@@ -8,12 +8,36 @@ Ubah setting di sini untuk kustomisasi aplikasi
 # ==========================================
 DB_HARGA = "riwayat_emas.db"  # Database harga emas
 DB_ALERTS = "price_alerts.db"  # Database price alerts
+DB_BERITA = "berita_emas.db"  # Database berita & analisis
+DB_BUSY_TIMEOUT_MS = 5000  # Tunggu lock database maksimal 5 detik sebelum error
+DB_STATEMENT_CACHE = 256  # Jumlah prepared statement yang di-cache per koneksi
+DB_POOL_UKURAN = 8  # Koneksi maksimal per database, dipakai bergantian oleh semua thread/sesi
+
+# Worker ingest harga (ingest_harga.py)
+INGEST_FLUSH_INTERVAL = 60  # Tulis batch tick ke database tiap N detik
+INGEST_BATCH_MAKS = 500  # Flush lebih awal jika tick tertampung sebanyak ini
 
 # ==========================================
 # HARGA EMAS SETTINGS
 # ==========================================
 HARGA_SOURCE_URL = "https://www.hargaemas.com/"
-HARGA_REGEX_PATTERN = r'2\.9[0-9]{2}\.[0-9]{3}'  # Pattern untuk regex scraping
+HARGA_REGEX_PATTERN = r'(?<![\d.])\d{1,2}(?:\.\d{3}){2}(?![\d.])'  # Angka format rupiah, mis. 2.951.000
+HARGA_CSS_SELECTOR = ""  # Selector CSS elemen harga (kosong = hanya pakai regex)
+HARGA_BATAS_BAWAH = 1000000  # Harga di luar rentang ini dianggap salah parse
+HARGA_BATAS_ATAS = 10000000
+HARGA_CHUNK_BYTES = 16384  # Ukuran chunk untuk ParserHarga.parse_stream
+
+# Sumber harga yang diambil paralel, harga akhir = median kutipan yang masuk tepat waktu.
+# Kunci opsional per sumber: "regex" atau "css" jika format halamannya berbeda.
+SUMBER_HARGA = [
+    {"nama": "hargaemas.com", "url": HARGA_SOURCE_URL},
+    # {"nama": "sumber-lain", "url": "https://...", "css": "td.harga"},
+]
+SUMBER_DEADLINE = 3  # Batas waktu per sumber (detik)
+SUMBER_KUORUM = 2  # Median diambil begitu sebanyak ini sumber sehat sudah menjawab
+SUMBER_GAGAL_TIDAK_SEHAT = 3  # Gagal beruntun sebelum sumber dianggap tidak sehat
+SUMBER_JEDA_PEMULIHAN = 60  # Sumber tidak sehat dilewati, dicoba lagi sekali per jeda ini (detik)
+SUMBER_KONEKSI_MAKS = 10  # Batas koneksi di pool HTTP bersama
 
 # ==========================================
 # STREAMLIT SETTINGS
@@ -29,6 +53,21 @@ CACHE_TTL_NEWS = 600  # Cache berita 10 menit
 # Default refresh interval
 DEFAULT_REFRESH_INTERVAL = 60  # dalam detik
 
+# Poller harga bersama (price_poller.py)
+POLLER_TIMEOUT = 5  # Timeout request ke website (detik)
+POLLER_STALE_SETELAH = 3 * DEFAULT_REFRESH_INTERVAL  # Data dianggap basi setelah ini
+POLLER_KADALUARSA_SETELAH = 30 * 60  # Lewat dari ini harga tidak ditampilkan (N/A)
+POLLER_BACKOFF_AWAL = 10  # Jeda retry pertama saat gagal (detik)
+POLLER_BACKOFF_MAKS = 15 * 60  # Jeda retry maksimum (detik)
+
+# Polling adaptif (jadwal_polling.py): harga bergerak -> poll rapat, harga datar -> jeda panjang
+POLLING_INTERVAL_MIN = 15  # Jeda tercepat (detik)
+POLLING_INTERVAL_MAKS = 10 * 60  # Jeda terlama saat harga datar (detik)
+POLLING_PERUBAHAN_TARGET = 0.001  # Volatilitas acuan: perubahan 0.1% (~Rp 3.000) per interval dasar
+POLLING_EWMA_ALPHA = 0.3  # Bobot sampel terbaru pada estimasi volatilitas
+POLLING_BUDGET_PER_JAM = 180  # Request maksimum per host sumber per jam (per proses)
+POLLING_BUDGET_BURST = 5 * 60  # Budget yang boleh dipakai sekaligus = jatah sekian detik
+
 # ==========================================
 # OPERATIONAL SCHEDULE
 # ==========================================
@@ -37,10 +76,13 @@ JAM_BUKA = 0  # Jam 00:00 (midnight)
 JAM_BUKA_MENIT = 0  # Menit 00
 
 TIMEZONE = "Asia/Jakarta"
+FILE_HARI_LIBUR = "hari_libur.txt"  # Tanggal libur tambahan (website tutup seharian)
 
-# Pesan status
+# Pesan status ({alasan} = ALASAN_TUTUP / nama libur dari FILE_HARI_LIBUR,
+# {buka} = hari & jam buka berikutnya)
+ALASAN_TUTUP = "Hari Libur"  # Alasan tutup di HARI_TUTUP / sebelum jam buka
 PESAN_OPERASIONAL = "Website OPERASIONAL"
-PESAN_TUTUP = "Website TUTUP - Hari Libur. Buka lagi Senin jam 00:00 WIB"
+PESAN_TUTUP = "Website TUTUP - {alasan}. Buka lagi {buka} WIB"
 
 # ==========================================
 # PRICE ALERT SETTINGS
@@ -48,6 +90,7 @@ PESAN_TUTUP = "Website TUTUP - Hari Libur. Buka lagi Senin jam 00:00 WIB"
 MIN_HARGA_ALERT = 100000  # Harga minimum Rp
 MAX_HARGA_ALERT = 10000000  # Harga maksimum Rp
 STEP_HARGA_ALERT = 1000  # Step increment harga
+ALERT_PER_HALAMAN = 50  # Jumlah alert per halaman di tab Price Alert
 
 # ==========================================
 # UI/STYLING
@@ -66,6 +109,11 @@ FONT_BODY = "'Roboto', sans-serif"
 
 CHART_HEIGHT = 100
 CHART_LIMIT_DATA = 100 # Ambil 100 data terakhir
+HISTORY_CACHE_MIN_INTERVAL = 5  # Jeda minimum antar cek baris baru di cache riwayat (detik)
+CHART_MAKS_TITIK = 5000  # Batas titik per chart, resolusi OHLC dipilih agar tidak melebihi ini
+INDIKATOR_WARMUP = 200  # Bucket ekstra sebelum rentang chart agar EMA/RSI/MACD sudah stabil
+EXPORT_CHUNK = 50000  # Baris per chunk saat export streaming
+EXPORT_SPOOL_MAKS = 32 * 1024 * 1024  # File export > 32 MB dipindah ke file sementara di disk
 
 # ==========================================
 # BERITA SETTINGS
@@ -82,11 +130,39 @@ KATEGORI_DEFAULT = [
 
 DAMPAK_OPTIONS = ["Positif", "Negatif", "Netral"]
 
-# ==========================================
-# API SETTINGS (untuk future expansion)
+# Kolektor berita (kolektor_berita.py), dijalankan ulang setiap CACHE_TTL_NEWS detik
+BERITA_QUERY = {  # Query pencarian -> kategori berita
+    "harga emas hari ini": "Pasar",
+    "emas antam": "Pasar",
+    "suku bunga the fed emas": "Suku Bunga",
+    "inflasi harga emas": "Ekonomi",
+    "geopolitik harga emas": "Geopolitik",
+    "kurs dolar rupiah emas": "Nilai Tukar",
+}
+BERITA_MAKS_PER_QUERY = 20  # Artikel maksimum per query
+BERITA_WORKER = 4  # Query yang dijalankan paralel
+BERITA_TIMEOUT = 10  # Timeout pencarian per query (detik)
+
+# Klasifikasi dampak berita dengan model lokal ollama (klasifikasi_berita.py)
+OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_MODEL = "llama3.2"
+KLASIFIKASI_BATCH = 8  # Berita per prompt
+KLASIFIKASI_PARALEL = 2  # Request ke ollama yang berjalan bersamaan
+KLASIFIKASI_TIMEOUT = 120  # Timeout per request (detik)
+KLASIFIKASI_MAKS_COBA = 3  # Berita yang tetap tidak dijawab model setelah sekian percobaan dilewati
+
+# ==========================================
+# API SETTINGS (api_emas.py)
 # ==========================================
 ENABLE_API = False  # Enable/disable REST API
+API_HOST = "127.0.0.1"  # Hanya lokal; ganti "0.0.0.0" agar bisa diakses service lain di jaringan
 API_PORT = 8000
+API_WORKER = 4  # Thread untuk query SQLite & kompresi (event loop tidak pernah menunggu disk)
+API_MAKS_TITIK = 10000  # Batas titik per respons riwayat
+API_RENTANG_DEFAULT = 86400  # Rentang riwayat jika parameter mulai kosong (detik)
+API_GZIP_MIN_BYTES = 1024  # Respons lebih kecil dari ini tidak dikompres
+API_GZIP_LEVEL = 5
+API_CACHE_RIWAYAT = 128  # Jumlah respons riwayat (per ETag) yang disimpan di memori
 
 # ==========================================
 # LOGGING
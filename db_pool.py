@@ -0,0 +1,159 @@
+"""
+DB_POOL.PY - Akses SQLite bersama yang aman untuk banyak thread
+Streamlit menjalankan setiap rerun (dan setiap tick fragment) di thread
+baru, jadi koneksi per thread akan dibuka ulang terus-menerus. Pool ini
+menyimpan sejumlah terbatas koneksi (check_same_thread=False) yang
+dipinjam per pemakaian lalu dikembalikan, sehingga PRAGMA dan cache
+prepared statement bawaan sqlite3 benar-benar dipakai ulang. Satu koneksi
+hanya dipegang satu thread pada satu waktu.
+
+Contoh:
+    pool = get_pool(DB_ALERTS, migrasi=migrasi_db_alerts)
+    rows = pool.baca("SELECT ... WHERE id > ?", (0,))
+    with pool.koneksi() as conn:
+        conn.execute("SELECT ...")
+    with pool.transaksi() as conn:
+        conn.execute("INSERT ...")
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config import DB_BUSY_TIMEOUT_MS, DB_STATEMENT_CACHE, DB_POOL_UKURAN
+
+
+class SQLitePool:
+    def __init__(self, db_path, migrasi=None, ukuran=DB_POOL_UKURAN):
+        self.db_path = db_path
+        self.ukuran = ukuran
+        self._bebas = queue.LifoQueue()  # LIFO: koneksi yang baru dipakai cache-nya masih hangat
+        self._lock = threading.Lock()
+        self._jumlah = 0  # Koneksi yang sedang terbuka (bebas + dipinjam)
+        if migrasi is not None:
+            conn = self._buka()
+            self._jumlah = 1
+            try:
+                migrasi(conn)
+            except BaseException:
+                conn.close()
+                raise
+            self._bebas.put(conn)
+
+    def _buka(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # Autocommit, transaksi tulis lewat transaksi()
+            check_same_thread=False,  # Dipinjam bergantian oleh banyak thread, tidak bersamaan
+            cached_statements=DB_STATEMENT_CACHE,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _pinjam(self):
+        try:
+            return self._bebas.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            buat_baru = self._jumlah < self.ukuran
+            if buat_baru:
+                self._jumlah += 1
+        if buat_baru:
+            try:
+                return self._buka()
+            except BaseException:
+                with self._lock:
+                    self._jumlah -= 1
+                raise
+        try:
+            return self._bebas.get(timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Semua {self.ukuran} koneksi ke {self.db_path} sedang dipakai"
+            ) from None
+
+    def _kembalikan(self, conn):
+        if conn.in_transaction:
+            # Peminjam keluar di tengah transaksi (mis. generator ditinggalkan)
+            conn.execute("ROLLBACK")
+        self._bebas.put(conn)
+
+    @contextmanager
+    def koneksi(self):
+        """Pinjam satu koneksi selama blok with, dikembalikan ke pool setelahnya"""
+        conn = self._pinjam()
+        try:
+            yield conn
+        finally:
+            try:
+                self._kembalikan(conn)
+            except sqlite3.Error:
+                # Koneksi rusak tidak dikembalikan, slot-nya dibebaskan
+                conn.close()
+                with self._lock:
+                    self._jumlah -= 1
+
+    def baca(self, sql, params=()):
+        """Jalankan query baca dan kembalikan semua baris"""
+        with self.koneksi() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def baca_satu(self, sql, params=()):
+        with self.koneksi() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    @contextmanager
+    def transaksi(self):
+        """Transaksi tulis BEGIN IMMEDIATE: lock diambil di awal supaya tidak
+        terjadi deadlock upgrade read->write, commit otomatis jika tidak error"""
+        with self.koneksi() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def tutup(self):
+        """Tutup semua koneksi yang sedang tidak dipinjam. Pool tetap bisa dipakai
+        (koneksi dibuka lagi saat dibutuhkan)"""
+        while True:
+            try:
+                conn = self._bebas.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._jumlah -= 1
+
+
+# ============================================
+# REGISTRY POOL (SATU PER DATABASE PER PROSES)
+# ============================================
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path, migrasi=None):
+    """Ambil pool untuk db_path. Migrasi dijalankan sekali saat pool dibuat"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = SQLitePool(db_path, migrasi=migrasi)
+            _pools[db_path] = pool
+        return pool
+
+
+@atexit.register
+def tutup_semua():
+    """Tutup koneksi semua pool saat proses berhenti (checkpoint WAL ikut berjalan)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.tutup()
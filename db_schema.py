@@ -0,0 +1,312 @@
+"""
+DB_SCHEMA.PY - Migrasi skema database (riwayat_emas.db, emas.db, price_alerts.db, berita_emas.db)
+Versi skema disimpan di PRAGMA user_version. Setiap migrasi dijalankan
+sekali, berurutan, di dalam transaksi BEGIN IMMEDIATE sehingga aman
+walaupun dashboard dan worker ingest start bersamaan.
+"""
+import sqlite3
+
+from rollup_ohlc import buat_tabel_rollup, backfill_rollup, pasang_trigger_rollup
+from statistik_harga import StatistikHarga, buat_tabel_statistik
+
+
+def _kolom_tabel(conn, tabel):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({tabel})")}
+
+
+def _migrasi_1_waktu_epoch(conn):
+    """Tambah kolom waktu_epoch (INTEGER, detik UTC) + index, backfill dari TEXT"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS harga_emas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        waktu TEXT,
+        harga INTEGER
+    )
+    """)
+    if "waktu_epoch" not in _kolom_tabel(conn, "harga_emas"):
+        conn.execute("ALTER TABLE harga_emas ADD COLUMN waktu_epoch INTEGER")
+
+    # Kolom waktu lama berisi jam lokal tanpa timezone -> modifier 'utc'
+    conn.execute("""
+    UPDATE harga_emas
+    SET waktu_epoch = CAST(strftime('%s', waktu, 'utc') AS INTEGER)
+    WHERE waktu_epoch IS NULL
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_harga_emas_waktu_epoch ON harga_emas (waktu_epoch)"
+    )
+
+    # Penulis lama (emas.py, seed chart_hourly) hanya mengisi kolom waktu
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_harga_emas_isi_epoch
+    AFTER INSERT ON harga_emas
+    WHEN NEW.waktu_epoch IS NULL
+    BEGIN
+        UPDATE harga_emas
+        SET waktu_epoch = CAST(strftime('%s', NEW.waktu, 'utc') AS INTEGER)
+        WHERE id = NEW.id;
+    END
+    """)
+
+
+def _migrasi_2_rollup_ohlc(conn):
+    """Tabel OHLC 1m/1h/1d + trigger update inkremental, backfill dari tick lama"""
+    buat_tabel_rollup(conn)
+    backfill_rollup(conn)
+    pasang_trigger_rollup(conn)
+
+
+def _migrasi_3_statistik(conn):
+    """Tabel statistik per jendela (24h/7d/30d/YTD), diisi awal dari tick lama"""
+    buat_tabel_statistik(conn)
+    StatistikHarga().muat_dari_db(conn).simpan(conn)
+
+
+# Urutan penting: index ke-i menghasilkan user_version i+1
+MIGRASI_HARGA = [
+    _migrasi_1_waktu_epoch,
+    _migrasi_2_rollup_ohlc,
+    _migrasi_3_statistik,
+]
+
+
+# ============================================
+# MIGRASI PRICE_ALERTS.DB
+# ============================================
+def _migrasi_alerts_1_tabel(conn):
+    """Tabel alerts dasar"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT,
+        harga_beli INTEGER,
+        harga_jual INTEGER,
+        status TEXT DEFAULT 'AKTIF',
+        tgl_buat TEXT
+    )
+    """)
+
+
+def _migrasi_alerts_2_crossing(conn):
+    """Status terpicu per alert, log alert terpicu, dan versi daftar alert"""
+    kolom = _kolom_tabel(conn, "alerts")
+    if "terpicu_beli" not in kolom:
+        conn.execute("ALTER TABLE alerts ADD COLUMN terpicu_beli INTEGER NOT NULL DEFAULT 0")
+    if "terpicu_jual" not in kolom:
+        conn.execute("ALTER TABLE alerts ADD COLUMN terpicu_jual INTEGER NOT NULL DEFAULT 0")
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS alert_terpicu (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        alert_id INTEGER,
+        nama TEXT,
+        tipe TEXT,
+        harga INTEGER,
+        harga_target INTEGER,
+        pesan TEXT,
+        waktu_epoch INTEGER
+    )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alert_terpicu_waktu_epoch ON alert_terpicu (waktu_epoch)"
+    )
+
+    # Versi naik setiap daftar/target alert berubah -> engine di proses lain tahu harus reload.
+    # Perubahan kolom terpicu_* sengaja tidak menaikkan versi.
+    conn.execute("CREATE TABLE IF NOT EXISTS alert_meta (kunci TEXT PRIMARY KEY, nilai INTEGER)")
+    conn.execute("INSERT OR IGNORE INTO alert_meta (kunci, nilai) VALUES ('versi', 0)")
+    for nama, kejadian in (("insert", "INSERT"), ("delete", "DELETE"),
+                           ("update", "UPDATE OF nama, harga_beli, harga_jual, status")):
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_alerts_versi_{nama}
+        AFTER {kejadian} ON alerts
+        BEGIN
+            UPDATE alert_meta SET nilai = nilai + 1 WHERE kunci = 'versi';
+        END
+        """)
+
+
+def _migrasi_alerts_3_index(conn):
+    """Index untuk filter nama/status + keyset pagination berdasarkan id"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_nama ON alerts (nama, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts (status, id)")
+
+
+MIGRASI_ALERTS = [
+    _migrasi_alerts_1_tabel,
+    _migrasi_alerts_2_crossing,
+    _migrasi_alerts_3_index,
+]
+
+
+# ============================================
+# MIGRASI BERITA_EMAS.DB
+# ============================================
+# Berita contoh yang dulu di-hardcode di BeritaEmas, diisi sekali saat database dibuat
+_BERITA_AWAL = [
+    ("Dolar Menguat Terhadap Mata Uang Lainnya",
+     "Penguatan dolar membuat harga emas tertekan di pasar internasional",
+     "Nilai Tukar", "2026-02-04", "Negatif"),
+    ("China Tingkatkan Cadangan Emas",
+     "China menambah cadangan emas mereka sebesar 50 ton, strategi diversifikasi mata uang",
+     "Pasar", "2026-02-05", "Positif"),
+    ("Inflasi Turun ke Level Terendah 2 Tahun",
+     "Data inflasi menunjukkan penurunan signifikan, mempengaruhi valuasi emas",
+     "Ekonomi", "2026-02-06", "Netral"),
+    ("Konflik Geopolitik Meningkat di Timur Tengah",
+     "Ketegangan geopolitik mendorong investor mencari safe haven, emas melonjak 2%",
+     "Geopolitik", "2026-02-07", "Positif"),
+    ("Federal Reserve Kurangi Suku Bunga",
+     "Bank sentral AS mengurangi suku bunga sebesar 0.5%, kemungkinan mendorong permintaan emas",
+     "Suku Bunga", "2026-02-08", "Positif"),
+]
+
+
+def _migrasi_berita_1_tabel(conn):
+    """Tabel berita + index kategori/tanggal untuk listing berhalaman, isi berita awal"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS berita (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        judul TEXT NOT NULL,
+        deskripsi TEXT NOT NULL,
+        kategori TEXT NOT NULL COLLATE NOCASE,
+        tanggal TEXT NOT NULL,
+        dampak TEXT
+    )
+    """)
+    # Urutan listing: tanggal terbaru dulu, id sebagai pemutus (keyset pagination)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_berita_tanggal ON berita (tanggal, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_berita_kategori ON berita (kategori, tanggal, id)")
+    if conn.execute("SELECT COUNT(*) FROM berita").fetchone()[0] == 0:
+        conn.executemany(
+            "INSERT INTO berita (judul, deskripsi, kategori, tanggal, dampak) VALUES (?, ?, ?, ?, ?)",
+            _BERITA_AWAL
+        )
+
+
+def _migrasi_berita_2_fts(conn):
+    """Index full-text FTS5 atas judul/deskripsi, disinkronkan trigger.
+    SQLite tanpa FTS5 dilewati saja (pencarian jatuh ke LIKE)"""
+    try:
+        conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS berita_fts
+        USING fts5(judul, deskripsi, content='berita', content_rowid='id')
+        """)
+    except sqlite3.OperationalError:
+        return
+    conn.execute("INSERT INTO berita_fts (berita_fts) VALUES ('rebuild')")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_berita_fts_insert AFTER INSERT ON berita
+    BEGIN
+        INSERT INTO berita_fts (rowid, judul, deskripsi) VALUES (NEW.id, NEW.judul, NEW.deskripsi);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_berita_fts_delete AFTER DELETE ON berita
+    BEGIN
+        INSERT INTO berita_fts (berita_fts, rowid, judul, deskripsi)
+        VALUES ('delete', OLD.id, OLD.judul, OLD.deskripsi);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_berita_fts_update AFTER UPDATE OF judul, deskripsi ON berita
+    BEGIN
+        INSERT INTO berita_fts (berita_fts, rowid, judul, deskripsi)
+        VALUES ('delete', OLD.id, OLD.judul, OLD.deskripsi);
+        INSERT INTO berita_fts (rowid, judul, deskripsi) VALUES (NEW.id, NEW.judul, NEW.deskripsi);
+    END
+    """)
+
+
+def _migrasi_berita_3_dedup(conn):
+    """Kolom url/sumber/hash konten untuk berita hasil kolektor + index unik (dedup).
+    hash_konten baris lama diisi BeritaEmas saat pertama dibuka"""
+    kolom = _kolom_tabel(conn, "berita")
+    for nama in ("url", "sumber", "hash_konten"):
+        if nama not in kolom:
+            conn.execute(f"ALTER TABLE berita ADD COLUMN {nama} TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_berita_url ON berita (url) WHERE url IS NOT NULL")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_berita_hash ON berita (hash_konten) WHERE hash_konten IS NOT NULL"
+    )
+
+
+def _migrasi_berita_4_klasifikasi(conn):
+    """Keyakinan label dampak + cache verdict model per hash konten"""
+    if "keyakinan" not in _kolom_tabel(conn, "berita"):
+        conn.execute("ALTER TABLE berita ADD COLUMN keyakinan REAL")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS klasifikasi_berita (
+        hash_konten TEXT PRIMARY KEY,
+        dampak TEXT NOT NULL,
+        keyakinan REAL,
+        model TEXT,
+        waktu_epoch INTEGER
+    )
+    """)
+    # Antrian klasifikasi: berita yang dampaknya belum diisi
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_berita_belum_dinilai ON berita (id) WHERE dampak IS NULL")
+
+
+def _migrasi_berita_5_percobaan(conn):
+    """Jumlah percobaan klasifikasi per berita, supaya berita yang tidak pernah
+    dijawab model tidak menyumbat antrian"""
+    kolom = _kolom_tabel(conn, "berita")
+    if "dicoba" not in kolom:
+        conn.execute("ALTER TABLE berita ADD COLUMN dicoba INTEGER NOT NULL DEFAULT 0")
+    if "dicoba_pada" not in kolom:
+        conn.execute("ALTER TABLE berita ADD COLUMN dicoba_pada INTEGER")
+    # Antrian diurutkan percobaan paling sedikit dulu, lalu terlama
+    conn.execute("DROP INDEX IF EXISTS idx_berita_belum_dinilai")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_berita_antrian_nilai ON berita (dicoba, id) WHERE dampak IS NULL"
+    )
+
+
+MIGRASI_BERITA = [
+    _migrasi_berita_1_tabel,
+    _migrasi_berita_2_fts,
+    _migrasi_berita_3_dedup,
+    _migrasi_berita_4_klasifikasi,
+    _migrasi_berita_5_percobaan,
+]
+
+
+def versi_skema(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _jalankan_migrasi(conn, daftar_migrasi):
+    """Jalankan migrasi yang belum diterapkan. Return versi skema akhir"""
+    if versi_skema(conn) >= len(daftar_migrasi):
+        return versi_skema(conn)
+
+    isolation_lama = conn.isolation_level
+    conn.isolation_level = None  # Kontrol transaksi manual
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Dibaca ulang setelah lock didapat, proses lain mungkin sudah migrasi
+            versi = versi_skema(conn)
+            for nomor, migrasi in enumerate(daftar_migrasi[versi:], start=versi + 1):
+                migrasi(conn)
+                conn.execute(f"PRAGMA user_version = {nomor}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.isolation_level = isolation_lama
+    return versi_skema(conn)
+
+
+def migrasi_db_harga(conn):
+    return _jalankan_migrasi(conn, MIGRASI_HARGA)
+
+
+def migrasi_db_alerts(conn):
+    return _jalankan_migrasi(conn, MIGRASI_ALERTS)
+
+
+def migrasi_db_berita(conn):
+    return _jalankan_migrasi(conn, MIGRASI_BERITA)
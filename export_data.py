@@ -0,0 +1,173 @@
+"""
+EXPORT_DATA.PY - Export riwayat harga secara streaming (CSV, CSV gzip, Parquet, Excel)
+Data dibaca dari harga_emas per chunk (fetchmany) dan langsung ditulis ke
+file tujuan, jadi pemakaian memori tetap datar berapapun rentang yang
+diekspor. Bisa dipakai dari dashboard atau langsung dari terminal:
+
+    python export_data.py --format csv.gz --mulai 2026-01-01 --output emas.csv.gz
+"""
+import argparse
+import csv
+import gzip
+import io
+import tempfile
+from datetime import date, datetime
+
+from config import DB_HARGA, EXPORT_CHUNK, EXPORT_SPOOL_MAKS
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from rollup_ohlc import OFFSET_LOKAL
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    from openpyxl import Workbook
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+# format -> (ekstensi file, MIME type)
+FORMAT_EKSPOR = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+EPOCH_MAKS = 2 ** 62
+EXCEL_MAKS_BARIS = 1048575  # Batas baris satu sheet Excel dikurangi header
+
+
+def tanggal_ke_epoch(tanggal, akhir_hari=False):
+    """Tanggal lokal (TIMEZONE) -> epoch awal hari, atau detik terakhir hari itu"""
+    epoch = (tanggal - date(1970, 1, 1)).days * 86400 - OFFSET_LOKAL
+    return epoch + 86399 if akhir_hari else epoch
+
+
+def rentang_data(db_path=DB_HARGA):
+    """(epoch pertama, epoch terakhir) di harga_emas, (None, None) jika kosong"""
+    return get_pool(db_path, migrasi_db_harga).baca_satu(
+        "SELECT min(waktu_epoch), max(waktu_epoch) FROM harga_emas"
+    )
+
+
+def hitung_baris(db_path=DB_HARGA, mulai=None, akhir=None):
+    """Jumlah tick dalam rentang (count lewat index waktu_epoch)"""
+    return get_pool(db_path, migrasi_db_harga).baca_satu(
+        "SELECT count(*) FROM harga_emas WHERE waktu_epoch BETWEEN ? AND ?",
+        (mulai if mulai is not None else -EPOCH_MAKS, akhir if akhir is not None else EPOCH_MAKS)
+    )[0]
+
+
+def iter_chunk(db_path=DB_HARGA, mulai=None, akhir=None, ukuran_chunk=EXPORT_CHUNK):
+    """Yield list (waktu_teks, waktu_epoch, harga) per chunk, urut waktu (index seek).
+    Satu SELECT = satu snapshot WAL, jadi tick baru selama export tidak ikut tercampur"""
+    with get_pool(db_path, migrasi_db_harga).koneksi() as conn:
+        cursor = conn.execute(f"""
+        SELECT datetime(waktu_epoch + {OFFSET_LOKAL}, 'unixepoch'), waktu_epoch, harga
+        FROM harga_emas
+        WHERE waktu_epoch BETWEEN ? AND ?
+        ORDER BY waktu_epoch
+        """, (mulai if mulai is not None else -EPOCH_MAKS, akhir if akhir is not None else EPOCH_MAKS))
+        try:
+            while True:
+                rows = cursor.fetchmany(ukuran_chunk)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+
+def _tulis_csv(fileobj, chunks):
+    teks = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    writer = csv.writer(teks)
+    writer.writerow(["waktu", "harga"])
+    jumlah = 0
+    for rows in chunks:
+        writer.writerows((waktu, harga) for waktu, _, harga in rows)
+        jumlah += len(rows)
+    teks.flush()
+    teks.detach()  # Jangan ikut menutup fileobj
+    return jumlah
+
+
+def _tulis_parquet(fileobj, chunks):
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Export Parquet butuh pyarrow: pip install pyarrow")
+    schema = pa.schema([("waktu", pa.timestamp("s")), ("harga", pa.int64())])
+    jumlah = 0
+    with pq.ParquetWriter(fileobj, schema, compression="snappy") as writer:
+        for rows in chunks:
+            writer.write_table(pa.table({
+                "waktu": pa.array([epoch + OFFSET_LOKAL for _, epoch, _ in rows], pa.timestamp("s")),
+                "harga": pa.array([harga for _, _, harga in rows], pa.int64()),
+            }, schema=schema))
+            jumlah += len(rows)
+    return jumlah
+
+
+def _tulis_xlsx(fileobj, chunks):
+    if not EXCEL_AVAILABLE:
+        raise RuntimeError("Export Excel butuh openpyxl: pip install openpyxl")
+    # write_only: baris langsung di-stream ke file sementara openpyxl, tidak disimpan per cell
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Harga Emas")
+    ws.append(["waktu", "harga"])
+    jumlah = 0
+    for rows in chunks:
+        if jumlah + len(rows) > EXCEL_MAKS_BARIS:
+            raise ValueError(f"Lebih dari {EXCEL_MAKS_BARIS:,} baris, pilih rentang lebih pendek atau pakai CSV/Parquet")
+        for waktu, _, harga in rows:
+            ws.append([datetime.fromisoformat(waktu), harga])
+        jumlah += len(rows)
+    wb.save(fileobj)
+    return jumlah
+
+
+def ekspor(fileobj, format="csv", db_path=DB_HARGA, mulai=None, akhir=None):
+    """Tulis riwayat harga ke fileobj biner. Return jumlah baris"""
+    chunks = iter_chunk(db_path, mulai, akhir)
+    if format == "csv":
+        return _tulis_csv(fileobj, chunks)
+    if format == "csv.gz":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb") as gz:
+            return _tulis_csv(gz, chunks)
+    if format == "parquet":
+        return _tulis_parquet(fileobj, chunks)
+    if format == "xlsx":
+        return _tulis_xlsx(fileobj, chunks)
+    raise ValueError(f"Format export tidak dikenal: {format}")
+
+
+def ekspor_ke_spool(format="csv", db_path=DB_HARGA, mulai=None, akhir=None):
+    """Export ke SpooledTemporaryFile (pindah ke disk jika > EXPORT_SPOOL_MAKS), posisi di awal"""
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAKS)
+    ekspor(spool, format, db_path, mulai, akhir)
+    spool.seek(0)
+    return spool
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export riwayat harga emas")
+    parser.add_argument("--db", default=DB_HARGA, help="Path database harga")
+    parser.add_argument("--format", choices=list(FORMAT_EKSPOR), default="csv")
+    parser.add_argument("--mulai", type=date.fromisoformat, help="Tanggal awal (YYYY-MM-DD)")
+    parser.add_argument("--akhir", type=date.fromisoformat, help="Tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument("--output", required=True, help="File tujuan")
+    args = parser.parse_args(argv)
+
+    mulai = tanggal_ke_epoch(args.mulai) if args.mulai else None
+    akhir = tanggal_ke_epoch(args.akhir, akhir_hari=True) if args.akhir else None
+    with open(args.output, "wb") as f:
+        jumlah = ekspor(f, args.format, args.db, mulai, akhir)
+    print(f"{jumlah} baris ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+HARGA_PARSER.PY - Parser harga emas dari halaman HTML dengan aturan yang bisa diganti
+Aturan dicoba berurutan (regex terkompilasi, selector CSS), setiap kandidat
+angka divalidasi terhadap rentang wajar HARGA_BATAS_BAWAH..HARGA_BATAS_ATAS.
+Aturan regex bisa jalan di atas chunk response yang masih di-stream, jadi
+download bisa berhenti begitu harga ditemukan.
+
+    parser = buat_parser_default()
+    harga = parser.parse(html)                 # HargaTerparsa(nilai=2951000, ...)
+    harga = parser.parse_stream(resp.iter_content(8192))
+"""
+import codecs
+import re
+from typing import NamedTuple
+
+from config import HARGA_REGEX_PATTERN, HARGA_CSS_SELECTOR, HARGA_BATAS_BAWAH, HARGA_BATAS_ATAS
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+_ANGKA_RUPIAH = re.compile(r'\d{1,3}(?:\.\d{3})+|\d+')
+_KARAKTER_ANGKA = "0123456789.,"
+
+
+class HargaTerparsa(NamedTuple):
+    nilai: int    # Rupiah, mis. 2951000
+    teks: str     # Format tampilan "2.951.000"
+    aturan: str   # Nama aturan yang menemukan harga
+
+
+def format_rupiah(nilai):
+    """2951000 -> "2.951.000" """
+    return f"{nilai:,}".replace(",", ".")
+
+
+def teks_ke_nilai(teks):
+    """Ambil angka rupiah pertama dari teks ("Rp 2.951.000,-" -> 2951000), None jika tidak ada"""
+    match = _ANGKA_RUPIAH.search(teks)
+    return int(match.group(0).replace(".", "")) if match else None
+
+
+# ============================================
+# ATURAN EKSTRAKSI
+# ============================================
+class AturanRegex:
+    """Kandidat = semua match regex (group 1 jika ada, selain itu seluruh match)"""
+    streaming = True
+
+    def __init__(self, pola, nama=None, overlap=64):
+        self.pola = re.compile(pola)
+        self.nama = nama or f"regex:{pola}"
+        self.overlap = overlap  # Sisa chunk sebelumnya yang ikut dicari, untuk match yang terpotong
+
+    def kandidat(self, teks):
+        for match in self.pola.finditer(teks):
+            yield match.group(1) if self.pola.groups else match.group(0)
+
+
+class AturanCSS:
+    """Kandidat = teks elemen yang cocok dengan selector (butuh dokumen lengkap)"""
+    streaming = False
+
+    def __init__(self, selector, nama=None):
+        if not BS4_AVAILABLE:
+            raise RuntimeError("Aturan CSS butuh beautifulsoup4: pip install beautifulsoup4")
+        self.selector = selector
+        self.nama = nama or f"css:{selector}"
+
+    def kandidat(self, teks):
+        for elemen in BeautifulSoup(teks, "html.parser").select(self.selector):
+            yield elemen.get_text(" ", strip=True)
+
+
+# ============================================
+# PARSER
+# ============================================
+class ParserHarga:
+    def __init__(self, aturan, batas_bawah=HARGA_BATAS_BAWAH, batas_atas=HARGA_BATAS_ATAS):
+        self.aturan = list(aturan)
+        self.batas_bawah = batas_bawah
+        self.batas_atas = batas_atas
+
+    def validasi(self, teks, aturan):
+        """HargaTerparsa jika kandidat berisi angka dalam rentang wajar, selain itu None"""
+        nilai = teks_ke_nilai(teks)
+        if nilai is None or not self.batas_bawah <= nilai <= self.batas_atas:
+            return None
+        return HargaTerparsa(nilai, format_rupiah(nilai), aturan.nama)
+
+    def _cari(self, aturan, teks):
+        for kandidat in aturan.kandidat(teks):
+            harga = self.validasi(kandidat, aturan)
+            if harga:
+                return harga
+        return None
+
+    def parse(self, teks):
+        """Harga dari dokumen lengkap (raise ValueError jika tidak ada kandidat valid)"""
+        for aturan in self.aturan:
+            harga = self._cari(aturan, teks)
+            if harga:
+                return harga
+        raise ValueError("Harga tidak ditemukan di halaman (atau di luar rentang wajar)")
+
+    def parse_stream(self, chunks, encoding="utf-8"):
+        """Harga dari chunk response (bytes/str). Jika aturan pertama bisa streaming,
+        pencarian jalan per chunk dan berhenti begitu harga ditemukan"""
+        stream = self.stream(encoding)
+        for chunk in chunks:
+            harga = stream.tambah(chunk)
+            if harga:
+                return harga
+        return stream.selesai()
+
+    def stream(self, encoding="utf-8"):
+        """ParseStream untuk diisi chunk satu per satu (mis. dari response async)"""
+        return ParseStream(self, encoding)
+
+
+class ParseStream:
+    def __init__(self, parser, encoding="utf-8"):
+        self.parser = parser
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        aturan = parser.aturan
+        self._utama = aturan[0] if aturan and aturan[0].streaming else None
+        self._bagian = []
+        self._sisa = ""  # Ekor chunk sebelumnya untuk match yang terpotong batas chunk
+        self._buang_angka = False  # Sedang di tengah deretan angka yang terlalu panjang untuk jadi harga
+
+    def tambah(self, chunk):
+        """Proses satu chunk. Return HargaTerparsa jika harga sudah ditemukan, selain itu None"""
+        teks = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self._bagian.append(teks)
+        utama = self._utama
+        if utama is None:
+            return None
+        if self._buang_angka:
+            lanjutan = teks.lstrip(_KARAKTER_ANGKA)
+            if not lanjutan:
+                return None
+            teks = lanjutan
+            self._buang_angka = False
+        jendela = self._sisa + teks
+        # Angka di ujung chunk mungkin masih bersambung di chunk berikutnya
+        lengkap = jendela.rstrip(_KARAKTER_ANGKA)
+        harga = self.parser._cari(utama, lengkap)
+        if harga:
+            return harga
+        # Ekor (termasuk angka yang belum lengkap) ikut dicari bersama chunk berikutnya,
+        # angka terpotong di awal ekor dibuang agar tidak jadi kandidat palsu
+        awal = max(len(lengkap) - utama.overlap, 0)
+        self._sisa = jendela[awal:]
+        if awal and jendela[awal - 1] in _KARAKTER_ANGKA:
+            self._sisa = self._sisa.lstrip(_KARAKTER_ANGKA)
+        if len(jendela) - len(lengkap) > utama.overlap:
+            # Angka di ujung lebih panjang dari overlap (mis. data di dalam <script>) pasti
+            # bukan harga: dibuang beserta lanjutannya supaya ekor tidak tumbuh terus
+            # dan setiap chunk kecil tidak mencari ulang seluruh deretan angka
+            self._sisa = ""
+            self._buang_angka = True
+        return None
+
+    def selesai(self):
+        """Response habis: jalankan semua aturan atas dokumen lengkap (raise ValueError jika gagal)"""
+        self._bagian.append(self._decoder.decode(b"", final=True))
+        return self.parser.parse("".join(self._bagian))
+
+
+def buat_parser_default():
+    """Parser sesuai config: selector CSS (jika diisi) lalu regex HARGA_REGEX_PATTERN"""
+    aturan = []
+    if HARGA_CSS_SELECTOR and BS4_AVAILABLE:
+        aturan.append(AturanCSS(HARGA_CSS_SELECTOR))
+    aturan.append(AturanRegex(HARGA_REGEX_PATTERN))
+    return ParserHarga(aturan)
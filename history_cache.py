@@ -0,0 +1,88 @@
+"""
+HISTORY_CACHE.PY - Cache riwayat harga inkremental yang dibagi semua sesi
+Menyimpan N tick terakhir di ring buffer (deque). Setiap refresh hanya
+membaca baris baru (WHERE id > id_terakhir), bukan seluruh jendela data.
+Atribut `versi` (id terakhir) bisa dipakai sebagai kunci cache turunan
+sehingga cache lain hanya invalid jika memang ada data baru.
+"""
+import sqlite3
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from config import DB_HARGA, TIMEZONE, CHART_LIMIT_DATA, HISTORY_CACHE_MIN_INTERVAL
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+
+
+def epoch_ke_waktu(epoch):
+    """Ubah kolom epoch (detik UTC) menjadi datetime lokal tanpa parsing teks"""
+    return pd.to_datetime(epoch, unit='s', utc=True).dt.tz_convert(TIMEZONE).dt.tz_localize(None)
+
+
+class HistoryCache:
+    def __init__(self, db_path=DB_HARGA, kapasitas=CHART_LIMIT_DATA,
+                 min_interval=HISTORY_CACHE_MIN_INTERVAL):
+        self.db_path = db_path
+        self.min_interval = min_interval
+        self.versi = 0  # id terakhir yang sudah dimuat
+
+        self._buffer = deque(maxlen=kapasitas)
+        self._lock = threading.Lock()
+        self._terakhir_cek = 0.0
+        self._df = None
+        self._df_versi = None
+
+    def refresh(self, paksa=False):
+        """Ambil baris baru dari database. Return jumlah baris baru"""
+        with self._lock:
+            sekarang = time.monotonic()
+            if not paksa and sekarang - self._terakhir_cek < self.min_interval:
+                return 0
+            self._terakhir_cek = sekarang
+
+            try:
+                with get_pool(self.db_path, migrasi=migrasi_db_harga).koneksi() as conn:
+                    rows = self._ambil_baris_baru(conn)
+            except sqlite3.Error:
+                return 0
+
+            self._buffer.extend(rows)
+            if rows:
+                self.versi = rows[-1][0]
+            return len(rows)
+
+    def _ambil_baris_baru(self, conn):
+        maks_id = conn.execute("SELECT max(id) FROM harga_emas").fetchone()[0] or 0
+        if maks_id < self.versi:
+            # Database di-reset / baris dihapus -> muat ulang dari awal
+            self._buffer.clear()
+            self.versi = 0
+        if maks_id == self.versi:
+            return []
+
+        # Ambil dari yang terbaru: jika tertinggal lebih dari kapasitas,
+        # baris lama memang akan terbuang dari ring buffer
+        rows = conn.execute("""
+        SELECT id, waktu_epoch, harga FROM harga_emas
+        WHERE id > ?
+        ORDER BY id DESC
+        LIMIT ?
+        """, (self.versi, self._buffer.maxlen)).fetchall()
+        return rows[::-1]
+
+    def get_dataframe(self):
+        """DataFrame (waktu, harga) dari isi ring buffer, dibangun ulang hanya jika versi berubah"""
+        self.refresh()
+        with self._lock:
+            if self._df_versi != self.versi:
+                if not self._buffer:
+                    self._df = pd.DataFrame(columns=['waktu', 'harga'])
+                else:
+                    df = pd.DataFrame(list(self._buffer), columns=['id', 'waktu_epoch', 'harga'])
+                    df['waktu'] = epoch_ke_waktu(df['waktu_epoch'])
+                    self._df = df[['waktu', 'harga']]
+                self._df_versi = self.versi
+            return self._df.copy()
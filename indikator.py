@@ -0,0 +1,285 @@
+"""
+INDIKATOR.PY - Indikator teknikal (SMA, EMA, RSI, MACD, Bollinger) untuk chart
+Setiap indikator punya dua jalur yang hasilnya sama:
+  - batch(close)  : vektor NumPy/pandas untuk backfill, sekaligus menyimpan state akhir
+  - update(close) : O(1) per bucket baru, melanjutkan state dari batch
+IndikatorCache menyimpan satu seri per (indikator, parameter, resolusi) dan
+setiap refresh hanya memproses bucket yang belum pernah dihitung.
+"""
+import copy
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from config import DB_HARGA, CHART_MAKS_TITIK, INDIKATOR_WARMUP
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from history_cache import epoch_ke_waktu
+from rollup_ohlc import LEBAR_TICK, RESOLUSI, ambil_ohlc
+
+
+# ============================================
+# INDIKATOR (BATCH + STREAMING)
+# ============================================
+class SMA:
+    kolom = ("sma",)
+
+    def __init__(self, n=20):
+        self.n = n
+        self._jendela = deque(maxlen=n)
+        self._total = 0
+
+    def batch(self, close):
+        hasil = pd.Series(close, dtype=float).rolling(self.n).mean().to_numpy()
+        self._jendela.clear()
+        self._jendela.extend(np.asarray(close)[-self.n:].tolist())
+        self._total = sum(self._jendela)
+        return {"sma": hasil}
+
+    def update(self, close):
+        if len(self._jendela) == self.n:
+            self._total -= self._jendela[0]
+        self._jendela.append(close)
+        self._total += close
+        return {"sma": self._total / self.n if len(self._jendela) == self.n else np.nan}
+
+
+class EMA:
+    kolom = ("ema",)
+
+    def __init__(self, n=20):
+        self.n = n
+        self.alpha = 2 / (n + 1)
+        self.nilai = None
+
+    def batch(self, close):
+        if len(close) == 0:
+            return {"ema": np.array([])}
+        hasil = pd.Series(close, dtype=float).ewm(alpha=self.alpha, adjust=False).mean().to_numpy()
+        self.nilai = hasil[-1]
+        return {"ema": hasil}
+
+    def update(self, close):
+        self.nilai = close if self.nilai is None else self.nilai + self.alpha * (close - self.nilai)
+        return {"ema": self.nilai}
+
+
+class RSI:
+    """RSI dengan smoothing Wilder (alpha = 1/n)"""
+    kolom = ("rsi",)
+
+    def __init__(self, n=14):
+        self.n = n
+        self._close_lalu = None
+        self._naik = None
+        self._turun = None
+
+    @staticmethod
+    def _rsi(naik, turun):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(turun == 0, np.where(naik == 0, 50.0, 100.0), 100 - 100 / (1 + naik / turun))
+
+    def batch(self, close):
+        close = np.asarray(close, dtype=float)
+        hasil = np.full(len(close), np.nan)
+        if len(close) >= 2:
+            selisih = np.diff(close)
+            naik = pd.Series(np.clip(selisih, 0, None)).ewm(alpha=1 / self.n, adjust=False).mean().to_numpy()
+            turun = pd.Series(np.clip(-selisih, 0, None)).ewm(alpha=1 / self.n, adjust=False).mean().to_numpy()
+            hasil[1:] = self._rsi(naik, turun)
+            self._naik, self._turun = naik[-1], turun[-1]
+        self._close_lalu = close[-1] if len(close) else None
+        return {"rsi": hasil}
+
+    def update(self, close):
+        if self._close_lalu is None:
+            self._close_lalu = close
+            return {"rsi": np.nan}
+        selisih = close - self._close_lalu
+        self._close_lalu = close
+        naik, turun = max(selisih, 0), max(-selisih, 0)
+        if self._naik is None:
+            self._naik, self._turun = naik, turun
+        else:
+            self._naik += (naik - self._naik) / self.n
+            self._turun += (turun - self._turun) / self.n
+        return {"rsi": float(self._rsi(np.float64(self._naik), np.float64(self._turun)))}
+
+
+class MACD:
+    kolom = ("macd", "sinyal", "histogram")
+
+    def __init__(self, cepat=12, lambat=26, sinyal=9):
+        self._cepat = EMA(cepat)
+        self._lambat = EMA(lambat)
+        self._sinyal = EMA(sinyal)
+
+    def batch(self, close):
+        macd = self._cepat.batch(close)["ema"] - self._lambat.batch(close)["ema"]
+        sinyal = self._sinyal.batch(macd)["ema"]
+        return {"macd": macd, "sinyal": sinyal, "histogram": macd - sinyal}
+
+    def update(self, close):
+        macd = self._cepat.update(close)["ema"] - self._lambat.update(close)["ema"]
+        sinyal = self._sinyal.update(macd)["ema"]
+        return {"macd": macd, "sinyal": sinyal, "histogram": macd - sinyal}
+
+
+class Bollinger:
+    """Band = SMA n ± k * standar deviasi populasi n bucket terakhir"""
+    kolom = ("tengah", "atas", "bawah")
+
+    def __init__(self, n=20, k=2):
+        self.n = n
+        self.k = k
+        self._jendela = deque(maxlen=n)
+        self._total = 0
+        self._total_kuadrat = 0
+
+    def _band(self, tengah, std):
+        return {"tengah": tengah, "atas": tengah + self.k * std, "bawah": tengah - self.k * std}
+
+    def batch(self, close):
+        seri = pd.Series(close, dtype=float)
+        tengah = seri.rolling(self.n).mean().to_numpy()
+        std = seri.rolling(self.n).std(ddof=0).to_numpy()
+        # Harga di database INTEGER -> jumlah (kuadrat) int Python tetap eksak saat streaming
+        self._jendela.clear()
+        self._jendela.extend(np.asarray(close)[-self.n:].tolist())
+        self._total = sum(self._jendela)
+        self._total_kuadrat = sum(x * x for x in self._jendela)
+        return self._band(tengah, std)
+
+    def update(self, close):
+        if len(self._jendela) == self.n:
+            lama = self._jendela[0]
+            self._total -= lama
+            self._total_kuadrat -= lama * lama
+        self._jendela.append(close)
+        self._total += close
+        self._total_kuadrat += close * close
+        if len(self._jendela) < self.n:
+            return self._band(np.nan, np.nan)
+        tengah = self._total / self.n
+        return self._band(tengah, max(self._total_kuadrat / self.n - tengah * tengah, 0) ** 0.5)
+
+
+# nama -> (kelas, parameter default, tampil di panel harga atau panel terpisah)
+INDIKATOR = {
+    "SMA 20": (SMA, {"n": 20}, "harga"),
+    "EMA 50": (EMA, {"n": 50}, "harga"),
+    "Bollinger": (Bollinger, {"n": 20, "k": 2}, "harga"),
+    "RSI 14": (RSI, {"n": 14}, "panel"),
+    "MACD": (MACD, {"cepat": 12, "lambat": 26, "sinyal": 9}, "panel"),
+}
+
+
+# ============================================
+# SERI INKREMENTAL PER (INDIKATOR, PARAMETER, RESOLUSI)
+# ============================================
+class SeriIndikator:
+    def __init__(self, kelas, params, resolusi, maks_titik=CHART_MAKS_TITIK, warmup=INDIKATOR_WARMUP):
+        self.kelas = kelas
+        self.params = params
+        self.resolusi = resolusi
+        self.lebar = LEBAR_TICK if resolusi == "tick" else RESOLUSI[resolusi][1]
+        self.panjang = maks_titik + warmup  # Bucket yang disimpan: cukup untuk rentang chart terpanjang
+        self._reset()
+
+    def _reset(self):
+        self.indikator = self.kelas(**self.params)  # State sampai bucket tertutup terakhir
+        self.epoch = []
+        self.nilai = {k: [] for k in self.kelas.kolom}
+        self.epoch_tertutup = None
+        self.sementara = None  # (epoch, nilai) bucket terakhir yang masih bisa berubah
+
+    def _simpan(self, epoch, nilai):
+        self.epoch.extend(epoch)
+        for k in self.kelas.kolom:
+            self.nilai[k].extend(nilai[k])
+        if len(self.epoch) > 2 * self.panjang:
+            # Buang bucket lama sekaligus (amortized), jangan setiap bucket
+            del self.epoch[:-self.panjang]
+            for k in self.kelas.kolom:
+                del self.nilai[k][:-self.panjang]
+        if self.epoch:
+            self.epoch_tertutup = self.epoch[-1]
+
+    def perbarui(self, conn):
+        """Hitung bucket baru saja. Bucket terakhir rollup masih terbuka,
+        jadi nilainya dihitung dari salinan state dan tidak disimpan permanen"""
+        (akhir,) = conn.execute("SELECT max(waktu_epoch) FROM harga_emas").fetchone()
+        if akhir is None or (self.epoch_tertutup is not None and akhir < self.epoch_tertutup):
+            self._reset()  # Tabel dikosongkan / diganti
+            if akhir is None:
+                return
+
+        if self.epoch_tertutup is None and self.resolusi == "tick":
+            # Jarak tick tidak tetap (poller adaptif) -> backfill per jumlah baris, bukan rentang waktu
+            rows = conn.execute(
+                "SELECT waktu_epoch, harga, harga, harga, harga FROM harga_emas "
+                "ORDER BY waktu_epoch DESC LIMIT ?", (self.panjang,)
+            ).fetchall()[::-1]
+        elif self.epoch_tertutup is None:
+            rows = ambil_ohlc(conn, akhir - self.lebar * self.panjang, akhir, self.resolusi)
+        else:
+            rows = [r for r in ambil_ohlc(conn, self.epoch_tertutup + 1, akhir, self.resolusi)
+                    if r[0] > self.epoch_tertutup]
+        if not rows:
+            return
+
+        # Tick mentah tidak pernah berubah, bucket rollup terakhir masih bisa berubah
+        tertutup, terbuka = (rows, None) if self.resolusi == "tick" else (rows[:-1], rows[-1])
+        if tertutup:
+            epoch = [r[0] for r in tertutup]
+            if self.epoch_tertutup is None:
+                self._simpan(epoch, self.indikator.batch(np.array([r[4] for r in tertutup])))
+            else:
+                nilai = {k: [] for k in self.kelas.kolom}
+                for r in tertutup:
+                    for k, v in self.indikator.update(r[4]).items():
+                        nilai[k].append(v)
+                self._simpan(epoch, nilai)
+        if terbuka is not None:
+            self.sementara = (terbuka[0], copy.deepcopy(self.indikator).update(terbuka[4]))
+        else:
+            self.sementara = None
+
+    def get_dataframe(self, mulai=None):
+        """DataFrame (waktu, kolom indikator...) untuk bucket >= mulai"""
+        epoch = np.array(self.epoch, dtype=np.int64)
+        data = {k: np.array(v, dtype=float) for k, v in self.nilai.items()}
+        if self.sementara is not None:
+            epoch = np.append(epoch, self.sementara[0])
+            data = {k: np.append(v, self.sementara[1][k]) for k, v in data.items()}
+        if mulai is not None:
+            idx = np.searchsorted(epoch, mulai)
+            epoch = epoch[idx:]
+            data = {k: v[idx:] for k, v in data.items()}
+        df = pd.DataFrame(data)
+        df.insert(0, 'waktu', epoch_ke_waktu(pd.Series(epoch)))
+        return df
+
+
+class IndikatorCache:
+    """Seri indikator bersama untuk semua sesi dashboard"""
+
+    def __init__(self, db_path=DB_HARGA):
+        self.db_path = db_path
+        self._seri = {}
+        self._lock = threading.Lock()
+
+    def ambil(self, nama, resolusi, mulai=None, params=None):
+        """DataFrame indikator `nama` pada resolusi chart, hanya bucket baru yang dihitung"""
+        kelas, params_default, _ = INDIKATOR[nama]
+        params = params or params_default
+        kunci = (nama, tuple(sorted(params.items())), resolusi)
+        with self._lock:
+            seri = self._seri.get(kunci)
+            if seri is None:
+                seri = self._seri[kunci] = SeriIndikator(kelas, params, resolusi)
+            with get_pool(self.db_path, migrasi_db_harga).koneksi() as conn:
+                seri.perbarui(conn)
+            return seri.get_dataframe(mulai)
@@ -0,0 +1,176 @@
+"""
+INGEST_HARGA.PY - Worker headless pengisi database riwayat harga emas
+Jalankan terpisah dari dashboard:
+
+    python ingest_harga.py
+    python ingest_harga.py --interval 30 --flush-interval 120
+
+Harga diambil dengan logika scraping yang sama dengan dashboard
+(price_poller), ditampung di memori, lalu ditulis ke tabel harga_emas
+secara batch dalam satu transaksi. Database memakai WAL sehingga
+dashboard tetap bisa membaca selama worker menulis. Statistik per
+jendela (statistik_harga) ikut diperbarui di transaksi yang sama. Setelah
+batch tersimpan, price alert diproses (crossing) di sini, bukan di UI.
+Selama jam tutup (operasi_schedule) worker tidak scraping sama sekali,
+selama buka jeda scraping mengikuti volatilitas harga (jadwal_polling).
+"""
+import argparse
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import (
+    DB_HARGA,
+    DB_ALERTS,
+    DEFAULT_REFRESH_INTERVAL,
+    INGEST_FLUSH_INTERVAL,
+    INGEST_BATCH_MAKS,
+    LOG_FILE,
+    LOG_LEVEL,
+    ENABLE_LOGGING,
+)
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from jadwal_polling import PenjadwalAdaptif
+from operasi_schedule import OperasiSchedule
+from price_alert import PriceAlert
+from price_poller import PricePoller
+from statistik_harga import StatistikHarga
+
+logger = logging.getLogger("ingest_harga")
+
+
+def harga_ke_int(harga_str):
+    """Ubah "2.950.000" menjadi 2950000"""
+    return int(harga_str.replace(".", ""))
+
+
+class TickWriter:
+    def __init__(self, db_path=DB_HARGA, batch_maks=INGEST_BATCH_MAKS, alerts=None):
+        self.db_path = db_path
+        self.alerts = alerts  # PriceAlert opsional, diproses setelah batch tersimpan
+        self.batch_maks = batch_maks
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._penuh = threading.Event()
+        self._statistik = None  # StatistikHarga, dimuat dari database saat flush pertama
+        # Pool WAL + busy_timeout, koneksi penulis dipinjam per flush()
+        self._pool = get_pool(db_path, migrasi=migrasi_db_harga)
+
+    def tambah(self, harga_str, waktu_fetch):
+        """Tampung satu tick (dipanggil dari thread poller, tanpa I/O disk)"""
+        waktu = datetime.fromtimestamp(waktu_fetch).strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self._buffer.append((waktu, int(waktu_fetch), harga_ke_int(harga_str)))
+            if len(self._buffer) >= self.batch_maks:
+                self._penuh.set()
+
+    def flush(self):
+        """Tulis semua tick yang tertampung dalam satu transaksi. Return jumlah baris"""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._penuh.clear()
+        if not batch:
+            return 0
+
+        try:
+            with self._pool.transaksi() as conn:
+                conn.executemany(
+                    "INSERT INTO harga_emas (waktu, waktu_epoch, harga) VALUES (?, ?, ?)",
+                    batch
+                )
+                if self._statistik is None:
+                    # Dimuat setelah INSERT sehingga batch ini sudah ikut terhitung
+                    self._statistik = StatistikHarga().muat_dari_db(conn)
+                else:
+                    for _, epoch, harga in batch:
+                        self._statistik.tambah(epoch, harga)
+                self._statistik.simpan(conn)
+        except sqlite3.Error:
+            # Statistik di memori mungkin sudah maju padahal transaksi di-rollback
+            self._statistik = None
+            # Kembalikan batch ke depan buffer supaya dicoba lagi di flush berikutnya
+            with self._lock:
+                self._buffer[:0] = batch
+            raise
+
+        if self.alerts is not None:
+            try:
+                terpicu = self.alerts.proses_ticks([(epoch, harga) for _, epoch, harga in batch])
+                for alert in terpicu:
+                    logger.info("Alert terpicu: %s", alert["pesan"])
+            except sqlite3.Error as e:
+                logger.error("Gagal memproses price alert: %s", e)
+        return len(batch)
+
+    def tunggu(self, timeout):
+        """Tunggu sampai flush interval habis atau buffer penuh"""
+        self._penuh.wait(timeout)
+
+    def close(self):
+        self._pool.tutup()
+
+
+def setup_logging():
+    if not ENABLE_LOGGING:
+        return
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL, logging.INFO),
+        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+        handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler()]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Worker pengisi riwayat harga emas")
+    parser.add_argument("--db", default=DB_HARGA, help="Path database harga")
+    parser.add_argument("--db-alerts", default=DB_ALERTS, help="Path database price alert")
+    parser.add_argument("--interval", type=float, default=DEFAULT_REFRESH_INTERVAL,
+                        help="Interval scraping harga (detik), titik awal jeda adaptif")
+    parser.add_argument("--interval-tetap", action="store_true",
+                        help="Scraping tepat setiap --interval detik, tanpa jeda adaptif")
+    parser.add_argument("--flush-interval", type=float, default=INGEST_FLUSH_INTERVAL,
+                        help="Interval penulisan batch ke database (detik)")
+    parser.add_argument("--abaikan-jadwal", action="store_true",
+                        help="Tetap scraping saat jam tutup (HARI_TUTUP / hari libur)")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    writer = TickWriter(args.db, alerts=PriceAlert(args.db_alerts))
+    jadwal = None if args.abaikan_jadwal else OperasiSchedule()
+    penjadwal = None if args.interval_tetap else PenjadwalAdaptif(interval_dasar=args.interval)
+    poller = PricePoller(interval=args.interval, callback=writer.tambah, jadwal=jadwal,
+                         penjadwal=penjadwal).start()
+    logger.info("Ingest berjalan: db=%s interval=%ss flush=%ss",
+                args.db, args.interval, args.flush_interval)
+
+    gagal_dilaporkan = 0
+    try:
+        while True:
+            writer.tunggu(args.flush_interval)
+            try:
+                jumlah = writer.flush()
+                if jumlah:
+                    logger.info("%d tick ditulis", jumlah)
+            except sqlite3.Error as e:
+                logger.error("Gagal menulis batch: %s", e)
+            snapshot = poller.get_snapshot()
+            if snapshot.gagal_beruntun > gagal_dilaporkan:
+                logger.warning("Scraping gagal %dx: %s",
+                               snapshot.gagal_beruntun, snapshot.error_terakhir)
+            gagal_dilaporkan = snapshot.gagal_beruntun
+    except KeyboardInterrupt:
+        logger.info("Menghentikan ingest...")
+    finally:
+        poller.stop(timeout=5)
+        try:
+            writer.flush()
+        except sqlite3.Error as e:
+            # Jangan menutupi exception asli yang sedang dinaikkan
+            logger.error("Gagal menulis batch terakhir: %s", e)
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+JADWAL_POLLING.PY - Interval polling harga adaptif + budget request per sumber
+PenjadwalAdaptif memperkirakan volatilitas dari perubahan harga antar poll
+(EWMA |perubahan relatif| / sqrt(detik), model random walk). Volatilitas
+referensi = volatilitas yang menghasilkan perubahan POLLING_PERUBAHAN_TARGET
+per interval dasar; jeda = interval_dasar * (referensi / volatilitas)^(2/3).
+Pangkat 2/3 meminimalkan rata-rata selisih harga tampil vs harga sebenarnya
+untuk jumlah request yang sama: harga bergerak -> poll makin rapat, harga
+datar -> jeda memanjang sampai POLLING_INTERVAL_MAKS. Jam tutup ditangani
+PricePoller lewat OperasiSchedule.
+
+BudgetSumber adalah token bucket per host upstream yang dipakai bersama semua
+poller di proses ini: isi ulang POLLING_BUDGET_PER_JAM token per jam, burst
+maksimal jatah POLLING_BUDGET_BURST detik. Dalam jendela satu jam mana pun
+request ke satu situs paling banyak PER_JAM * (1 + BURST / 3600), walaupun
+interval sedang rapat. Budget habis dilaporkan sebagai BudgetHabis (bukan
+kegagalan sumber): poller cukup menunggu token berikutnya tanpa backoff.
+"""
+import math
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import (
+    DEFAULT_REFRESH_INTERVAL,
+    POLLING_INTERVAL_MIN,
+    POLLING_INTERVAL_MAKS,
+    POLLING_PERUBAHAN_TARGET,
+    POLLING_EWMA_ALPHA,
+    POLLING_BUDGET_PER_JAM,
+    POLLING_BUDGET_BURST,
+)
+
+
+class BudgetHabis(RuntimeError):
+    """Request ditahan karena budget host habis. `tunggu` = detik sampai token berikutnya"""
+
+    def __init__(self, pesan, tunggu):
+        super().__init__(pesan)
+        self.tunggu = tunggu
+
+
+class PenjadwalAdaptif:
+    def __init__(self, interval_dasar=DEFAULT_REFRESH_INTERVAL, interval_min=POLLING_INTERVAL_MIN,
+                 interval_maks=POLLING_INTERVAL_MAKS, target=POLLING_PERUBAHAN_TARGET, alpha=POLLING_EWMA_ALPHA):
+        self.interval_dasar = interval_dasar
+        self.interval_min = interval_min
+        self.interval_maks = interval_maks
+        self.target = target
+        self.alpha = alpha
+        self.volatilitas = None  # EWMA |perubahan relatif| per sqrt(detik)
+        self._terakhir = None    # (epoch, harga) poll berhasil sebelumnya
+
+    def catat(self, harga, waktu=None):
+        """Masukkan hasil poll yang berhasil (harga int)"""
+        waktu = time.time() if waktu is None else waktu
+        if self._terakhir is not None:
+            waktu_lalu, harga_lalu = self._terakhir
+            selang = waktu - waktu_lalu
+            if selang > 0 and harga_lalu:
+                sampel = abs(harga - harga_lalu) / harga_lalu / math.sqrt(selang)
+                self.volatilitas = (sampel if self.volatilitas is None
+                                    else self.alpha * sampel + (1 - self.alpha) * self.volatilitas)
+        self._terakhir = (waktu, harga)
+
+    def jeda_berikutnya(self):
+        """Detik sampai poll berikutnya, dibatasi min..maks"""
+        if self.volatilitas is None:
+            return self.interval_dasar
+        if self.volatilitas == 0:
+            return self.interval_maks
+        referensi = self.target / math.sqrt(self.interval_dasar)
+        jeda = self.interval_dasar * (referensi / self.volatilitas) ** (2 / 3)
+        return min(max(jeda, self.interval_min), self.interval_maks)
+
+    def reset(self):
+        """Lupakan riwayat (mis. setelah jam tutup, harga lama tidak relevan)"""
+        self.volatilitas = None
+        self._terakhir = None
+
+
+class BudgetSumber:
+    """Token bucket: isi ulang `per_jam` token per jam, burst maksimal jatah `burst` detik.
+    Bucket mulai penuh, jadi satu jam pertama pun tidak lebih dari per_jam + kapasitas"""
+
+    def __init__(self, per_jam=POLLING_BUDGET_PER_JAM, burst=POLLING_BUDGET_BURST):
+        self.laju = per_jam / 3600  # Token per detik
+        self.kapasitas = max(self.laju * burst, 1.0)
+        self._token = self.kapasitas
+        self._waktu = time.monotonic()
+        self._lock = threading.Lock()
+        self.ditolak = 0
+
+    def _isi(self, sekarang):
+        self._token = min(self.kapasitas, self._token + (sekarang - self._waktu) * self.laju)
+        self._waktu = sekarang
+
+    def ambil(self):
+        """Pakai satu token. False (dan tidak boleh request) jika budget habis"""
+        with self._lock:
+            self._isi(time.monotonic())
+            if self._token >= 1:
+                self._token -= 1
+                return True
+            self.ditolak += 1
+            return False
+
+    def tunggu(self):
+        """Detik sampai satu token tersedia (0 jika ada)"""
+        with self._lock:
+            self._isi(time.monotonic())
+            return max(1 - self._token, 0) / self.laju
+
+    def sisa(self):
+        with self._lock:
+            self._isi(time.monotonic())
+            return int(self._token)
+
+
+# ============================================
+# BUDGET BERSAMA (SATU PER HOST PER PROSES)
+# ============================================
+_budget = {}
+_budget_lock = threading.Lock()
+
+
+def get_budget(url, per_jam=POLLING_BUDGET_PER_JAM):
+    """Budget untuk host dari url (URL lain di host yang sama ikut berbagi)"""
+    host = urlsplit(url).netloc or url
+    with _budget_lock:
+        budget = _budget.get(host)
+        if budget is None:
+            budget = _budget[host] = BudgetSumber(per_jam)
+        return budget
+
+
+def pakai_budget(url):
+    """Ambil satu token untuk url, raise BudgetHabis jika budget host habis"""
+    budget = get_budget(url)
+    if not budget.ambil():
+        tunggu = budget.tunggu()
+        raise BudgetHabis(f"Budget request ke {urlsplit(url).netloc} habis, "
+                          f"coba lagi {tunggu:.0f} detik lagi", tunggu)
@@ -0,0 +1,168 @@
+"""
+KLASIFIKASI_BERITA.PY - Penilaian dampak berita terhadap harga emas dengan model lokal
+Berita yang dampaknya masih kosong (hasil kolektor) dikirim ke ollama,
+KLASIFIKASI_BATCH berita per prompt dan maksimal KLASIFIKASI_PARALEL request
+bersamaan. Verdict (Positif/Negatif/Netral + keyakinan 0..1) disimpan bersama
+berita dan di-cache per hash konten, jadi isi yang sama tidak dinilai dua kali.
+Setiap pengiriman ke model dicatat per berita; berita yang tetap tidak
+dijawab setelah KLASIFIKASI_MAKS_COBA percobaan keluar dari antrian.
+
+    python klasifikasi_berita.py                 # nilai semua berita yang belum dinilai
+    python klasifikasi_berita.py --model qwen2.5
+"""
+import argparse
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+try:
+    import ollama
+    OLLAMA_AVAILABLE = True
+except ImportError:
+    OLLAMA_AVAILABLE = False
+
+from config import (
+    DB_BERITA,
+    DAMPAK_OPTIONS,
+    OLLAMA_HOST,
+    OLLAMA_MODEL,
+    KLASIFIKASI_BATCH,
+    KLASIFIKASI_PARALEL,
+    KLASIFIKASI_TIMEOUT,
+)
+from news_berita import BeritaEmas
+
+logger = logging.getLogger("klasifikasi_berita")
+
+PROMPT_SISTEM = (
+    "Anda analis pasar emas. Untuk setiap berita bernomor, tentukan dampaknya terhadap "
+    "harga emas: Positif (mendorong harga naik), Negatif (menekan harga) atau Netral. "
+    'Jawab hanya dengan JSON {"hasil": [{"no": 1, "dampak": "Positif", "keyakinan": 0.8}, ...]} '
+    "dengan keyakinan antara 0 dan 1."
+)
+
+
+class HasilKlasifikasi(NamedTuple):
+    dari_cache: int  # Verdict diambil dari cache hash konten
+    dari_model: int  # Verdict baru dari model
+    gagal: int       # Berita yang tetap belum dinilai (dicoba lagi sampai KLASIFIKASI_MAKS_COBA kali)
+
+
+def buat_prompt(batch):
+    """Satu pesan berisi berita bernomor 1..n: (id, judul, deskripsi, hash) -> teks"""
+    return "\n".join(f"{no}. {judul} - {deskripsi}" for no, (_, judul, deskripsi, _) in enumerate(batch, 1))
+
+
+def baca_jawaban(teks):
+    """Jawaban JSON model -> dict nomor -> (dampak, keyakinan). Entri tidak valid dibuang"""
+    try:
+        data = json.loads(teks)
+    except json.JSONDecodeError:
+        # Sebagian model membungkus JSON dengan teks lain
+        match = re.search(r"\{.*\}", teks, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+    daftar = data.get("hasil", []) if isinstance(data, dict) else data
+    label = {d.lower(): d for d in DAMPAK_OPTIONS}
+
+    verdict = {}
+    for item in daftar if isinstance(daftar, list) else []:
+        if not isinstance(item, dict):
+            continue
+        dampak = label.get(str(item.get("dampak", "")).strip().lower())
+        try:
+            no = int(item.get("no"))
+        except (TypeError, ValueError):
+            continue
+        if dampak is None:
+            continue
+        try:
+            keyakinan = min(max(float(item.get("keyakinan")), 0.0), 1.0)
+        except (TypeError, ValueError):
+            keyakinan = None
+        verdict[no] = (dampak, keyakinan)
+    return verdict
+
+
+class PengklasifikasiBerita:
+    def __init__(self, berita=None, klien=None, model=OLLAMA_MODEL, host=OLLAMA_HOST,
+                 batch=KLASIFIKASI_BATCH, paralel=KLASIFIKASI_PARALEL):
+        self.berita = berita or BeritaEmas(DB_BERITA)
+        # Objek dengan .chat() ala ollama.Client; host bisa diarahkan ke endpoint stub
+        self.klien = klien or (ollama.Client(host=host, timeout=KLASIFIKASI_TIMEOUT)
+                               if OLLAMA_AVAILABLE else None)
+        self.model = model
+        self.batch = batch
+        self.paralel = paralel
+
+    def _nilai_batch(self, batch):
+        """Satu request ke model. Return list (id, hash_konten, dampak, keyakinan) yang valid"""
+        respon = self.klien.chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": PROMPT_SISTEM},
+                {"role": "user", "content": buat_prompt(batch)},
+            ],
+            format="json",
+            options={"temperature": 0},
+        )
+        verdict = baca_jawaban(respon["message"]["content"])
+        return [(id_, hash_, *verdict[no]) for no, (id_, _, _, hash_) in enumerate(batch, 1) if no in verdict]
+
+    def klasifikasi_sekali(self, maks=None):
+        """Nilai berita yang belum dinilai (maksimal `maks`). Return HasilKlasifikasi"""
+        if self.klien is None:
+            raise RuntimeError("Klasifikasi berita butuh ollama: pip install ollama")
+        antrian = self.berita.get_belum_dinilai(maks or self.batch * self.paralel * 4)
+        if not antrian:
+            return HasilKlasifikasi(0, 0, 0)
+
+        cache = self.berita.baca_cache_klasifikasi([row[3] for row in antrian])
+        dari_cache = [(id_, hash_, *cache[hash_]) for id_, _, _, hash_ in antrian if hash_ in cache]
+        self.berita.simpan_klasifikasi(dari_cache, perbarui_cache=False)
+        sisa = [row for row in antrian if row[3] not in cache]
+        self.berita.catat_percobaan([row[0] for row in sisa])
+
+        dari_model = 0
+        with ThreadPoolExecutor(max_workers=self.paralel, thread_name_prefix="klasifikasi-berita") as pool:
+            tugas = [pool.submit(self._nilai_batch, sisa[i:i + self.batch])
+                     for i in range(0, len(sisa), self.batch)]
+            for selesai in as_completed(tugas):
+                try:
+                    hasil = selesai.result()
+                except Exception as e:
+                    logger.warning("Batch klasifikasi gagal: %s", e)
+                    continue
+                # Disimpan per batch, hasil yang sudah ada tidak hilang jika batch lain gagal
+                self.berita.simpan_klasifikasi(hasil, model=self.model)
+                dari_model += len(hasil)
+        return HasilKlasifikasi(len(dari_cache), dari_model, len(sisa) - dari_model)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nilai dampak berita emas dengan model lokal ollama")
+    parser.add_argument("--db", default=DB_BERITA, help="Path database berita")
+    parser.add_argument("--model", default=OLLAMA_MODEL, help="Nama model ollama")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    pengklasifikasi = PengklasifikasiBerita(BeritaEmas(args.db), model=args.model)
+    total = HasilKlasifikasi(0, 0, 0)
+    while True:
+        hasil = pengklasifikasi.klasifikasi_sekali()
+        total = HasilKlasifikasi(*(a + b for a, b in zip(total, hasil)))
+        # Berhenti jika antrian habis. Berita yang gagal terus keluar dari antrian
+        # setelah KLASIFIKASI_MAKS_COBA percobaan, jadi loop ini selalu selesai
+        if sum(hasil) == 0:
+            break
+    print(f"{total.dari_model} dinilai model, {total.dari_cache} dari cache, {hasil.gagal} belum dinilai")
+
+
+if __name__ == "__main__":
+    main()
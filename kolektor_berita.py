@@ -0,0 +1,223 @@
+"""
+KOLEKTOR_BERITA.PY - Pengumpul berita emas di background
+Setiap CACHE_TTL_NEWS detik semua query di BERITA_QUERY dicari paralel
+(DuckDuckGo News), hasilnya di-dedup per URL & hash konten lalu hanya
+artikel baru yang disimpan ke database berita. Setelah itu berita yang
+belum punya dampak dinilai model lokal (klasifikasi_berita.py, jika ollama
+terpasang). Dashboard cukup membaca database, render halaman tidak pernah
+memicu request keluar.
+
+    python kolektor_berita.py            # worker headless
+    python kolektor_berita.py --sekali   # satu putaran lalu keluar
+"""
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+try:
+    from duckduckgo_search import DDGS
+    DDGS_AVAILABLE = True
+except ImportError:
+    DDGS_AVAILABLE = False
+
+from config import (
+    DB_BERITA,
+    CACHE_TTL_NEWS,
+    BERITA_QUERY,
+    BERITA_MAKS_PER_QUERY,
+    BERITA_WORKER,
+    BERITA_TIMEOUT,
+)
+from klasifikasi_berita import OLLAMA_AVAILABLE, PengklasifikasiBerita
+from news_berita import BeritaEmas, hash_konten, normalisasi_url
+
+logger = logging.getLogger("kolektor_berita")
+
+
+class StatusKolektor(NamedTuple):
+    """Hasil putaran terakhir, dibaca dashboard tanpa I/O"""
+    waktu: Optional[float]  # time.time() saat putaran terakhir selesai
+    diterima: int           # Artikel dari semua query (sebelum dedup)
+    baru: int               # Artikel yang benar-benar tersimpan
+    error: dict             # query -> pesan error
+
+
+STATUS_KOSONG = StatusKolektor(None, 0, 0, {})
+
+
+def cari_ddgs(query, maks=BERITA_MAKS_PER_QUERY):
+    """Artikel DuckDuckGo News untuk query: list dict (judul, deskripsi, url, tanggal, sumber)"""
+    with DDGS(timeout=BERITA_TIMEOUT) as ddgs:
+        hasil = ddgs.news(query, region="id-id", max_results=maks) or []
+    return [
+        {
+            "judul": r.get("title"),
+            "deskripsi": r.get("body"),
+            "url": r.get("url"),
+            "tanggal": (r.get("date") or "")[:10],
+            "sumber": r.get("source"),
+        }
+        for r in hasil
+    ]
+
+
+class KolektorBerita:
+    def __init__(self, berita=None, cari=None, query=None, interval=CACHE_TTL_NEWS, worker=BERITA_WORKER,
+                 pengklasifikasi=None):
+        self.berita = berita or BeritaEmas(DB_BERITA)
+        self.cari = cari or (cari_ddgs if DDGS_AVAILABLE else None)  # cari(query) -> list dict artikel
+        self.pengklasifikasi = pengklasifikasi  # PengklasifikasiBerita opsional, jalan setelah tiap putaran
+        self.query = query or BERITA_QUERY  # query -> kategori
+        self.interval = interval
+        self.worker = worker
+
+        self._status = STATUS_KOSONG
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._picu = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _rapikan(artikel, kategori):
+        """Lengkapi satu artikel mentah, None jika tidak layak disimpan"""
+        judul = (artikel.get("judul") or "").strip()
+        url = (artikel.get("url") or "").strip()
+        if not judul or not url.startswith(("http://", "https://")):
+            return None
+        return {
+            "judul": judul,
+            "deskripsi": (artikel.get("deskripsi") or "").strip(),
+            "kategori": kategori,
+            "tanggal": artikel.get("tanggal") or datetime.now().strftime("%Y-%m-%d"),
+            "url": url,
+            "sumber": artikel.get("sumber"),
+        }
+
+    def kumpulkan_sekali(self):
+        """Satu putaran: semua query paralel, dedup, simpan artikel baru. Return StatusKolektor"""
+        if self.cari is None:
+            raise RuntimeError("Kolektor berita butuh duckduckgo_search: pip install duckduckgo_search")
+
+        artikel, error, diterima = [], {}, 0
+        url_terlihat, hash_terlihat = set(), set()
+        with ThreadPoolExecutor(max_workers=self.worker, thread_name_prefix="kolektor-berita") as pool:
+            tugas = {pool.submit(self.cari, q): (q, kategori) for q, kategori in self.query.items()}
+            for selesai in as_completed(tugas):
+                query, kategori = tugas[selesai]
+                try:
+                    hasil = selesai.result()
+                except Exception as e:
+                    error[query] = f"{type(e).__name__}: {e}"
+                    continue
+                diterima += len(hasil)
+                # Query yang berbeda sering mengembalikan artikel yang sama
+                for mentah in hasil:
+                    item = self._rapikan(mentah, kategori)
+                    if item is None:
+                        continue
+                    url = normalisasi_url(item["url"])
+                    hash_item = hash_konten(item["judul"], item["deskripsi"])
+                    if url in url_terlihat or hash_item in hash_terlihat:
+                        continue
+                    url_terlihat.add(url)
+                    hash_terlihat.add(hash_item)
+                    artikel.append(item)
+
+        baru = self.berita.simpan_banyak(artikel)
+        self._status = StatusKolektor(time.time(), diterima, baru, error)
+        return self._status
+
+    def get_status(self):
+        return self._status
+
+    def start(self):
+        """Jalankan thread kolektor (aman dipanggil berkali-kali)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="kolektor-berita", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._picu.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def picu(self):
+        """Minta putaran berikutnya dijalankan sekarang (tidak menunggu hasilnya)"""
+        self._picu.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                status = self.kumpulkan_sekali()
+                logger.info("Berita: %d diterima, %d baru", status.diterima, status.baru)
+                for query, pesan in status.error.items():
+                    logger.warning("Query berita '%s' gagal: %s", query, pesan)
+            except Exception as e:
+                logger.error("Putaran kolektor berita gagal: %s", e)
+            if self.pengklasifikasi is not None:
+                try:
+                    hasil = self.pengklasifikasi.klasifikasi_sekali()
+                    logger.info("Klasifikasi: %d dari model, %d dari cache, %d gagal", *hasil)
+                except Exception as e:
+                    logger.error("Klasifikasi berita gagal: %s", e)
+            self._picu.wait(self.interval)
+            self._picu.clear()
+
+
+# ============================================
+# INSTANCE BERSAMA (SATU PER PROSES)
+# ============================================
+_kolektor = None
+_kolektor_lock = threading.Lock()
+
+
+def get_kolektor():
+    """Kolektor global, dibuat saat pertama kali dipanggil. Thread hanya
+    dijalankan jika ada fungsi pencarian (duckduckgo_search terpasang)"""
+    global _kolektor
+    with _kolektor_lock:
+        if _kolektor is None:
+            berita = BeritaEmas(DB_BERITA)
+            pengklasifikasi = PengklasifikasiBerita(berita) if OLLAMA_AVAILABLE else None
+            _kolektor = KolektorBerita(berita, pengklasifikasi=pengklasifikasi)
+            if _kolektor.cari is not None:
+                _kolektor.start()
+    return _kolektor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Worker pengumpul berita emas")
+    parser.add_argument("--db", default=DB_BERITA, help="Path database berita")
+    parser.add_argument("--interval", type=float, default=CACHE_TTL_NEWS,
+                        help="Jeda antar putaran pengumpulan (detik)")
+    parser.add_argument("--sekali", action="store_true", help="Jalankan satu putaran lalu keluar")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    berita = BeritaEmas(args.db)
+    pengklasifikasi = PengklasifikasiBerita(berita) if OLLAMA_AVAILABLE else None
+    kolektor = KolektorBerita(berita, interval=args.interval, pengklasifikasi=pengklasifikasi)
+    if args.sekali:
+        status = kolektor.kumpulkan_sekali()
+        print(f"{status.diterima} artikel diterima, {status.baru} baru, {len(status.error)} query gagal")
+        return
+    kolektor.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        logger.info("Menghentikan kolektor berita...")
+    finally:
+        kolektor.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
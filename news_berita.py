@@ -1,68 +1,212 @@
-import requests
-from bs4 import BeautifulSoup
+"""
+NEWS_BERITA.PY - Penyimpanan berita & analisis emas
+Berita disimpan di DB_BERITA (SQLite, WAL, pool koneksi bersama) sehingga
+tidak hilang saat restart dan aman ditulis dari banyak sesi sekaligus.
+Listing memakai index (kategori, tanggal, id) dengan keyset pagination,
+pencarian judul/deskripsi memakai index full-text FTS5. Berita dari
+kolektor (kolektor_berita.py) di-dedup lewat index unik URL dan hash konten,
+dampaknya diisi model lokal (klasifikasi_berita.py).
+"""
+import hashlib
+import re
+import sqlite3
+import time
 from datetime import datetime
-import json
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import DB_BERITA, BERITA_LIMIT, KLASIFIKASI_MAKS_COBA
+from db_pool import get_pool
+from db_schema import migrasi_db_berita
+
+KOLOM_BERITA = ['id', 'judul', 'deskripsi', 'kategori', 'tanggal', 'dampak', 'keyakinan', 'url', 'sumber']
+
+# Parameter pelacak yang dibuang supaya artikel yang sama punya satu URL
+_PARAM_PELACAK = ("utm_", "fbclid", "gclid", "ref")
+
+
+def hash_konten(judul, deskripsi):
+    """Hash judul + deskripsi setelah dinormalisasi (huruf kecil, tanpa tanda baca),
+    sama untuk artikel sindikasi yang dimuat ulang di situs lain"""
+    teks = " ".join(re.findall(r"\w+", f"{judul} {deskripsi}".lower()))
+    return hashlib.blake2b(teks.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def normalisasi_url(url):
+    """Skema/host huruf kecil, tanpa fragment, parameter pelacak, dan slash di akhir path"""
+    bagian = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(bagian.query, keep_blank_values=True)
+             if not k.lower().startswith(_PARAM_PELACAK)]
+    return urlunsplit((bagian.scheme.lower(), bagian.netloc.lower(), bagian.path.rstrip("/") or "/",
+                       urlencode(query), ""))
+
 
 class BeritaEmas:
-    def __init__(self):
-        self.berita_manual = [
-            {
-                "judul": "Federal Reserve Kurangi Suku Bunga",
-                "deskripsi": "Bank sentral AS mengurangi suku bunga sebesar 0.5%, kemungkinan mendorong permintaan emas",
-                "kategori": "Suku Bunga",
-                "tanggal": "2026-02-08",
-                "dampak": "Positif"
-            },
-            {
-                "judul": "Konflik Geopolitik Meningkat di Timur Tengah",
-                "deskripsi": "Ketegangan geopolitik mendorong investor mencari safe haven, emas melonjak 2%",
-                "kategori": "Geopolitik",
-                "tanggal": "2026-02-07",
-                "dampak": "Positif"
-            },
-            {
-                "judul": "Inflasi Turun ke Level Terendah 2 Tahun",
-                "deskripsi": "Data inflasi menunjukkan penurunan signifikan, mempengaruhi valuasi emas",
-                "kategori": "Ekonomi",
-                "tanggal": "2026-02-06",
-                "dampak": "Netral"
-            },
-            {
-                "judul": "China Tingkatkan Cadangan Emas",
-                "deskripsi": "China menambah cadangan emas mereka sebesar 50 ton, strategi diversifikasi mata uang",
-                "kategori": "Pasar",
-                "tanggal": "2026-02-05",
-                "dampak": "Positif"
-            },
-            {
-                "judul": "Dolar Menguat Terhadap Mata Uang Lainnya",
-                "deskripsi": "Penguatan dolar membuat harga emas tertekan di pasar internasional",
-                "kategori": "Nilai Tukar",
-                "tanggal": "2026-02-04",
-                "dampak": "Negatif"
-            }
-        ]
-    
-    def get_berita_list(self):
-        """Ambil daftar berita"""
-        return self.berita_manual
-    
-    def get_berita_by_kategori(self, kategori):
-        """Ambil berita berdasarkan kategori"""
-        return [b for b in self.berita_manual if b['kategori'].lower() == kategori.lower()]
-    
-    def add_berita(self, judul, deskripsi, kategori, dampak):
-        """Tambah berita baru"""
+    def __init__(self, db_path=DB_BERITA):
+        self.db_path = db_path
+        self.pool = get_pool(db_path, migrasi=migrasi_db_berita)
+        # SQLite tanpa FTS5 tidak punya tabel berita_fts -> pencarian pakai LIKE
+        self.fts = self.pool.baca_satu(
+            "SELECT 1 FROM sqlite_master WHERE name = 'berita_fts'"
+        ) is not None
+        self._isi_hash_lama()
+
+    def _isi_hash_lama(self):
+        """Hash konten untuk baris yang belum punya (berita dari sebelum kolom dedup ada)"""
+        rows = self.pool.baca("SELECT id, judul, deskripsi FROM berita WHERE hash_konten IS NULL")
+        if rows:
+            with self.pool.transaksi() as conn:
+                # OR IGNORE: duplikat di data lama dibiarkan tanpa hash
+                conn.executemany("UPDATE OR IGNORE berita SET hash_konten = ? WHERE id = ?",
+                                 [(hash_konten(judul, deskripsi), id_) for id_, judul, deskripsi in rows])
+
+    def add_berita(self, judul, deskripsi, kategori, dampak, tanggal=None):
+        """Tambah berita baru, return dict berita (termasuk id).
+        Raise ValueError jika berita dengan isi yang sama sudah ada"""
         berita_baru = {
             "judul": judul,
             "deskripsi": deskripsi,
             "kategori": kategori,
-            "tanggal": datetime.now().strftime("%Y-%m-%d"),
+            "tanggal": tanggal or datetime.now().strftime("%Y-%m-%d"),
             "dampak": dampak
         }
-        self.berita_manual.insert(0, berita_baru)
+        try:
+            with self.pool.transaksi() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO berita (judul, deskripsi, kategori, tanggal, dampak, hash_konten) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (judul, deskripsi, kategori, berita_baru["tanggal"], dampak, hash_konten(judul, deskripsi))
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Berita dengan judul & deskripsi yang sama sudah ada")
+        berita_baru["id"] = cursor.lastrowid
         return berita_baru
-    
+
+    def simpan_banyak(self, daftar):
+        """Simpan berita hasil kolektor (dict judul, deskripsi, kategori, tanggal, url, sumber)
+        dalam satu transaksi. URL atau hash konten yang sudah ada dilewati.
+        Return jumlah berita baru"""
+        rows = [
+            (b["judul"], b["deskripsi"], b["kategori"], b["tanggal"], b.get("dampak"),
+             normalisasi_url(b["url"]), b.get("sumber"), hash_konten(b["judul"], b["deskripsi"]))
+            for b in daftar
+        ]
+        if not rows:
+            return 0
+        with self.pool.transaksi() as conn:
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO berita (judul, deskripsi, kategori, tanggal, dampak, url, sumber, hash_konten) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return cursor.rowcount
+
+    # ============================================
+    # KLASIFIKASI DAMPAK
+    # ============================================
+    def get_belum_dinilai(self, limit, maks_coba=KLASIFIKASI_MAKS_COBA):
+        """Berita yang dampaknya belum diisi, percobaan paling sedikit lalu terlama dulu.
+        Berita yang sudah dicoba `maks_coba` kali dilewati.
+        Return list (id, judul, deskripsi, hash_konten)"""
+        return self.pool.baca(
+            "SELECT id, judul, deskripsi, hash_konten FROM berita "
+            "WHERE dampak IS NULL AND dicoba < ? ORDER BY dicoba, id LIMIT ?",
+            (maks_coba, limit)
+        )
+
+    def catat_percobaan(self, ids):
+        """Tandai berita sudah dikirim ke model (dicatat sebelum request, jadi batch
+        yang gagal / crash tetap terhitung)"""
+        if not ids:
+            return
+        with self.pool.transaksi() as conn:
+            conn.executemany(
+                "UPDATE berita SET dicoba = dicoba + 1, dicoba_pada = ? WHERE id = ?",
+                [(int(time.time()), id_) for id_ in ids]
+            )
+
+    def baca_cache_klasifikasi(self, daftar_hash):
+        """Verdict yang sudah pernah dihitung: dict hash_konten -> (dampak, keyakinan)"""
+        daftar_hash = [h for h in daftar_hash if h]
+        if not daftar_hash:
+            return {}
+        rows = self.pool.baca(
+            "SELECT hash_konten, dampak, keyakinan FROM klasifikasi_berita "
+            f"WHERE hash_konten IN ({', '.join('?' * len(daftar_hash))})",
+            daftar_hash
+        )
+        return {h: (dampak, keyakinan) for h, dampak, keyakinan in rows}
+
+    def simpan_klasifikasi(self, hasil, model=None, perbarui_cache=True):
+        """Simpan verdict [(id, hash_konten, dampak, keyakinan), ...] ke berita (dan cache)
+        dalam satu transaksi. Dampak yang sudah diisi (mis. manual) tidak ditimpa"""
+        if not hasil:
+            return
+        with self.pool.transaksi() as conn:
+            conn.executemany(
+                "UPDATE berita SET dampak = ?, keyakinan = ? WHERE id = ? AND dampak IS NULL",
+                [(dampak, keyakinan, id_) for id_, _, dampak, keyakinan in hasil]
+            )
+            if not perbarui_cache:
+                return
+            conn.executemany(
+                "INSERT OR REPLACE INTO klasifikasi_berita (hash_konten, dampak, keyakinan, model, waktu_epoch) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(h, dampak, keyakinan, model, int(time.time())) for _, h, dampak, keyakinan in hasil if h]
+            )
+
+    # ============================================
+    # LISTING BERHALAMAN & PENCARIAN
+    # ============================================
+    @staticmethod
+    def _query_fts(teks):
+        """Teks bebas -> query FTS5: setiap kata di-quote dan dicocokkan sebagai prefix"""
+        return " ".join(f'"{kata}"*' for kata in re.findall(r"\w+", teks))
+
+    def _filter_sql(self, kategori, cari):
+        kondisi, params = [], []
+        if kategori:
+            kondisi.append("kategori = ?")  # Kolom COLLATE NOCASE, tetap memakai index
+            params.append(kategori)
+        if cari and cari.strip():
+            if self.fts:
+                query = self._query_fts(cari)
+                if query:
+                    kondisi.append("id IN (SELECT rowid FROM berita_fts WHERE berita_fts MATCH ?)")
+                    params.append(query)
+            else:
+                kondisi.append("(judul LIKE ? OR deskripsi LIKE ?)")
+                params.extend([f"%{cari.strip()}%"] * 2)
+        return kondisi, params
+
+    def get_berita_page(self, sebelum=None, limit=BERITA_LIMIT, kategori=None, cari=None):
+        """Satu halaman berita, terbaru dulu (keyset pagination): baris sebelum kursor
+        `sebelum` = (tanggal, id) berita terakhir halaman sebelumnya. Return list dict"""
+        kondisi, params = self._filter_sql(kategori, cari)
+        if sebelum is not None:
+            kondisi.append("(tanggal, id) < (?, ?)")
+            params.extend(sebelum)
+        where = f"WHERE {' AND '.join(kondisi)}" if kondisi else ""
+        rows = self.pool.baca(
+            f"SELECT {', '.join(KOLOM_BERITA)} FROM berita {where} "
+            "ORDER BY tanggal DESC, id DESC LIMIT ?",
+            params + [limit]
+        )
+        return [dict(zip(KOLOM_BERITA, row)) for row in rows]
+
+    def hitung_berita(self, kategori=None, cari=None):
+        """Jumlah berita sesuai filter"""
+        kondisi, params = self._filter_sql(kategori, cari)
+        where = f"WHERE {' AND '.join(kondisi)}" if kondisi else ""
+        return self.pool.baca_satu(f"SELECT COUNT(*) FROM berita {where}", params)[0]
+
+    def get_berita_list(self, limit=BERITA_LIMIT):
+        """Ambil halaman pertama daftar berita"""
+        return self.get_berita_page(limit=limit)
+
+    def get_berita_by_kategori(self, kategori, limit=BERITA_LIMIT):
+        """Ambil berita berdasarkan kategori (tidak peka huruf besar/kecil)"""
+        return self.get_berita_page(limit=limit, kategori=kategori)
+
     def get_kategori_list(self):
-        """Ambil daftar kategori unik"""
-        return list(set([b['kategori'] for b in self.berita_manual]))
+        """Daftar kategori unik (dibaca dari index kategori)"""
+        return [r[0] for r in self.pool.baca("SELECT DISTINCT kategori FROM berita ORDER BY kategori")]
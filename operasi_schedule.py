@@ -0,0 +1,158 @@
+"""
+OPERASI_SCHEDULE.PY - Jadwal operasional website
+Website tutup pada HARI_TUTUP dan hari libur (FILE_HARI_LIBUR), buka kembali
+mulai JAM_BUKA:JAM_BUKA_MENIT di hari operasional, semua dihitung dalam
+TIMEZONE. Status dihitung sekali bersama waktu transisi (buka/tutup)
+berikutnya; sampai waktu itu is_operasional() cukup membandingkan satu
+timestamp. Poller & worker ingest bisa tidur sampai buka lewat
+detik_sampai_buka().
+
+Format FILE_HARI_LIBUR, satu tanggal per baris (# untuk komentar):
+    2026-08-17 Hari Kemerdekaan RI
+"""
+import math
+import os
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as jam
+
+from config import (
+    HARI_TUTUP,
+    JAM_BUKA,
+    JAM_BUKA_MENIT,
+    TIMEZONE,
+    FILE_HARI_LIBUR,
+    ALASAN_TUTUP,
+    PESAN_OPERASIONAL,
+    PESAN_TUTUP,
+)
+
+try:
+    from zoneinfo import ZoneInfo
+    ZONA_WAKTU = ZoneInfo(TIMEZONE)
+except Exception:
+    # tzdata tidak tersedia (mis. Windows tanpa paket tzdata) -> pakai jam sistem
+    ZONA_WAKTU = None
+
+NAMA_HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+MAKS_HARI_CARI = 400  # Batas pencarian transisi (jadwal yang tidak pernah buka/tutup)
+
+
+def baca_hari_libur(path):
+    """Dict date -> nama libur dari file, kosong jika file tidak ada"""
+    libur = {}
+    if not path or not os.path.exists(path):
+        return libur
+    with open(path, encoding="utf-8") as f:
+        for nomor, baris in enumerate(f, 1):
+            baris = baris.split("#", 1)[0].strip()
+            if not baris:
+                continue
+            tanggal, _, nama = baris.partition(" ")
+            try:
+                libur[date.fromisoformat(tanggal)] = nama.strip() or "Hari Libur"
+            except ValueError:
+                raise ValueError(f"{path}:{nomor}: tanggal tidak valid '{tanggal}' (format YYYY-MM-DD)")
+    return libur
+
+
+class OperasiSchedule:
+    def __init__(self, hari_tutup=HARI_TUTUP, jam_buka=JAM_BUKA, menit_buka=JAM_BUKA_MENIT,
+                 file_libur=FILE_HARI_LIBUR):
+        self.hari_tutup = set(hari_tutup)
+        self.jam_buka = jam_buka
+        self.menit_buka = menit_buka
+        self.file_libur = file_libur
+        self._mtime_libur = None
+        self.hari_libur = {}
+        self._muat_libur()
+        # (berlaku_sampai epoch, is_operasi, pesan), diganti utuh sehingga aman dibaca lintas thread
+        self._status = (-math.inf, False, PESAN_TUTUP)
+
+    def _muat_libur(self):
+        """Baca ulang file libur jika berubah sejak terakhir dibaca"""
+        try:
+            mtime = os.path.getmtime(self.file_libur) if self.file_libur else None
+        except OSError:
+            mtime = None
+        if mtime != self._mtime_libur:
+            self.hari_libur = baca_hari_libur(self.file_libur)
+            self._mtime_libur = mtime
+
+    def sekarang(self):
+        return datetime.now(ZONA_WAKTU)
+
+    def _cek(self, waktu):
+        if waktu.weekday() in self.hari_tutup or waktu.date() in self.hari_libur:
+            return False
+        return (waktu.hour, waktu.minute) >= (self.jam_buka, self.menit_buka)
+
+    def _transisi_berikutnya(self, waktu):
+        """Waktu pertama setelah `waktu` saat status buka/tutup berubah (None jika tidak pernah).
+        Status hanya bisa berubah di tengah malam atau di jam buka"""
+        status = self._cek(waktu)
+        for hari in range(MAKS_HARI_CARI):
+            tanggal = waktu.date() + timedelta(days=hari)
+            for kandidat in (jam(0, 0), jam(self.jam_buka, self.menit_buka)):
+                titik = datetime.combine(tanggal, kandidat, tzinfo=waktu.tzinfo)
+                if titik > waktu and self._cek(titik) != status:
+                    return titik
+        return None
+
+    def _pesan(self, waktu, is_operasi, transisi):
+        if is_operasi:
+            return PESAN_OPERASIONAL
+        alasan = self.hari_libur.get(waktu.date(), ALASAN_TUTUP)
+        if transisi is None:
+            buka = "-"
+        elif transisi - waktu < timedelta(days=7):
+            buka = f"{NAMA_HARI[transisi.weekday()]} jam {transisi:%H:%M}"
+        else:
+            buka = f"{NAMA_HARI[transisi.weekday()]} {transisi:%Y-%m-%d} jam {transisi:%H:%M}"
+        return PESAN_TUTUP.format(alasan=alasan, buka=buka)
+
+    def _hitung(self, waktu):
+        """Status di `waktu` + batas berlakunya (epoch transisi berikutnya)"""
+        self._muat_libur()
+        is_operasi = self._cek(waktu)
+        transisi = self._transisi_berikutnya(waktu)
+        sampai = transisi.timestamp() if transisi is not None else math.inf
+        return sampai, is_operasi, self._pesan(waktu, is_operasi, transisi)
+
+    def _status_sekarang(self):
+        status = self._status
+        if time.time() >= status[0]:
+            status = self._status = self._hitung(self.sekarang())
+        return status
+
+    def is_operasional(self, waktu=None):
+        """Return (True/False, pesan). Tanpa argumen memakai status tersimpan
+        (satu perbandingan timestamp sampai transisi berikutnya)"""
+        if waktu is not None:
+            _, is_operasi, pesan = self._hitung(waktu)
+            return is_operasi, pesan
+        _, is_operasi, pesan = self._status_sekarang()
+        return is_operasi, pesan
+
+    def transisi_berikutnya(self):
+        """Epoch buka/tutup berikutnya (math.inf jika jadwal tidak pernah berubah)"""
+        return self._status_sekarang()[0]
+
+    def detik_sampai_buka(self):
+        """0 jika sedang buka, selain itu detik sampai buka lagi (untuk poller/worker yang tidur)"""
+        sampai, is_operasi, _ = self._status_sekarang()
+        return 0 if is_operasi else max(sampai - time.time(), 0)
+
+    def get_status_operasi(self):
+        """Detail status untuk ditampilkan di tab Pengaturan"""
+        waktu = self.sekarang()
+        sampai, is_operasi, pesan = self._status_sekarang()
+        return {
+            "is_operasional": is_operasi,
+            "pesan": pesan,
+            "waktu_sekarang": waktu.strftime("%Y-%m-%d %H:%M:%S"),
+            "hari": NAMA_HARI[waktu.weekday()],
+            "jam": waktu.strftime("%H:%M"),
+            "transisi": (datetime.fromtimestamp(sampai, ZONA_WAKTU).strftime("%Y-%m-%d %H:%M")
+                         if sampai != math.inf else "-"),
+        }
@@ -0,0 +1,198 @@
+"""
+PRICE_ALERT.PY - Manajemen price alert (target harga BELI / JUAL)
+Alert disimpan di DB_ALERTS. Pengecekan harga memakai AlertEngine
+(array NumPy terurut + binary search) yang dibangun ulang hanya jika
+daftar alert berubah (alert_meta.versi).
+
+Notifikasi bersifat edge-triggered: worker ingest memanggil
+proses_ticks() untuk setiap batch tick, alert yang baru masuk zona
+target dicatat ke tabel alert_terpicu, dan dashboard cukup membaca
+tabel kecil tersebut.
+"""
+import threading
+from datetime import datetime
+
+from config import DB_ALERTS, ALERT_PER_HALAMAN
+from alert_engine import AlertEngine
+from db_pool import get_pool
+from db_schema import migrasi_db_alerts
+
+STATUS_AKTIF = "AKTIF"
+
+
+class PriceAlert:
+    def __init__(self, db_path=DB_ALERTS):
+        self.db_path = db_path
+        self._engine = None
+        self._engine_versi = None
+        self._lock = threading.RLock()
+        # Pool koneksi bersama (WAL + busy_timeout), migrasi skema dijalankan saat pool dibuat
+        self.pool = get_pool(db_path, migrasi=migrasi_db_alerts)
+
+    def tambah_alert(self, nama, harga_beli, harga_jual):
+        """Tambah alert baru, return id alert"""
+        with self.pool.transaksi() as conn:
+            cursor = conn.execute(
+                "INSERT INTO alerts (nama, harga_beli, harga_jual, status, tgl_buat) VALUES (?, ?, ?, ?, ?)",
+                (nama, harga_beli, harga_jual, STATUS_AKTIF, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        return cursor.lastrowid
+
+    def hapus_alert(self, alert_id):
+        """Hapus alert berdasarkan id. Return False jika id tidak ada"""
+        with self.pool.transaksi() as conn:
+            cursor = conn.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+        return cursor.rowcount > 0
+
+    def get_alert(self, alert_id):
+        """Satu alert (id, nama, harga_beli, harga_jual, status, tgl_buat), None jika tidak ada"""
+        return self.pool.baca_satu(
+            "SELECT id, nama, harga_beli, harga_jual, status, tgl_buat FROM alerts WHERE id = ?",
+            (alert_id,)
+        )
+
+    def ubah_alert(self, alert_id, nama=None, harga_beli=None, harga_jual=None, status=None):
+        """Ubah kolom yang diberikan (None = tetap). Target yang berubah mereset status
+        terpicu-nya supaya crossing ke target baru tetap memicu. Return False jika id tidak ada"""
+        kolom, params = [], []
+        for nama_kolom, nilai in (("nama", nama), ("harga_beli", harga_beli),
+                                  ("harga_jual", harga_jual), ("status", status)):
+            if nilai is not None:
+                kolom.append(f"{nama_kolom} = ?")
+                params.append(nilai)
+        if harga_beli is not None:
+            kolom.append("terpicu_beli = 0")
+        if harga_jual is not None:
+            kolom.append("terpicu_jual = 0")
+        if not kolom:
+            return self.get_alert(alert_id) is not None
+        with self.pool.transaksi() as conn:
+            cursor = conn.execute(f"UPDATE alerts SET {', '.join(kolom)} WHERE id = ?", params + [alert_id])
+        return cursor.rowcount > 0
+
+    def get_semua_alerts(self):
+        """Ambil semua alert aktif: (id, nama, harga_beli, harga_jual, status, tgl_buat)"""
+        return self.pool.baca(
+            "SELECT id, nama, harga_beli, harga_jual, status, tgl_buat FROM alerts "
+            "WHERE status = ? ORDER BY id",
+            (STATUS_AKTIF,)
+        )
+
+    # ============================================
+    # LISTING BERHALAMAN
+    # ============================================
+    @staticmethod
+    def _filter_sql(nama, status):
+        kondisi, params = [], []
+        if nama:
+            kondisi.append("nama = ?")
+            params.append(nama)
+        if status:
+            kondisi.append("status = ?")
+            params.append(status)
+        return kondisi, params
+
+    def get_alerts_page(self, setelah_id=0, limit=ALERT_PER_HALAMAN, nama=None, status=None):
+        """Satu halaman alert (keyset pagination): baris dengan id > setelah_id, urut id.
+        Return list (id, nama, harga_beli, harga_jual, status, tgl_buat)"""
+        kondisi, params = self._filter_sql(nama, status)
+        kondisi.append("id > ?")
+        params.extend([setelah_id, limit])
+        return self.pool.baca(
+            "SELECT id, nama, harga_beli, harga_jual, status, tgl_buat FROM alerts "
+            f"WHERE {' AND '.join(kondisi)} ORDER BY id LIMIT ?",
+            params
+        )
+
+    def hitung_alerts(self, nama=None, status=None):
+        """Jumlah alert sesuai filter"""
+        kondisi, params = self._filter_sql(nama, status)
+        where = f"WHERE {' AND '.join(kondisi)}" if kondisi else ""
+        return self.pool.baca_satu(f"SELECT COUNT(*) FROM alerts {where}", params)[0]
+
+    def get_status_list(self):
+        """Daftar status yang ada (dibaca dari index status)"""
+        rows = self.pool.baca("SELECT DISTINCT status FROM alerts ORDER BY status")
+        return [r[0] for r in rows if r[0]]
+
+    # ============================================
+    # PENGECEKAN HARGA
+    # ============================================
+    def _invalidate(self):
+        with self._lock:
+            self._engine = None
+
+    def _get_engine(self, conn):
+        """AlertEngine untuk alert aktif, dibangun ulang hanya jika versi daftar alert berubah"""
+        versi = conn.execute("SELECT nilai FROM alert_meta WHERE kunci = 'versi'").fetchone()[0]
+        with self._lock:
+            if self._engine is None or self._engine_versi != versi:
+                rows = conn.execute(
+                    "SELECT id, nama, harga_beli, harga_jual, terpicu_beli, terpicu_jual "
+                    "FROM alerts WHERE status = ? ORDER BY id",
+                    (STATUS_AKTIF,)
+                ).fetchall()
+                self._engine = AlertEngine(rows)
+                self._engine_versi = versi
+            return self._engine
+
+    def check_alert(self, harga):
+        """Cek alert yang terpicu oleh harga sekarang. Return list dict (id, nama, tipe, harga_target, pesan)"""
+        return self.check_alert_batch([harga])[0]
+
+    def check_alert_batch(self, harga_list):
+        """Cek banyak tick sekaligus. Return list hasil check_alert per harga"""
+        with self.pool.koneksi() as conn:
+            engine = self._get_engine(conn)
+        if not len(engine):
+            return [[] for _ in harga_list]
+        return [
+            engine.ke_dict(harga, posisi, tipe)
+            for harga, (posisi, tipe) in zip(harga_list, engine.cari_terpicu_batch(harga_list))
+        ]
+
+    def proses_ticks(self, ticks):
+        """Proses tick [(waktu_epoch, harga), ...] dengan semantik crossing.
+        Status terpicu dan log alert_terpicu diperbarui atomik dalam satu transaksi.
+        Return list dict alert yang baru terpicu"""
+        with self._lock:
+            try:
+                with self.pool.transaksi() as conn:
+                    engine = self._get_engine(conn)
+                    terpicu = []
+                    berubah = set()
+                    for waktu_epoch, harga in ticks:
+                        (posisi, tipe), pos_berubah = engine.proses_crossing(harga)
+                        berubah.update(pos_berubah.tolist())
+                        for alert in engine.ke_dict(harga, posisi, tipe):
+                            alert["harga"] = harga
+                            alert["waktu_epoch"] = waktu_epoch
+                            terpicu.append(alert)
+
+                    conn.executemany(
+                        "UPDATE alerts SET terpicu_beli = ?, terpicu_jual = ? WHERE id = ?",
+                        [(int(engine.status_beli[p]), int(engine.status_jual[p]), int(engine.ids[p]))
+                         for p in sorted(berubah)]
+                    )
+                    conn.executemany(
+                        "INSERT INTO alert_terpicu (alert_id, nama, tipe, harga, harga_target, pesan, waktu_epoch) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(a["id"], a["nama"], a["tipe"], a["harga"], a["harga_target"], a["pesan"],
+                          a["waktu_epoch"]) for a in terpicu]
+                    )
+            except Exception:
+                # Status di memori sudah terlanjur berubah -> muat ulang dari database
+                self._invalidate()
+                raise
+        return terpicu
+
+    def get_alert_terpicu_terbaru(self, limit=20):
+        """Ambil log alert yang baru terpicu (terbaru dulu) sebagai list dict"""
+        with self.pool.koneksi() as conn:
+            cursor = conn.execute(
+                "SELECT id, alert_id, nama, tipe, harga, harga_target, pesan, waktu_epoch "
+                "FROM alert_terpicu ORDER BY id DESC LIMIT ?",
+                (limit,)
+            )
+            kolom = [c[0] for c in cursor.description]
+            return [dict(zip(kolom, row)) for row in cursor.fetchall()]
@@ -0,0 +1,204 @@
+"""
+PRICE_POLLER.PY - Poller harga emas bersama untuk seluruh proses
+Satu thread background mengambil harga (median SUMBER_HARGA, lihat
+sumber_harga.py) dengan jeda adaptif (jadwal_polling.py): rapat saat harga
+bergerak, renggang saat datar, tidur selama jam tutup. Semua sesi
+Streamlit cukup membaca snapshot terakhir tanpa request jaringan sendiri.
+"""
+import random
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import requests
+
+from config import (
+    HARGA_SOURCE_URL,
+    DEFAULT_REFRESH_INTERVAL,
+    POLLER_TIMEOUT,
+    POLLER_STALE_SETELAH,
+    POLLER_KADALUARSA_SETELAH,
+    POLLER_BACKOFF_AWAL,
+    POLLER_BACKOFF_MAKS,
+)
+from harga_parser import buat_parser_default, teks_ke_nilai
+from jadwal_polling import BudgetHabis, PenjadwalAdaptif, pakai_budget
+from operasi_schedule import OperasiSchedule
+from sumber_harga import AIOHTTP_AVAILABLE, CacheKondisional, get_agregator
+
+
+class SnapshotHarga(NamedTuple):
+    """Snapshot harga terakhir yang dibagikan ke semua sesi"""
+    harga: Optional[str]  # Format "2.950.000", None jika belum pernah berhasil
+    waktu_fetch: Optional[float]  # time.time() saat harga berhasil diambil
+    error_terakhir: Optional[str]
+    gagal_beruntun: int
+    jeda: float = 0  # Rencana detik sampai fetch berhasil berikutnya (adaptif / jam tutup)
+
+    def umur(self, sekarang=None):
+        """Umur snapshot dalam detik (None jika belum ada data)"""
+        if self.waktu_fetch is None:
+            return None
+        return (sekarang or time.time()) - self.waktu_fetch
+
+    def is_stale(self, batas=POLLER_STALE_SETELAH):
+        """True jika data sudah lebih tua dari jadwal fetch berikutnya + batas (atau belum ada)"""
+        umur = self.umur()
+        return umur is None or umur > self.jeda + batas
+
+
+SNAPSHOT_KOSONG = SnapshotHarga(None, None, None, 0)
+
+
+_parser_default = buat_parser_default()
+
+# Satu Session keep-alive untuk semua request (pool koneksi urllib3), cache validator per URL
+_session = requests.Session()
+_session.headers['User-Agent'] = 'Mozilla/5.0'
+_cache_url = {}
+
+
+def ambil_harga_live(timeout=POLLER_TIMEOUT, url=HARGA_SOURCE_URL, parser=None):
+    """Scrape harga emas terbaru dari website (raise exception jika gagal).
+    Conditional request: 304 atau body yang sama tidak di-parse ulang"""
+    cache = _cache_url.setdefault(url, CacheKondisional())
+    pakai_budget(url)
+    response = _session.get(url, headers=cache.header(), timeout=timeout)
+    if response.status_code == 304:
+        return cache.dari_304().teks
+    response.raise_for_status()
+    harga = cache.dari_body(response.headers, response.content, parser or _parser_default,
+                            response.encoding or "utf-8")
+    return harga.teks
+
+
+def ambil_harga():
+    """Median semua SUMBER_HARGA (paralel) jika aiohttp tersedia, selain itu scrape HARGA_SOURCE_URL"""
+    if AIOHTTP_AVAILABLE:
+        return get_agregator().ambil_teks()
+    return ambil_harga_live()
+
+
+class PricePoller:
+    def __init__(self, fetch=ambil_harga, interval=DEFAULT_REFRESH_INTERVAL,
+                 backoff_awal=POLLER_BACKOFF_AWAL, backoff_maks=POLLER_BACKOFF_MAKS,
+                 callback=None, jadwal=None, penjadwal=None):
+        self.fetch = fetch
+        self.callback = callback  # Dipanggil callback(harga, waktu_fetch) tiap fetch berhasil
+        self.jadwal = jadwal  # OperasiSchedule opsional: tidak polling selama jam tutup
+        self.penjadwal = penjadwal  # PenjadwalAdaptif opsional, tanpa ini jeda tetap = interval
+        self.interval = interval
+        self.backoff_awal = backoff_awal
+        self.backoff_maks = backoff_maks
+
+        self._snapshot = SNAPSHOT_KOSONG
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ada_hasil = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Jalankan thread poller (aman dipanggil berkali-kali)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._loop, name="price-poller", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Hentikan thread poller"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_snapshot(self):
+        """Ambil snapshot terakhir tanpa I/O jaringan"""
+        return self._snapshot
+
+    def tunggu_snapshot(self, timeout):
+        """Tunggu hasil fetch pertama (berhasil maupun gagal) maksimal timeout detik"""
+        self._ada_hasil.wait(timeout)
+        return self._snapshot
+
+    def poll_sekali(self):
+        """Lakukan satu kali fetch dan perbarui snapshot. Return jeda ke poll berikutnya"""
+        lama = self._snapshot
+        try:
+            harga = self.fetch()
+        except BudgetHabis as e:
+            # Bukan kegagalan sumber: tunggu token berikutnya tanpa backoff / gagal_beruntun.
+            # Rencana fetch ikut mundur supaya snapshot tidak dianggap basi
+            jeda = max(e.tunggu, 1.0)
+            if lama.waktu_fetch is not None:
+                self._snapshot = lama._replace(jeda=max(lama.jeda, lama.umur() + jeda))
+            self._ada_hasil.set()
+            return jeda
+        except Exception as e:
+            # Harga lama tetap disimpan, hanya ditandai gagal
+            gagal = lama.gagal_beruntun + 1
+            self._snapshot = lama._replace(error_terakhir=str(e), gagal_beruntun=gagal)
+            self._ada_hasil.set()
+            return self._hitung_backoff(gagal)
+
+        waktu_fetch = time.time()
+        jeda = self.interval
+        if self.penjadwal is not None:
+            nilai = teks_ke_nilai(harga)
+            if nilai is not None:
+                self.penjadwal.catat(nilai, waktu_fetch)
+            jeda = self.penjadwal.jeda_berikutnya()
+        self._snapshot = SnapshotHarga(harga, waktu_fetch, None, 0, jeda)
+        self._ada_hasil.set()
+        if self.callback is not None:
+            self.callback(harga, waktu_fetch)
+        return jeda
+
+    def _hitung_backoff(self, gagal):
+        """Exponential backoff dengan jitter, dibatasi backoff_maks"""
+        jeda = min(self.backoff_awal * (2 ** (gagal - 1)), self.backoff_maks)
+        return jeda * random.uniform(0.8, 1.2)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            # Fetch pertama tetap jalan walau tutup, supaya ada harga untuk ditampilkan
+            if self.jadwal is not None and self._snapshot.waktu_fetch is not None:
+                tutup = self.jadwal.detik_sampai_buka()
+                if tutup > 0:
+                    # Tidur sampai jadwal buka berikutnya, bukan bangun setiap interval
+                    self._snapshot = self._snapshot._replace(jeda=self._snapshot.umur() + tutup)
+                    self._stop.wait(tutup)
+                    if self.penjadwal is not None:
+                        self.penjadwal.reset()
+                    continue
+            jeda = self.poll_sekali()
+            self._stop.wait(jeda)
+
+
+# ============================================
+# INSTANCE BERSAMA (SATU PER PROSES)
+# ============================================
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """Ambil poller global, dibuat dan dijalankan saat pertama kali dipanggil"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = PricePoller(jadwal=OperasiSchedule(), penjadwal=PenjadwalAdaptif()).start()
+    return _poller
+
+
+def baca_harga_terbaru(tunggu=POLLER_TIMEOUT):
+    """Harga terbaru sebagai string, atau "N/A" jika belum ada/kadaluarsa"""
+    poller = get_poller()
+    snapshot = poller.get_snapshot()
+    if snapshot.waktu_fetch is None and snapshot.gagal_beruntun == 0:
+        snapshot = poller.tunggu_snapshot(tunggu)
+    if snapshot.harga is None or snapshot.is_stale(POLLER_KADALUARSA_SETELAH):
+        return "N/A"
+    return snapshot.harga
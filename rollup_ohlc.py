@@ -0,0 +1,151 @@
+"""
+ROLLUP_OHLC.PY - Tabel OHLC pra-agregasi (1 menit, 1 jam, 1 hari)
+Setiap tick yang masuk ke harga_emas langsung di-upsert ke ketiga tabel
+rollup oleh trigger SQLite, jadi semua penulis (ingest_harga.py, seed
+chart_hourly, aplikasi lama) ikut memperbarui rollup tanpa kode tambahan.
+Chart cukup membaca resolusi paling kasar yang masih cukup detail untuk
+rentang yang dipilih.
+"""
+from datetime import datetime
+
+from config import TIMEZONE, POLLING_INTERVAL_MIN, CHART_MAKS_TITIK
+
+try:
+    from zoneinfo import ZoneInfo
+    OFFSET_LOKAL = int(datetime.now(ZoneInfo(TIMEZONE)).utcoffset().total_seconds())
+except Exception:
+    # tzdata tidak tersedia (mis. Windows tanpa paket tzdata) -> pakai jam sistem
+    OFFSET_LOKAL = int(datetime.now().astimezone().utcoffset().total_seconds())
+
+# nama resolusi -> (tabel, lebar bucket dalam detik)
+RESOLUSI = {
+    "1m": ("ohlc_1m", 60),
+    "1h": ("ohlc_1h", 3600),
+    "1d": ("ohlc_1d", 86400),
+}
+
+# Jarak antar tick terpendek yang mungkin (poller adaptif, jadwal_polling.py).
+# Ukuran data resolusi "tick" dihitung dengan ini supaya tidak pernah kurang perkiraan
+LEBAR_TICK = POLLING_INTERVAL_MIN
+
+# Ekspresi epoch tick: kolom waktu_epoch bisa kosong untuk penulis lama
+_EPOCH_BARU = "COALESCE(NEW.waktu_epoch, CAST(strftime('%s', NEW.waktu, 'utc') AS INTEGER))"
+
+
+def _ekspresi_bucket(epoch, detik):
+    """Ekspresi SQL awal bucket. Bucket harian dimulai jam 00:00 waktu lokal"""
+    if detik >= 86400:
+        return f"((({epoch}) + {OFFSET_LOKAL}) / {detik} * {detik} - {OFFSET_LOKAL})"
+    return f"(({epoch}) / {detik} * {detik})"
+
+
+def bucket_awal(epoch, resolusi):
+    """Versi Python dari _ekspresi_bucket"""
+    detik = RESOLUSI[resolusi][1]
+    if detik >= 86400:
+        return (epoch + OFFSET_LOKAL) // detik * detik - OFFSET_LOKAL
+    return epoch // detik * detik
+
+
+def buat_tabel_rollup(conn):
+    for tabel, _ in RESOLUSI.values():
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {tabel} (
+            bucket INTEGER PRIMARY KEY,
+            open INTEGER,
+            high INTEGER,
+            low INTEGER,
+            close INTEGER,
+            jumlah INTEGER,
+            epoch_awal INTEGER,
+            epoch_akhir INTEGER
+        )
+        """)
+
+
+def backfill_rollup(conn):
+    """Isi ulang semua tabel rollup dari tick yang sudah ada"""
+    for tabel, detik in RESOLUSI.values():
+        bucket = _ekspresi_bucket("waktu_epoch", detik)
+        conn.execute(f"DELETE FROM {tabel}")
+        conn.execute(f"""
+        INSERT INTO {tabel} (bucket, open, high, low, close, jumlah, epoch_awal, epoch_akhir)
+        SELECT bucket, open, high, low, close, jumlah, epoch_awal, epoch_akhir FROM (
+            SELECT
+                bucket,
+                first_value(harga) OVER (PARTITION BY bucket ORDER BY waktu_epoch, id) AS open,
+                max(harga) OVER (PARTITION BY bucket) AS high,
+                min(harga) OVER (PARTITION BY bucket) AS low,
+                first_value(harga) OVER (PARTITION BY bucket ORDER BY waktu_epoch DESC, id DESC) AS close,
+                count(*) OVER (PARTITION BY bucket) AS jumlah,
+                min(waktu_epoch) OVER (PARTITION BY bucket) AS epoch_awal,
+                max(waktu_epoch) OVER (PARTITION BY bucket) AS epoch_akhir,
+                row_number() OVER (PARTITION BY bucket ORDER BY waktu_epoch, id) AS urutan
+            FROM (
+                SELECT id, waktu_epoch, harga, {bucket} AS bucket
+                FROM harga_emas
+                WHERE waktu_epoch IS NOT NULL AND harga IS NOT NULL
+            )
+        )
+        WHERE urutan = 1
+        """)
+
+
+def pasang_trigger_rollup(conn):
+    """Trigger yang meng-upsert setiap tick baru ke semua tabel rollup"""
+    upsert = []
+    for tabel, detik in RESOLUSI.values():
+        upsert.append(f"""
+        INSERT INTO {tabel} (bucket, open, high, low, close, jumlah, epoch_awal, epoch_akhir)
+        VALUES ({_ekspresi_bucket(_EPOCH_BARU, detik)}, NEW.harga, NEW.harga, NEW.harga,
+                NEW.harga, 1, {_EPOCH_BARU}, {_EPOCH_BARU})
+        ON CONFLICT(bucket) DO UPDATE SET
+            open = CASE WHEN excluded.epoch_awal < epoch_awal THEN excluded.open ELSE open END,
+            high = max(high, excluded.high),
+            low = min(low, excluded.low),
+            close = CASE WHEN excluded.epoch_akhir >= epoch_akhir THEN excluded.close ELSE close END,
+            jumlah = jumlah + 1,
+            epoch_awal = min(epoch_awal, excluded.epoch_awal),
+            epoch_akhir = max(epoch_akhir, excluded.epoch_akhir);""")
+
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_harga_emas_rollup
+    AFTER INSERT ON harga_emas
+    WHEN NEW.harga IS NOT NULL AND {_EPOCH_BARU} IS NOT NULL
+    BEGIN
+        {''.join(upsert)}
+    END
+    """)
+
+
+# ============================================
+# QUERY UNTUK CHART
+# ============================================
+def pilih_resolusi(rentang_detik, maks_titik=CHART_MAKS_TITIK, lebar_tick=LEBAR_TICK):
+    """Resolusi paling detail yang jumlah titiknya masih <= maks_titik.
+    "tick" berarti data mentah dari harga_emas (paling rapat satu per lebar_tick detik)"""
+    if rentang_detik / lebar_tick <= maks_titik:
+        return "tick"
+    for nama, (_, detik) in RESOLUSI.items():
+        if rentang_detik / detik <= maks_titik:
+            return nama
+    return "1d"
+
+
+def ambil_ohlc(conn, mulai, akhir, resolusi):
+    """List (bucket, open, high, low, close) untuk epoch mulai..akhir, urut waktu"""
+    if resolusi == "tick":
+        return conn.execute("""
+        SELECT waktu_epoch, harga, harga, harga, harga
+        FROM harga_emas
+        WHERE waktu_epoch BETWEEN ? AND ?
+        ORDER BY waktu_epoch
+        """, (mulai, akhir)).fetchall()
+
+    tabel = RESOLUSI[resolusi][0]
+    return conn.execute(f"""
+    SELECT bucket, open, high, low, close
+    FROM {tabel}
+    WHERE bucket BETWEEN ? AND ?
+    ORDER BY bucket
+    """, (bucket_awal(mulai, resolusi), akhir)).fetchall()
@@ -0,0 +1,191 @@
+"""
+STATISTIK_HARGA.PY - Statistik berjalan per jendela waktu (24 jam, 7 hari, 30 hari, YTD)
+Diperbarui worker ingest setiap tick (amortized O(1): jumlah & jumlah kuadrat
+berjalan + deque monoton untuk min/max) lalu disimpan ke tabel statistik_harga,
+sehingga dashboard cukup membaca beberapa baris tanpa menghitung ulang.
+Jendela dihitung mundur dari tick terakhir; YTD mulai 1 Januari jam lokal.
+"""
+import math
+from collections import deque
+from datetime import date, datetime, timezone
+
+from rollup_ohlc import OFFSET_LOKAL
+
+# kunci -> (label dashboard, lebar jendela dalam detik; None = sejak awal tahun)
+JENDELA_STATISTIK = {
+    "24h": ("24 Jam", 86400),
+    "7d": ("7 Hari", 7 * 86400),
+    "30d": ("30 Hari", 30 * 86400),
+    "ytd": ("YTD", None),
+}
+
+KOLOM_STATISTIK = ['jendela', 'jumlah', 'rata', 'stddev', 'minimum', 'maksimum', 'epoch_awal', 'epoch_akhir']
+
+
+def tahun_lokal(epoch):
+    return datetime.fromtimestamp(epoch + OFFSET_LOKAL, timezone.utc).year
+
+
+def awal_tahun(tahun):
+    """Epoch 1 Januari 00:00 jam lokal"""
+    return (date(tahun, 1, 1) - date(1970, 1, 1)).days * 86400 - OFFSET_LOKAL
+
+
+class _Akumulator:
+    """Jumlah & jumlah kuadrat sebagai int Python (eksak, tidak overflow)"""
+
+    def __init__(self):
+        self.jumlah = 0
+        self.total = 0
+        self.total_kuadrat = 0
+        self.epoch_awal = None
+        self.epoch_akhir = None
+
+    def _tambah_nilai(self, harga):
+        self.jumlah += 1
+        self.total += harga
+        self.total_kuadrat += harga * harga
+
+    def _kurangi_nilai(self, harga):
+        self.jumlah -= 1
+        self.total -= harga
+        self.total_kuadrat -= harga * harga
+
+    def ringkasan(self):
+        """(jumlah, rata, stddev sampel, minimum, maksimum, epoch_awal, epoch_akhir)"""
+        n = self.jumlah
+        if n == 0:
+            return 0, None, None, None, None, None, None
+        varians = (n * self.total_kuadrat - self.total * self.total) / (n * (n - 1)) if n > 1 else 0
+        return (n, self.total / n, math.sqrt(max(varians, 0)), self.minimum, self.maksimum,
+                self.epoch_awal, self.epoch_akhir)
+
+
+class JendelaGeser(_Akumulator):
+    """Statistik tick dalam `lebar` detik terakhir"""
+
+    def __init__(self, lebar):
+        super().__init__()
+        self.lebar = lebar
+        self._ticks = deque()  # (epoch, harga) urut waktu
+        self._min = deque()    # Harga naik dari depan ke belakang
+        self._max = deque()    # Harga turun dari depan ke belakang
+
+    def tambah(self, epoch, harga):
+        self._ticks.append((epoch, harga))
+        self._tambah_nilai(harga)
+        while self._min and self._min[-1][1] >= harga:
+            self._min.pop()
+        self._min.append((epoch, harga))
+        while self._max and self._max[-1][1] <= harga:
+            self._max.pop()
+        self._max.append((epoch, harga))
+
+        batas = epoch - self.lebar
+        while self._ticks[0][0] <= batas:
+            self._kurangi_nilai(self._ticks.popleft()[1])
+        while self._min[0][0] <= batas:
+            self._min.popleft()
+        while self._max[0][0] <= batas:
+            self._max.popleft()
+        self.epoch_awal = self._ticks[0][0]
+        self.epoch_akhir = epoch
+
+    @property
+    def minimum(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maksimum(self):
+        return self._max[0][1] if self._max else None
+
+
+class JendelaTahunan(_Akumulator):
+    """Statistik sejak 1 Januari, di-reset saat tahun berganti"""
+
+    def __init__(self):
+        super().__init__()
+        self.tahun = None
+        self.minimum = None
+        self.maksimum = None
+
+    def tambah(self, epoch, harga):
+        tahun = tahun_lokal(epoch)
+        if tahun != self.tahun:
+            self.__init__()
+            self.tahun = tahun
+            self.epoch_awal = epoch
+        self._tambah_nilai(harga)
+        self.minimum = harga if self.minimum is None else min(self.minimum, harga)
+        self.maksimum = harga if self.maksimum is None else max(self.maksimum, harga)
+        self.epoch_akhir = epoch
+
+
+class StatistikHarga:
+    def __init__(self):
+        self.jendela = {
+            kunci: JendelaGeser(lebar) if lebar else JendelaTahunan()
+            for kunci, (_, lebar) in JENDELA_STATISTIK.items()
+        }
+        self.epoch_terakhir = None
+
+    def tambah(self, epoch, harga):
+        """Update semua jendela dengan satu tick (tick harus urut waktu)"""
+        if self.epoch_terakhir is not None and epoch < self.epoch_terakhir:
+            return  # Tick terlambat diabaikan, jendela selalu maju
+        self.epoch_terakhir = epoch
+        for jendela in self.jendela.values():
+            jendela.tambah(epoch, harga)
+
+    def muat_dari_db(self, conn):
+        """Bangun ulang dari harga_emas: cukup tick sejak awal jendela terpanjang"""
+        self.__init__()
+        (akhir,) = conn.execute("SELECT max(waktu_epoch) FROM harga_emas").fetchone()
+        if akhir is None:
+            return self
+        lebar_maks = max(lebar for _, lebar in JENDELA_STATISTIK.values() if lebar)
+        mulai = min(akhir - lebar_maks, awal_tahun(tahun_lokal(akhir)))
+        cursor = conn.execute(
+            "SELECT waktu_epoch, harga FROM harga_emas WHERE waktu_epoch > ? ORDER BY waktu_epoch",
+            (mulai,)
+        )
+        for epoch, harga in cursor:
+            self.tambah(epoch, harga)
+        return self
+
+    def simpan(self, conn):
+        """Tulis ringkasan semua jendela ke tabel statistik_harga (UPSERT)"""
+        conn.executemany("""
+        INSERT INTO statistik_harga (jendela, jumlah, rata, stddev, minimum, maksimum, epoch_awal, epoch_akhir)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (jendela) DO UPDATE SET
+            jumlah = excluded.jumlah,
+            rata = excluded.rata,
+            stddev = excluded.stddev,
+            minimum = excluded.minimum,
+            maksimum = excluded.maksimum,
+            epoch_awal = excluded.epoch_awal,
+            epoch_akhir = excluded.epoch_akhir
+        """, [(kunci, *jendela.ringkasan()) for kunci, jendela in self.jendela.items()])
+
+
+def buat_tabel_statistik(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS statistik_harga (
+        jendela TEXT PRIMARY KEY,
+        jumlah INTEGER,
+        rata REAL,
+        stddev REAL,
+        minimum INTEGER,
+        maksimum INTEGER,
+        epoch_awal INTEGER,
+        epoch_akhir INTEGER
+    )
+    """)
+
+
+def baca_statistik(conn):
+    """Dict kunci jendela -> dict kolom statistik (urut sesuai JENDELA_STATISTIK)"""
+    rows = {row[0]: dict(zip(KOLOM_STATISTIK, row))
+            for row in conn.execute(f"SELECT {', '.join(KOLOM_STATISTIK)} FROM statistik_harga")}
+    return {kunci: rows[kunci] for kunci in JENDELA_STATISTIK if kunci in rows}
@@ -0,0 +1,323 @@
+"""
+SUMBER_HARGA.PY - Agregasi harga dari beberapa sumber secara paralel
+Semua sumber di SUMBER_HARGA diambil bersamaan (asyncio + satu
+aiohttp.ClientSession dengan pool koneksi) di event loop milik thread
+sendiri. Begitu SUMBER_KUORUM sumber sehat menjawab, harga = median
+kutipan yang sudah masuk; sumber yang lambat tetap diselesaikan di
+belakang hanya untuk statistik latensi/error. Jadi waktu tunggu
+ditentukan sumber sehat tercepat, bukan yang paling lambat. Sumber yang
+gagal SUMBER_GAGAL_TIDAK_SEHAT kali beruntun dilewati, lalu dicoba lagi
+sekali setiap SUMBER_JEDA_PEMULIHAN detik sampai berhasil (pulih).
+Setiap sumber mengirim If-None-Match/If-Modified-Since dan melewati
+parsing jika body tidak berubah (CacheKondisional). Request ke tiap host
+dibatasi budget per jam (jadwal_polling.BudgetSumber); sumber yang budgetnya
+habis dilewati pada putaran itu tanpa dihitung sebagai error.
+"""
+import asyncio
+import hashlib
+import statistics
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from config import (
+    SUMBER_HARGA,
+    SUMBER_DEADLINE,
+    SUMBER_KUORUM,
+    SUMBER_GAGAL_TIDAK_SEHAT,
+    SUMBER_JEDA_PEMULIHAN,
+    SUMBER_KONEKSI_MAKS,
+)
+from harga_parser import ParserHarga, AturanCSS, AturanRegex, buat_parser_default, format_rupiah
+from jadwal_polling import BudgetHabis, get_budget
+
+_BUDGET_HABIS = "Budget request habis"
+
+
+class HasilAgregasi(NamedTuple):
+    nilai: int
+    teks: str     # Format "2.951.000"
+    kutipan: dict  # nama sumber -> nilai yang ikut median
+    gagal: dict    # nama sumber -> error / belum menjawab saat kuorum tercapai
+
+
+class CacheKondisional:
+    """Validator HTTP (ETag/Last-Modified) + hash body terakhir untuk satu URL.
+    304 -> harga lama dipakai tanpa body; body sama persis -> regex tidak dijalankan"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.etag = None
+        self.last_modified = None
+        self.hash_body = None
+        self.harga = None
+        self.hit_304 = 0
+        self.hit_hash = 0
+        self.parse = 0
+
+    def header(self):
+        """Header conditional request (kosong jika belum ada harga tersimpan)"""
+        with self._lock:
+            if self.harga is None:
+                return {}
+            header = {}
+            if self.etag:
+                header["If-None-Match"] = self.etag
+            if self.last_modified:
+                header["If-Modified-Since"] = self.last_modified
+            return header
+
+    def dari_304(self):
+        with self._lock:
+            if self.harga is None:
+                raise ValueError("Server membalas 304 padahal belum ada harga tersimpan")
+            self.hit_304 += 1
+            return self.harga
+
+    def dari_body(self, headers, body, parser, encoding):
+        """Harga dari body lengkap, parse hanya jika hash body berubah"""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        with self._lock:
+            if digest == self.hash_body and self.harga is not None:
+                self.hit_hash += 1
+                return self.harga
+        harga = parser.parse_stream([body], encoding)
+        with self._lock:
+            self.parse += 1
+            self.etag = headers.get("ETag")
+            self.last_modified = headers.get("Last-Modified")
+            self.hash_body = digest
+            self.harga = harga
+        return harga
+
+
+class StatistikSumber:
+    """Latensi & error per sumber (diisi thread event loop, dibaca thread lain)"""
+
+    def __init__(self, jendela=100):
+        self._lock = threading.Lock()
+        self._latensi = deque(maxlen=jendela)  # detik, sukses maupun gagal
+        self.request = 0
+        self.error = 0
+        self.gagal_beruntun = 0
+        self.error_terakhir = None
+        self.nilai_terakhir = None
+        self.dilewati = 0
+        self._dicoba_pada = None  # time.monotonic() request terakhir saat tidak sehat
+
+    def catat(self, latensi, nilai=None, error=None):
+        with self._lock:
+            self.request += 1
+            self._latensi.append(latensi)
+            if error is None:
+                self.gagal_beruntun = 0
+                self.nilai_terakhir = nilai
+            else:
+                self.error += 1
+                self.gagal_beruntun += 1
+                self.error_terakhir = error
+                self._dicoba_pada = time.monotonic()
+
+    @property
+    def sehat(self):
+        return self.gagal_beruntun < SUMBER_GAGAL_TIDAK_SEHAT
+
+    def boleh_dicoba(self):
+        """Sumber sehat selalu dicoba. Sumber tidak sehat hanya sekali per
+        SUMBER_JEDA_PEMULIHAN detik (satu request percobaan, tidak paralel)"""
+        with self._lock:
+            if self.sehat:
+                return True
+            sekarang = time.monotonic()
+            if sekarang - self._dicoba_pada >= SUMBER_JEDA_PEMULIHAN:
+                self._dicoba_pada = sekarang
+                return True
+            self.dilewati += 1
+            return False
+
+    def ringkasan(self):
+        with self._lock:
+            latensi = sorted(self._latensi)
+            return {
+                "request": self.request,
+                "error": self.error,
+                "rasio_error": self.error / self.request if self.request else 0.0,
+                "p50_ms": round(latensi[len(latensi) // 2] * 1000, 1) if latensi else None,
+                "p95_ms": round(latensi[int(len(latensi) * 0.95)] * 1000, 1) if latensi else None,
+                "gagal_beruntun": self.gagal_beruntun,
+                "sehat": self.sehat,
+                "dilewati": self.dilewati,
+                "nilai_terakhir": self.nilai_terakhir,
+                "error_terakhir": self.error_terakhir,
+            }
+
+
+class Sumber:
+    def __init__(self, nama, url, parser=None, deadline=SUMBER_DEADLINE):
+        self.nama = nama
+        self.url = url
+        self.parser = parser or buat_parser_default()
+        self.deadline = deadline
+        self.statistik = StatistikSumber()
+        self.cache = CacheKondisional()
+        self.budget = get_budget(url)  # Dibagi dengan sumber lain di host yang sama
+
+    @classmethod
+    def dari_config(cls, konfigurasi):
+        """Sumber dari satu entri SUMBER_HARGA"""
+        parser = None
+        if konfigurasi.get("css"):
+            parser = ParserHarga([AturanCSS(konfigurasi["css"])])
+        elif konfigurasi.get("regex"):
+            parser = ParserHarga([AturanRegex(konfigurasi["regex"])])
+        return cls(konfigurasi["nama"], konfigurasi["url"], parser,
+                   konfigurasi.get("deadline", SUMBER_DEADLINE))
+
+
+class AgregatorHarga:
+    def __init__(self, sumber, kuorum=SUMBER_KUORUM):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("Agregasi sumber harga butuh aiohttp: pip install aiohttp")
+        self.sumber = list(sumber)
+        self.kuorum = kuorum
+        self._loop = None
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _pastikan_loop(self):
+        """Event loop di thread daemon sendiri, dibuat saat pertama dipakai"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="sumber-harga", daemon=True).start()
+        return self._loop
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=SUMBER_KONEKSI_MAKS),
+                headers={'User-Agent': 'Mozilla/5.0'},
+            )
+        return self._session
+
+    async def _baca_harga(self, sumber):
+        session = await self._get_session()
+        async with session.get(sumber.url, headers=sumber.cache.header()) as response:
+            if response.status == 304:
+                return sumber.cache.dari_304()
+            response.raise_for_status()
+            # Body dibaca habis (bukan berhenti di harga) supaya koneksi keep-alive bisa dipakai ulang
+            body = await response.read()
+            return sumber.cache.dari_body(response.headers, body, sumber.parser, response.charset or "utf-8")
+
+    async def _ambil_sumber(self, sumber):
+        """Return (HargaTerparsa, None) atau (None, pesan error). Tidak pernah raise"""
+        if not sumber.statistik.boleh_dicoba():
+            return None, "Tidak sehat, dilewati sampai jeda pemulihan habis"
+        if not sumber.budget.ambil():
+            # Bukan kesalahan sumber, jadi tidak mempengaruhi status sehat
+            return None, _BUDGET_HABIS
+        mulai = time.perf_counter()
+        try:
+            harga = await asyncio.wait_for(self._baca_harga(sumber), sumber.deadline)
+        except Exception as e:
+            error = "Timeout" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+            sumber.statistik.catat(time.perf_counter() - mulai, error=error)
+            return None, error
+        sumber.statistik.catat(time.perf_counter() - mulai, nilai=harga.nilai)
+        return harga, None
+
+    async def ambil_semua(self):
+        """Ambil semua sumber paralel, median dari kutipan yang masuk sampai kuorum/deadline"""
+        loop = asyncio.get_running_loop()
+        tugas = {loop.create_task(self._ambil_sumber(s)): s for s in self.sumber}
+        jumlah_sehat = sum(s.statistik.sehat for s in self.sumber)
+        kuorum = min(self.kuorum, max(jumlah_sehat, 1), len(self.sumber))
+        batas = loop.time() + max(s.deadline for s in self.sumber)
+
+        kutipan, gagal = {}, {}
+        menunggu = set(tugas)
+        while menunggu and len(kutipan) < kuorum:
+            sisa = batas - loop.time()
+            if sisa <= 0:
+                break
+            selesai, menunggu = await asyncio.wait(menunggu, timeout=sisa,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+            for t in selesai:
+                harga, error = t.result()
+                if harga:
+                    kutipan[tugas[t].nama] = harga.nilai
+                else:
+                    gagal[tugas[t].nama] = error
+        # Sumber yang belum menjawab tetap jalan sampai deadline-nya sendiri (untuk statistik)
+        for t in menunggu:
+            gagal[tugas[t].nama] = "Belum menjawab saat kuorum tercapai"
+
+        if not kutipan:
+            ditahan = [s for s in self.sumber if gagal.get(s.nama) == _BUDGET_HABIS]
+            if ditahan and len(ditahan) == len(gagal):
+                # Tidak ada sumber yang gagal, semua hanya menunggu budget
+                raise BudgetHabis("Budget request semua sumber habis",
+                                  min(s.budget.tunggu() for s in ditahan))
+            raise ValueError("Semua sumber harga gagal: " + "; ".join(f"{k}: {v}" for k, v in gagal.items()))
+        nilai = int(round(statistics.median(kutipan.values())))
+        return HasilAgregasi(nilai, format_rupiah(nilai), kutipan, gagal)
+
+    def ambil(self):
+        """Versi sinkron ambil_semua() untuk dipanggil dari thread biasa"""
+        loop = self._pastikan_loop()
+        batas = max(s.deadline for s in self.sumber) + 1
+        return asyncio.run_coroutine_threadsafe(self.ambil_semua(), loop).result(batas)
+
+    def ambil_teks(self):
+        """Harga agregat format "2.951.000" (pengganti ambil_harga_live untuk PricePoller)"""
+        return self.ambil().teks
+
+    def get_statistik(self):
+        """Dict nama sumber -> ringkasan latensi/error + pemakaian cache kondisional"""
+        return {
+            s.nama: {**s.statistik.ringkasan(), "hit_304": s.cache.hit_304,
+                     "hit_hash": s.cache.hit_hash, "parse": s.cache.parse,
+                     "budget_sisa": s.budget.sisa(), "budget_ditolak": s.budget.ditolak}
+            for s in self.sumber
+        }
+
+    async def _tutup_async(self):
+        # Sumber lambat yang masih jalan (hanya untuk statistik) dibatalkan dulu,
+        # supaya tidak error "Connector is closed" setelah session ditutup
+        tugas = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tugas:
+            t.cancel()
+        await asyncio.gather(*tugas, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+
+    def tutup(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._tutup_async(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+# ============================================
+# INSTANCE BERSAMA (SATU PER PROSES)
+# ============================================
+_agregator = None
+_agregator_lock = threading.Lock()
+
+
+def get_agregator():
+    """Agregator global dari SUMBER_HARGA, dibuat saat pertama kali dipanggil"""
+    global _agregator
+    with _agregator_lock:
+        if _agregator is None:
+            _agregator = AgregatorHarga([Sumber.dari_config(k) for k in SUMBER_HARGA])
+    return _agregator
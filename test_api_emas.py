@@ -0,0 +1,122 @@
+"""
+TEST_API_EMAS.PY - REST API riwayat & alert terhadap database sementara
+
+    python -m pytest -q test_api_emas.py
+"""
+import asyncio
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+
+from api_emas import ApiEmas
+from config import API_MAKS_TITIK
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+
+AKHIR = 1_790_000_000  # Epoch tetap supaya hasil tidak bergantung jam test
+INTERVAL = 60
+
+
+@pytest.fixture
+def api(tmp_path):
+    """ApiEmas dengan 4 hari tick per menit"""
+    db_harga = str(tmp_path / "harga.db")
+    pool = get_pool(db_harga, migrasi=migrasi_db_harga)
+    epoch = range(AKHIR - 4 * 86400, AKHIR + 1, INTERVAL)
+    with pool.transaksi() as conn:
+        conn.executemany("INSERT INTO harga_emas (harga, waktu_epoch) VALUES (?, ?)",
+                         [(2_900_000 + (e // INTERVAL) % 97 * 100, e) for e in epoch])
+    return ApiEmas(db_harga, str(tmp_path / "alerts.db"), str(tmp_path / "berita.db"), worker=2)
+
+
+def jalankan(api, skenario):
+    """Jalankan coroutine skenario(client) terhadap server test"""
+    async def utama():
+        async with TestClient(TestServer(api.buat_app())) as client:
+            return await skenario(client)
+    return asyncio.run(utama())
+
+
+async def get_json(client, path, **kwargs):
+    r = await client.get(path, **kwargs)
+    return r.status, r.headers, await r.json()
+
+
+@pytest.mark.parametrize("query", ["resolusi=auto&", ""])
+def test_riwayat_auto_rentang_beberapa_hari(api, query):
+    async def skenario(client):
+        return await get_json(client, f"/api/riwayat?{query}mulai={AKHIR - 3 * 86400}")
+
+    status, _, data = jalankan(api, skenario)
+    assert status == 200, data
+    assert data["resolusi"] == "1m"
+    assert data["akhir"] == AKHIR
+    assert 0 < len(data["data"]) <= API_MAKS_TITIK
+    assert len(data["data"]) == 3 * 1440 + 1
+
+
+def test_riwayat_resolusi_eksplisit_terlalu_rapat(api):
+    async def skenario(client):
+        return await get_json(client, f"/api/riwayat?resolusi=tick&mulai={AKHIR - 3 * 86400}")
+
+    status, _, data = jalankan(api, skenario)
+    assert status == 400
+    assert "Rentang terlalu panjang" in data["error"]
+
+
+def test_riwayat_etag_304_dan_gzip(api):
+    async def skenario(client):
+        path = f"/api/riwayat?resolusi=1m&mulai={AKHIR - 86400}"
+        pertama = await client.get(path, headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        body = await pertama.read()
+        ulang = await client.get(path, headers={"If-None-Match": pertama.headers["ETag"]})
+        return pertama.headers, body, ulang.status
+
+    headers, body, status_ulang = jalankan(api, skenario)
+    assert headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(body))["data"]) == 1441
+    assert status_ulang == 304
+
+
+def test_riwayat_if_none_match_persis(api):
+    async def skenario(client):
+        path = f"/api/riwayat?resolusi=1m&mulai={AKHIR - 86400}"
+        etag = (await client.get(path)).headers["ETag"]
+        status = {}
+        for nama, header in {
+            "persis": etag,
+            "weak": "W/" + etag,
+            "daftar": f'"lain", {etag} ,"x"',
+            "bintang": "*",
+            "mengandung": '"x' + etag,  # Etag hanya bagian dari ETag lain, bukan ETag yang sama
+            "tanpa_kutip": etag.strip('"'),
+            "kosong": "",
+        }.items():
+            status[nama] = (await client.get(path, headers={"If-None-Match": header})).status
+        return status
+
+    status = jalankan(api, skenario)
+    assert status == {"persis": 304, "weak": 304, "daftar": 304, "bintang": 304,
+                      "mengandung": 200, "tanpa_kutip": 200, "kosong": 200}
+
+
+def test_alert_crud(api):
+    async def skenario(client):
+        r = await client.post("/api/alerts", json={"nama": "budi", "harga_beli": 2_900_000, "harga_jual": 3_000_000})
+        dibuat = await r.json()
+        assert r.status == 201
+        r = await client.patch(f"/api/alerts/{dibuat['id']}", json={"harga_jual": 3_100_000})
+        diubah = await r.json()
+        r = await client.delete(f"/api/alerts/{dibuat['id']}")
+        status_hapus = r.status
+        r = await client.get(f"/api/alerts/{dibuat['id']}")
+        return diubah, status_hapus, r.status
+
+    diubah, status_hapus, status_get = jalankan(api, skenario)
+    assert diubah["harga_jual"] == 3_100_000 and diubah["harga_beli"] == 2_900_000
+    assert status_hapus == 204
+    assert status_get == 404
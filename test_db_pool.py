@@ -0,0 +1,57 @@
+"""
+TEST_DB_POOL.PY - Pool koneksi SQLite dipakai ulang lintas thread dan dibatasi ukurannya
+
+    python -m pytest -q test_db_pool.py
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from db_pool import SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "data.db"), ukuran=2)
+    with pool.transaksi() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    yield pool
+    pool.tutup()
+
+
+def jalankan_di_thread(fungsi):
+    hasil = []
+    t = threading.Thread(target=lambda: hasil.append(fungsi()))
+    t.start()
+    t.join()
+    return hasil[0]
+
+
+def test_koneksi_dipakai_ulang_oleh_thread_baru(pool):
+    # Setiap rerun Streamlit berjalan di thread baru -> tetap mendapat koneksi yang sama
+    def id_koneksi():
+        with pool.koneksi() as conn:
+            return id(conn)
+    dipakai = {jalankan_di_thread(id_koneksi) for _ in range(10)}
+    assert len(dipakai) == 1
+
+
+def test_ukuran_pool_dibatasi(pool, monkeypatch):
+    monkeypatch.setattr("db_pool.DB_BUSY_TIMEOUT_MS", 50)
+    with pool.koneksi(), pool.koneksi():
+        with pytest.raises(sqlite3.OperationalError, match="sedang dipakai"):
+            with pool.koneksi():
+                pass
+    # Setelah dikembalikan bisa dipinjam lagi
+    assert pool.baca_satu("SELECT count(*) FROM t") == (0,)
+
+
+def test_transaksi_rollback_dan_koneksi_kembali(pool):
+    with pytest.raises(ValueError):
+        with pool.transaksi() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise ValueError
+    assert pool.baca_satu("SELECT count(*) FROM t") == (0,)
+    with pool.koneksi() as conn:
+        assert not conn.in_transaction
@@ -0,0 +1,79 @@
+"""
+TEST_DB_SCHEMA.PY - Migrasi database harga bentuk lama (kolom waktu TEXT) ke skema terbaru
+
+    python -m pytest -q test_db_schema.py
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_schema import MIGRASI_HARGA, _jalankan_migrasi, migrasi_db_harga, versi_skema
+
+AWAL = datetime(2026, 9, 1, 8, 0, 0)
+
+
+def buat_db_lama(path, jumlah=48):
+    """Database persis seperti buatan chart_hourly.py lama: hanya waktu TEXT + harga"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS harga_emas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        waktu TEXT,
+        harga INTEGER
+    )
+    """)
+    # datetime disimpan adapter sqlite3 sebagai 'YYYY-MM-DD HH:MM:SS' jam lokal
+    conn.executemany("INSERT INTO harga_emas (waktu, harga) VALUES (?, ?)",
+                     [(str(AWAL + timedelta(hours=i)), 2_700_000 + i * 1000) for i in range(jumlah)])
+    conn.commit()
+    return conn
+
+
+def epoch_lokal(teks):
+    return int(datetime.strptime(teks, "%Y-%m-%d %H:%M:%S").timestamp())
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = buat_db_lama(str(tmp_path / "emas.db"))
+    yield conn
+    conn.close()
+
+
+def test_migrasi_backfill_waktu_epoch(conn):
+    assert versi_skema(conn) == 0
+    assert migrasi_db_harga(conn) == len(MIGRASI_HARGA)
+
+    rows = conn.execute("SELECT waktu, waktu_epoch FROM harga_emas ORDER BY id").fetchall()
+    assert len(rows) == 48
+    assert all(epoch == epoch_lokal(waktu) for waktu, epoch in rows)
+    index = {row[1] for row in conn.execute("PRAGMA index_list(harga_emas)")}
+    assert "idx_harga_emas_waktu_epoch" in index
+
+
+def test_migrasi_bertahap_sesuai_user_version(conn):
+    # Database yang baru sampai versi 1 (mis. dibuka kode lama) dilanjutkan dari versi itu
+    assert _jalankan_migrasi(conn, MIGRASI_HARGA[:1]) == 1
+    tabel = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "ohlc_1m" not in tabel
+
+    assert migrasi_db_harga(conn) == len(MIGRASI_HARGA)
+    assert conn.execute("SELECT SUM(jumlah) FROM ohlc_1h").fetchone()[0] == 48
+
+    # Dijalankan ulang tidak mengubah apa-apa
+    assert migrasi_db_harga(conn) == len(MIGRASI_HARGA)
+    assert conn.execute("SELECT SUM(jumlah) FROM ohlc_1h").fetchone()[0] == 48
+
+
+def test_penulis_lama_setelah_migrasi(conn):
+    migrasi_db_harga(conn)
+    waktu = str(AWAL + timedelta(days=3))
+    # Penulis lama hanya mengisi kolom waktu -> trigger mengisi waktu_epoch dan rollup
+    conn.execute("INSERT INTO harga_emas (waktu, harga) VALUES (?, ?)", (waktu, 2_800_000))
+    conn.commit()
+
+    epoch = conn.execute("SELECT waktu_epoch FROM harga_emas WHERE waktu = ?", (waktu,)).fetchone()[0]
+    assert epoch == epoch_lokal(waktu)
+    assert conn.execute("SELECT close, jumlah FROM ohlc_1m WHERE bucket = ?",
+                        (epoch // 60 * 60,)).fetchone() == (2_800_000, 1)
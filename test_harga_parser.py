@@ -0,0 +1,100 @@
+"""
+TEST_HARGA_PARSER.PY - Parser harga terhadap korpus halaman corpus_harga/ (nilai benar di harapan.json)
+
+    python -m pytest -q test_harga_parser.py
+"""
+import json
+import os
+import re
+
+import pytest
+
+from config import HARGA_CHUNK_BYTES, HARGA_REGEX_PATTERN
+from harga_parser import AturanCSS, AturanRegex, ParserHarga, buat_parser_default, format_rupiah
+
+FOLDER_KORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_harga")
+
+with open(os.path.join(FOLDER_KORPUS, "harapan.json"), encoding="utf-8") as f:
+    HARAPAN = json.load(f)
+
+
+def baca_halaman(nama_file):
+    with open(os.path.join(FOLDER_KORPUS, nama_file), encoding="utf-8") as f:
+        return f.read()
+
+
+def hasil(fungsi, *args):
+    """HargaTerparsa, atau None jika parser menolak halaman (ValueError)"""
+    try:
+        return fungsi(*args)
+    except ValueError:
+        return None
+
+
+def nilai(harga):
+    return harga.nilai if harga else None
+
+
+@pytest.fixture(scope="module")
+def parser_regex():
+    # Hanya aturan regex -> parse_stream benar-benar mencari per chunk
+    return ParserHarga([AturanRegex(HARGA_REGEX_PATTERN)])
+
+
+@pytest.mark.parametrize("nama_file", list(HARAPAN))
+def test_korpus_sesuai_harapan(nama_file):
+    html = baca_halaman(nama_file)
+    assert nilai(hasil(buat_parser_default().parse, html)) == HARAPAN[nama_file]
+
+
+@pytest.mark.parametrize("nama_file", list(HARAPAN))
+def test_korpus_selector_css(nama_file):
+    pytest.importorskip("bs4")
+    parser = ParserHarga([AturanCSS("td.harga"), AturanRegex(HARGA_REGEX_PATTERN)])
+    assert nilai(hasil(parser.parse, baca_halaman(nama_file))) == HARAPAN[nama_file]
+
+
+@pytest.mark.parametrize("ukuran", [1, 2, 7, 64, 1000, HARGA_CHUNK_BYTES])
+@pytest.mark.parametrize("nama_file", list(HARAPAN))
+def test_parse_stream_sama_untuk_semua_ukuran_chunk(parser_regex, nama_file, ukuran):
+    html = baca_halaman(nama_file)
+    data = html.encode("utf-8")
+    chunks = [data[i:i + ukuran] for i in range(0, len(data), ukuran)]
+    assert hasil(parser_regex.parse_stream, chunks) == hasil(parser_regex.parse, html)
+    assert nilai(hasil(parser_regex.parse_stream, chunks)) == HARAPAN[nama_file]
+
+
+def titik_potong(html, nilai_harapan):
+    """Posisi potong di dalam setiap tag (setelah '<', sebelum '>') dan di setiap
+    karakter sekitar teks harga yang benar"""
+    titik = set()
+    for tag in re.finditer(r"<[^>]*>", html):
+        titik.update((tag.start() + 1, tag.start() + 2, tag.end() - 1))
+    if nilai_harapan is not None:
+        posisi = html.find(format_rupiah(nilai_harapan))
+        titik.update(range(max(posisi - 80, 1), posisi + 80))
+    return sorted(p for p in titik if 0 < p < len(html))
+
+
+@pytest.mark.parametrize("nama_file", list(HARAPAN))
+def test_parse_stream_potong_di_dalam_tag(parser_regex, nama_file):
+    html = baca_halaman(nama_file)
+    harapan = hasil(parser_regex.parse, html)
+    assert nilai(harapan) == HARAPAN[nama_file]
+    for p in titik_potong(html, HARAPAN[nama_file]):
+        assert hasil(parser_regex.parse_stream, [html[:p], html[p:]]) == harapan, p
+
+
+def test_deretan_angka_panjang_tidak_menumpuk_di_ekor(parser_regex):
+    # Deretan angka panjang (mis. data di dalam <script>) bukan harga dan tidak boleh
+    # membuat ekor stream tumbuh terus (setiap chunk kecil mencari ulang semuanya)
+    html = "<script>var d='" + "1234567890" * 2000 + ".951.000';</script><td>2.951.000</td>"
+    stream = parser_regex.stream()
+    panjang_maks = 0
+    for i in range(0, len(html), 5):
+        harga = stream.tambah(html[i:i + 5])
+        panjang_maks = max(panjang_maks, len(stream._sisa))
+        if harga:
+            break
+    assert harga == parser_regex.parse(html) and harga.nilai == 2_951_000
+    assert panjang_maks <= 2 * parser_regex.aturan[0].overlap
@@ -0,0 +1,73 @@
+"""
+TEST_INDIKATOR.PY - Jalur streaming indikator (update per bucket) dibandingkan dengan batch
+
+    python -m pytest -q test_indikator.py
+"""
+import random
+
+import numpy as np
+import pytest
+
+from db_pool import get_pool
+from db_schema import migrasi_db_harga
+from indikator import INDIKATOR, SeriIndikator
+
+AWAL = 1_790_000_000
+
+
+def close_acak(seed, jumlah):
+    """Harga INTEGER seperti di database: random walk dengan periode datar"""
+    rng = random.Random(seed)
+    harga, hasil = 2_900_000, []
+    for _ in range(jumlah):
+        harga += rng.choice((-3000, -500, 0, 0, 0, 800, 2500))
+        hasil.append(harga)
+    return hasil
+
+
+def cocok(streaming, batch):
+    # Bollinger streaming memakai jumlah kuadrat eksak, pandas rolling std punya galat kecil
+    np.testing.assert_allclose(np.asarray(streaming, dtype=float), batch, rtol=1e-9, atol=1e-3)
+
+
+@pytest.mark.parametrize("nama", list(INDIKATOR))
+@pytest.mark.parametrize("backfill", [0, 1, 30, 150])
+def test_update_per_bucket_sama_dengan_batch(nama, backfill):
+    kelas, params, _ = INDIKATOR[nama]
+    close = close_acak(14, 400)
+    harapan = kelas(**params).batch(np.array(close))
+
+    # Backfill sebagian dengan batch (seperti SeriIndikator), sisanya satu per satu
+    indikator = kelas(**params)
+    awal = indikator.batch(np.array(close[:backfill]))
+    hasil = {k: list(awal[k]) for k in kelas.kolom}
+    for harga in close[backfill:]:
+        for k, v in indikator.update(harga).items():
+            hasil[k].append(v)
+
+    for k in kelas.kolom:
+        cocok(hasil[k], harapan[k])
+
+
+@pytest.mark.parametrize("nama", list(INDIKATOR))
+def test_seri_tick_per_tick_sama_dengan_backfill(tmp_path, nama):
+    kelas, params, _ = INDIKATOR[nama]
+    pool = get_pool(str(tmp_path / "harga.db"), migrasi=migrasi_db_harga)
+    seri = SeriIndikator(kelas, params, "1m")
+    rng = random.Random(15)
+    epoch = AWAL
+    for harga in close_acak(16, 600):
+        epoch += rng.randint(5, 40)  # Beberapa tick per bucket 1 menit, bucket terakhir masih terbuka
+        with pool.transaksi() as conn:
+            conn.execute("INSERT INTO harga_emas (harga, waktu_epoch) VALUES (?, ?)", (harga, epoch))
+        with pool.koneksi() as conn:
+            seri.perbarui(conn)
+
+    backfill = SeriIndikator(kelas, params, "1m")
+    with pool.koneksi() as conn:
+        backfill.perbarui(conn)
+    df_streaming, df_batch = seri.get_dataframe(), backfill.get_dataframe()
+    assert len(df_streaming) > 100
+    assert (df_streaming["waktu"] == df_batch["waktu"]).all()
+    for k in kelas.kolom:
+        cocok(df_streaming[k], df_batch[k].to_numpy())
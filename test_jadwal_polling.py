@@ -0,0 +1,143 @@
+"""
+TEST_JADWAL_POLLING.PY - Jeda polling adaptif, budget request per host, dan reaksi PricePoller
+
+    python -m pytest -q test_jadwal_polling.py
+"""
+import pytest
+
+import jadwal_polling
+from config import CHART_MAKS_TITIK
+from jadwal_polling import BudgetHabis, BudgetSumber, PenjadwalAdaptif, pakai_budget
+from price_poller import PricePoller
+from rollup_ohlc import LEBAR_TICK, pilih_resolusi
+
+
+class Jam:
+    """Pengganti time.monotonic yang bisa dimajukan manual"""
+
+    def __init__(self, awal=1000.0):
+        self.sekarang = awal
+
+    def __call__(self):
+        return self.sekarang
+
+
+@pytest.fixture
+def jam(monkeypatch):
+    jam = Jam()
+    monkeypatch.setattr(jadwal_polling.time, "monotonic", jam)
+    return jam
+
+
+def penjadwal_dengan_langkah(langkah, jumlah=30, interval=60):
+    """Penjadwal yang sudah melihat `jumlah` poll dengan perubahan harga tetap `langkah` per poll"""
+    penjadwal = PenjadwalAdaptif(interval_dasar=60, interval_min=15, interval_maks=600)
+    harga = 3_000_000
+    for i in range(jumlah):
+        penjadwal.catat(harga, i * interval)
+        harga += langkah
+    return penjadwal
+
+
+# ============================================
+# PENJADWAL ADAPTIF
+# ============================================
+def test_jeda_awal_datar_dan_reset():
+    penjadwal = PenjadwalAdaptif(interval_dasar=60, interval_min=15, interval_maks=600)
+    assert penjadwal.jeda_berikutnya() == 60
+    for i in range(5):
+        penjadwal.catat(3_000_000, i * 60)
+    assert penjadwal.jeda_berikutnya() == 600  # Harga datar -> jeda maksimal
+    penjadwal.reset()
+    assert penjadwal.jeda_berikutnya() == 60
+
+
+def test_jeda_memanjang_saat_volatilitas_turun():
+    # Perubahan per poll ~ target (0.1%) -> sekitar interval dasar
+    dasar = penjadwal_dengan_langkah(3_000).jeda_berikutnya()
+    assert dasar == pytest.approx(60, rel=0.05)
+    # Volatilitas 8x lebih kecil -> jeda 8^(2/3) = 4x lebih panjang
+    assert penjadwal_dengan_langkah(375).jeda_berikutnya() == pytest.approx(4 * dasar, rel=0.03)
+    jeda = [penjadwal_dengan_langkah(langkah).jeda_berikutnya() for langkah in (6_000, 3_000, 1_000, 300, 50)]
+    assert jeda == sorted(jeda)
+
+
+def test_jeda_tidak_pernah_di_bawah_interval_min():
+    penjadwal = penjadwal_dengan_langkah(60_000)  # 2% per menit
+    assert penjadwal.jeda_berikutnya() == 15
+    # Tick paling rapat = interval_min = LEBAR_TICK yang dipakai pilih_resolusi,
+    # jadi resolusi "tick" tidak pernah melebihi batas titik chart
+    rentang = CHART_MAKS_TITIK * LEBAR_TICK
+    assert pilih_resolusi(rentang) == "tick"
+    assert pilih_resolusi(rentang + LEBAR_TICK) != "tick"
+    assert rentang // penjadwal.interval_min <= CHART_MAKS_TITIK
+
+
+# ============================================
+# BUDGET SUMBER
+# ============================================
+def test_budget_burst_dibatasi(jam):
+    budget = BudgetSumber(per_jam=180, burst=300)  # 0.05 token/detik, kapasitas 15
+    assert budget.kapasitas == 15
+    jam.sekarang += 10 * 3600  # Lama tidak dipakai: token tidak menumpuk melebihi kapasitas
+    diizinkan = sum(budget.ambil() for _ in range(100))
+    assert diizinkan == 15
+    assert budget.ditolak == 85
+
+
+def test_budget_isi_ulang(jam):
+    budget = BudgetSumber(per_jam=180, burst=300)
+    while budget.ambil():
+        pass
+    assert budget.tunggu() == pytest.approx(20)
+    jam.sekarang += 19.9
+    assert not budget.ambil()
+    jam.sekarang += 0.1
+    assert budget.ambil()
+
+    # Permintaan terus-menerus selama satu jam: maksimal per_jam + kapasitas awal
+    budget = BudgetSumber(per_jam=180, burst=300)
+    diizinkan = 0
+    for _ in range(3600):
+        diizinkan += budget.ambil()
+        jam.sekarang += 1
+    assert diizinkan <= 180 + 15
+    assert diizinkan >= 180
+
+
+def test_pakai_budget_raise_budget_habis(jam):
+    url = "https://budget-test.example/harga"
+    jadwal_polling.get_budget(url, per_jam=3600)  # 1 token/detik, kapasitas 300
+    for _ in range(300):
+        pakai_budget(url)
+    with pytest.raises(BudgetHabis) as info:
+        pakai_budget(url)
+    assert info.value.tunggu == pytest.approx(1)
+
+
+# ============================================
+# PRICE POLLER
+# ============================================
+def test_budget_habis_bukan_kegagalan():
+    hasil = iter(["2.950.000", BudgetHabis("Budget habis", 42.0), RuntimeError("500 Server Error")])
+
+    def fetch():
+        nilai = next(hasil)
+        if isinstance(nilai, Exception):
+            raise nilai
+        return nilai
+
+    poller = PricePoller(fetch=fetch, interval=15, backoff_awal=5)
+    assert poller.poll_sekali() == 15
+
+    # Budget habis: tunggu token, tanpa backoff, gagal_beruntun, ataupun tanda basi
+    assert poller.poll_sekali() == 42.0
+    snapshot = poller.get_snapshot()
+    assert snapshot.harga == "2.950.000"
+    assert snapshot.gagal_beruntun == 0 and snapshot.error_terakhir is None
+    assert snapshot.jeda >= 42.0
+    assert not snapshot.is_stale(batas=30)
+
+    # Kegagalan sungguhan tetap dihitung
+    assert poller.poll_sekali() <= 5 * 1.2
+    assert poller.get_snapshot().gagal_beruntun == 1
@@ -0,0 +1,153 @@
+"""
+TEST_KLASIFIKASI_BERITA.PY - Klasifikasi dampak berita dengan model stub (offline)
+
+    python -m pytest -q test_klasifikasi_berita.py
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import KLASIFIKASI_MAKS_COBA
+from klasifikasi_berita import PengklasifikasiBerita
+from news_berita import BeritaEmas
+
+
+def jawaban_stub(prompt):
+    """Verdict deterministik per baris prompt: 'naik' -> Positif, 'turun' -> Negatif,
+    lainnya Netral. Berita berisi 'bisu' tidak pernah dijawab"""
+    hasil = []
+    for baris in prompt.splitlines():
+        no, _, teks = baris.partition(". ")
+        if "bisu" in teks:
+            continue
+        if "naik" in teks:
+            hasil.append({"no": int(no), "dampak": "Positif", "keyakinan": 0.9})
+        elif "turun" in teks:
+            hasil.append({"no": int(no), "dampak": "Negatif", "keyakinan": 0.8})
+        else:
+            hasil.append({"no": int(no), "dampak": "netral", "keyakinan": 1.5})
+    return json.dumps({"hasil": hasil})
+
+
+class KlienStub:
+    """Pengganti ollama.Client: hanya .chat() yang dipakai PengklasifikasiBerita"""
+
+    def __init__(self):
+        self.request = 0
+        self.berita_dinilai = 0
+        self._lock = threading.Lock()
+
+    def chat(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.request += 1
+            self.berita_dinilai += len(prompt.splitlines())
+        return {"message": {"role": "assistant", "content": jawaban_stub(prompt)}}
+
+
+def artikel(judul, deskripsi="Analisis pasar emas", nomor=0):
+    return {"judul": judul, "deskripsi": deskripsi, "kategori": "Ekonomi", "tanggal": "2026-10-01",
+            "url": f"https://contoh.example/berita/{nomor}"}
+
+
+@pytest.fixture
+def berita(tmp_path):
+    berita = BeritaEmas(str(tmp_path / "berita.db"))
+    # Berita bawaan sudah berlabel manual, kosongkan supaya antrian hanya berisi data test
+    with berita.pool.transaksi() as conn:
+        conn.execute("DELETE FROM berita")
+    return berita
+
+
+def label(berita):
+    return {judul: (dampak, keyakinan) for judul, dampak, keyakinan in
+            berita.pool.baca("SELECT judul, dampak, keyakinan FROM berita")}
+
+
+def test_label_dan_keyakinan_tersimpan(berita):
+    berita.simpan_banyak([artikel("Harga emas naik tajam", nomor=1),
+                          artikel("Harga emas turun karena dolar", nomor=2),
+                          artikel("Bank sentral menahan suku bunga", nomor=3)])
+    klien = KlienStub()
+    hasil = PengklasifikasiBerita(berita, klien=klien, batch=2, paralel=2).klasifikasi_sekali()
+
+    assert hasil.dari_model == 3 and hasil.dari_cache == 0 and hasil.gagal == 0
+    assert klien.request == 2
+    assert label(berita) == {
+        "Harga emas naik tajam": ("Positif", 0.9),
+        "Harga emas turun karena dolar": ("Negatif", 0.8),
+        # Label dinormalisasi ke DAMPAK_OPTIONS, keyakinan dibatasi 0..1
+        "Bank sentral menahan suku bunga": ("Netral", 1.0),
+    }
+
+
+def test_konten_berulang_dari_cache(berita):
+    berita.simpan_banyak([artikel(f"Harga emas naik sesi {i}", nomor=i) for i in range(5)])
+    klien = KlienStub()
+    pengklasifikasi = PengklasifikasiBerita(berita, klien=klien, batch=4, paralel=1)
+    pengklasifikasi.klasifikasi_sekali()
+    request_awal = klien.request
+
+    # Isi yang sama muncul lagi (mis. dimuat ulang setelah dihapus) -> tidak dikirim ke model
+    with berita.pool.transaksi() as conn:
+        conn.execute("DELETE FROM berita WHERE judul = 'Harga emas naik sesi 0'")
+    berita.simpan_banyak([artikel("Harga emas naik sesi 0", nomor=99)])
+    hasil = pengklasifikasi.klasifikasi_sekali()
+
+    assert hasil.dari_cache == 1 and hasil.dari_model == 0
+    assert klien.request == request_awal
+    assert label(berita)["Harga emas naik sesi 0"] == ("Positif", 0.9)
+
+
+def test_berita_tidak_dijawab_tidak_menyumbat_antrian(berita):
+    # Jendela antrian = batch * paralel * 4 = 8, semuanya diisi berita yang tidak pernah dijawab
+    berita.simpan_banyak([artikel(f"Berita bisu {i}", nomor=i) for i in range(8)])
+    berita.simpan_banyak([artikel(f"Harga emas naik hari {i}", nomor=100 + i) for i in range(3)])
+    klien = KlienStub()
+    pengklasifikasi = PengklasifikasiBerita(berita, klien=klien, batch=2, paralel=1)
+
+    pertama = pengklasifikasi.klasifikasi_sekali()
+    assert pertama.gagal == 8
+    kedua = pengklasifikasi.klasifikasi_sekali()
+    assert kedua.dari_model == 3
+    assert all(label(berita)[f"Harga emas naik hari {i}"][0] == "Positif" for i in range(3))
+
+    # Putaran berikutnya berhenti sendiri setelah batas percobaan
+    for _ in range(KLASIFIKASI_MAKS_COBA):
+        pengklasifikasi.klasifikasi_sekali()
+    assert sum(pengklasifikasi.klasifikasi_sekali()) == 0
+    dicoba = [r[0] for r in berita.pool.baca("SELECT dicoba FROM berita WHERE dampak IS NULL")]
+    assert dicoba == [KLASIFIKASI_MAKS_COBA] * 8
+
+
+class _HandlerOllama(BaseHTTPRequestHandler):
+    def do_POST(self):
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({
+            "model": data["model"], "created_at": "2026-10-01T00:00:00Z", "done": True,
+            "message": {"role": "assistant", "content": jawaban_stub(data["messages"][-1]["content"])},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_endpoint_ollama_stub(berita):
+    pytest.importorskip("ollama")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        berita.simpan_banyak([artikel("Harga emas naik", nomor=1), artikel("Harga emas turun", nomor=2)])
+        host = f"http://127.0.0.1:{server.server_address[1]}"
+        hasil = PengklasifikasiBerita(berita, host=host).klasifikasi_sekali()
+    finally:
+        server.shutdown()
+    assert hasil.dari_model == 2
+    assert label(berita) == {"Harga emas naik": ("Positif", 0.9), "Harga emas turun": ("Negatif", 0.8)}
@@ -0,0 +1,101 @@
+"""
+TEST_KOLEKTOR_BERITA.PY - Dedup & penyimpanan berita kolektor dengan hasil pencarian tetap (offline)
+
+    python -m pytest -q test_kolektor_berita.py
+"""
+import pytest
+
+from kolektor_berita import KolektorBerita
+from news_berita import BeritaEmas
+
+QUERY = {"harga emas": "Pasar", "emas antam": "Ekonomi", "suku bunga": "Suku Bunga"}
+
+# Hasil pencarian per query, bentuk sama dengan cari_ddgs
+HASIL_CARI = {
+    "harga emas": [
+        {"judul": "Harga emas naik tajam", "deskripsi": "Emas menguat 2%.",
+         "url": "https://berita.example/emas-naik?utm_source=ddg", "tanggal": "2026-10-01", "sumber": "A"},
+        {"judul": "Bank sentral borong emas", "deskripsi": "Cadangan naik 50 ton",
+         "url": "https://berita.example/bank-sentral", "tanggal": "2026-10-01", "sumber": "A"},
+        {"judul": "", "deskripsi": "Tanpa judul", "url": "https://berita.example/kosong"},
+        {"judul": "Bukan tautan web", "deskripsi": "-", "url": "ftp://berita.example/file"},
+    ],
+    "emas antam": [
+        # URL sama setelah normalisasi (host huruf besar, fragment, slash akhir)
+        {"judul": "Harga emas naik tajam", "deskripsi": "Emas menguat 2%.",
+         "url": "https://BERITA.example/emas-naik/#atas", "tanggal": "2026-10-01", "sumber": "A"},
+        # Konten sama (beda huruf besar & tanda baca) dimuat ulang situs lain
+        {"judul": "BANK SENTRAL BORONG EMAS!", "deskripsi": "Cadangan naik 50 ton.",
+         "url": "https://sindikasi.example/bank-sentral-borong-emas?fbclid=xyz", "sumber": "B"},
+    ],
+    "suku bunga": [
+        {"judul": "The Fed menahan suku bunga", "deskripsi": "Keputusan FOMC",
+         "url": "https://berita.example/fomc", "tanggal": "2026-10-02", "sumber": "C"},
+    ],
+}
+
+
+class CariStub:
+    """Pengganti cari_ddgs: hasil tetap per query, query di `gagal` raise"""
+
+    def __init__(self, hasil, gagal=()):
+        self.hasil = hasil
+        self.gagal = set(gagal)
+
+    def __call__(self, query):
+        if query in self.gagal:
+            raise TimeoutError("ddg timeout")
+        return [dict(a) for a in self.hasil.get(query, [])]
+
+
+@pytest.fixture
+def berita(tmp_path):
+    berita = BeritaEmas(str(tmp_path / "berita.db"))
+    with berita.pool.transaksi() as conn:
+        conn.execute("DELETE FROM berita")
+    return berita
+
+
+def isi_berita(berita):
+    return sorted(berita.pool.baca("SELECT judul, kategori, url, sumber FROM berita"))
+
+
+def test_dedup_url_dan_hash_konten(berita):
+    status = KolektorBerita(berita, cari=CariStub(HASIL_CARI), query=QUERY, worker=3).kumpulkan_sekali()
+
+    assert status.diterima == 7 and status.baru == 3 and status.error == {}
+    # Query paralel: versi mana dari artikel kembar yang tersimpan tergantung query tercepat
+    judul = sorted(row[0].lower().rstrip("!") for row in isi_berita(berita))
+    assert judul == ["bank sentral borong emas", "harga emas naik tajam", "the fed menahan suku bunga"]
+    urls = {row[2] for row in isi_berita(berita)}
+    assert "https://berita.example/emas-naik" in urls  # Disimpan dalam bentuk ternormalisasi
+
+
+def test_artikel_sama_diambil_dua_kali(berita):
+    cari = CariStub(HASIL_CARI)
+    kolektor = KolektorBerita(berita, cari=cari, query=QUERY, worker=3)
+    kolektor.kumpulkan_sekali()
+    sebelum = isi_berita(berita)
+
+    # Putaran kedua: semua artikel sudah ada -> INSERT OR IGNORE, tidak ada baris baru/berubah
+    status = kolektor.kumpulkan_sekali()
+    assert status.diterima == 7 and status.baru == 0
+    assert isi_berita(berita) == sebelum
+
+    # Konten lama dengan URL baru ditolak index hash, artikel yang benar-benar baru masuk
+    cari.hasil = {"suku bunga": [
+        {"judul": "The Fed menahan suku bunga.", "deskripsi": "keputusan fomc",
+         "url": "https://lain.example/fed", "sumber": "D"},
+        {"judul": "Rupiah melemah", "deskripsi": "Dolar menguat",
+         "url": "https://berita.example/rupiah", "tanggal": "2026-10-03", "sumber": "C"},
+    ]}
+    assert kolektor.kumpulkan_sekali().baru == 1
+    assert len(isi_berita(berita)) == 4
+    assert berita.pool.baca_satu("SELECT count(*) FROM berita WHERE url LIKE 'https://lain.example%'") == (0,)
+
+
+def test_query_gagal_tidak_menggagalkan_putaran(berita):
+    cari = CariStub(HASIL_CARI, gagal={"emas antam"})
+    status = KolektorBerita(berita, cari=cari, query=QUERY, worker=3).kumpulkan_sekali()
+    assert status.error == {"emas antam": "TimeoutError: ddg timeout"}
+    assert status.baru == 3
@@ -0,0 +1,80 @@
+"""
+TEST_OPERASI_SCHEDULE.PY - Status buka/tutup di batas waktu transisi dan hari libur
+
+    python -m pytest -q test_operasi_schedule.py
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import ALASAN_TUTUP, PESAN_OPERASIONAL, PESAN_TUTUP
+from operasi_schedule import ZONA_WAKTU, OperasiSchedule
+
+DETIK = timedelta(seconds=1)
+
+
+def waktu(teks):
+    return datetime.fromisoformat(teks).replace(tzinfo=ZONA_WAKTU)
+
+
+@pytest.fixture
+def file_libur(tmp_path):
+    path = tmp_path / "hari_libur.txt"
+    path.write_text("# libur test\n"
+                    "2026-10-14 Libur Tengah Pekan\n"
+                    "2026-10-19 Cuti Bersama\n"
+                    "2026-10-21\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def jadwal(file_libur):
+    # 2026-10-16 = Jumat, 2026-10-17/18 = Sabtu/Minggu
+    return OperasiSchedule(hari_tutup=[5, 6], jam_buka=0, menit_buka=0, file_libur=file_libur)
+
+
+def test_batas_akhir_pekan(jadwal):
+    assert jadwal.is_operasional(waktu("2026-10-16 23:59:59")) == (True, PESAN_OPERASIONAL)
+    # Senin 19 Oktober libur -> buka lagi Selasa
+    assert jadwal.is_operasional(waktu("2026-10-17 00:00:00")) == (
+        False, PESAN_TUTUP.format(alasan=ALASAN_TUTUP, buka="Selasa jam 00:00"))
+    assert not jadwal.is_operasional(waktu("2026-10-18 23:59:59"))[0]
+    assert jadwal.is_operasional(waktu("2026-10-20 00:00:00"))[0]
+
+
+def test_pesan_tutup_akhir_pekan_biasa(jadwal):
+    # Sama dengan pesan lama: "Website TUTUP - Hari Libur. Buka lagi Senin jam 00:00 WIB"
+    assert jadwal.is_operasional(waktu("2026-10-10 12:00:00"))[1] == \
+        "Website TUTUP - Hari Libur. Buka lagi Senin jam 00:00 WIB"
+
+
+def test_hari_libur_dari_file(jadwal):
+    assert jadwal.is_operasional(waktu("2026-10-13 23:59:59"))[0]
+    assert jadwal.is_operasional(waktu("2026-10-14 00:00:00")) == (
+        False, PESAN_TUTUP.format(alasan="Libur Tengah Pekan", buka="Kamis jam 00:00"))
+    assert jadwal.is_operasional(waktu("2026-10-14 23:59:59"))[0] is False
+    assert jadwal.is_operasional(waktu("2026-10-15 00:00:00"))[0]
+    # Libur tanpa nama memakai alasan default
+    assert jadwal.is_operasional(waktu("2026-10-21 09:00:00"))[1] == \
+        PESAN_TUTUP.format(alasan="Hari Libur", buka="Kamis jam 00:00")
+
+
+def test_transisi_di_jam_buka(file_libur):
+    jadwal = OperasiSchedule(hari_tutup=[5, 6], jam_buka=8, menit_buka=30, file_libur=file_libur)
+    buka = waktu("2026-10-16 08:30:00")
+    assert jadwal.is_operasional(buka - DETIK) == (
+        False, PESAN_TUTUP.format(alasan=ALASAN_TUTUP, buka="Jumat jam 08:30"))
+    assert jadwal.is_operasional(buka) == (True, PESAN_OPERASIONAL)
+    assert jadwal._transisi_berikutnya(buka) == waktu("2026-10-17 00:00:00")
+    assert jadwal._transisi_berikutnya(buka - DETIK) == buka
+    # Tutup Sabtu-Senin (libur), buka Selasa jam 08:30
+    assert jadwal._transisi_berikutnya(waktu("2026-10-17 00:00:00")) == waktu("2026-10-20 08:30:00")
+
+
+def test_file_libur_dibaca_ulang_saat_berubah(jadwal, file_libur):
+    kamis = waktu("2026-10-15 10:00:00")
+    assert jadwal.is_operasional(kamis)[0]
+    with open(file_libur, "a", encoding="utf-8") as f:
+        f.write("2026-10-15 Libur Mendadak\n")
+    jadwal._mtime_libur = None  # mtime bisa sama dalam resolusi filesystem yang kasar
+    assert jadwal.is_operasional(kamis)[1].startswith("Website TUTUP - Libur Mendadak.")
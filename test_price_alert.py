@@ -0,0 +1,93 @@
+"""
+TEST_PRICE_ALERT.PY - Pengecekan price alert (AlertEngine + PriceAlert) terhadap database sementara
+
+    python -m pytest -q test_price_alert.py
+"""
+import random
+
+import pytest
+
+from price_alert import PriceAlert, STATUS_AKTIF
+
+
+@pytest.fixture
+def alerts(tmp_path):
+    return PriceAlert(str(tmp_path / "alerts.db"))
+
+
+def cek_loop(rows, harga):
+    """Aturan asli per alert: BELI jika harga <= harga_beli, JUAL jika harga >= harga_jual.
+    Target kosong/0 tidak pernah terpicu"""
+    hasil = []
+    for alert_id, _, harga_beli, harga_jual, status, _ in rows:
+        if status != STATUS_AKTIF:
+            continue
+        if harga_beli and harga <= harga_beli:
+            hasil.append((alert_id, "BELI"))
+        if harga_jual and harga >= harga_jual:
+            hasil.append((alert_id, "JUAL"))
+    return hasil
+
+
+def test_engine_sama_dengan_loop_acak(alerts):
+    rng = random.Random(6)
+    # Threshold dari himpunan kecil supaya banyak alert bernilai sama dan harga sering tepat di batas
+    level = [2_800_000 + i * 5_000 for i in range(20)]
+    for i in range(300):
+        alerts.tambah_alert(f"user{i % 7}", rng.choice(level + [None, 0]), rng.choice(level + [None, 0]))
+    for alert_id in rng.sample(range(1, 301), 60):
+        alerts.ubah_alert(alert_id, status="NONAKTIF")
+    rows = alerts.pool.baca("SELECT id, nama, harga_beli, harga_jual, status, tgl_buat FROM alerts ORDER BY id")
+
+    harga_list = [rng.choice(level) + rng.choice((-1, 0, 0, 1)) for _ in range(200)]
+    harga_list += [0, level[0] - 10**6, level[-1] + 10**6]
+    hasil_batch = alerts.check_alert_batch(harga_list)
+    for harga, hasil in zip(harga_list, hasil_batch):
+        assert [(a["id"], a["tipe"]) for a in hasil] == cek_loop(rows, harga), harga
+    assert [(a["id"], a["tipe"]) for a in alerts.check_alert(level[3])] == cek_loop(rows, level[3])
+
+
+# ============================================
+# CROSSING (proses_ticks)
+# ============================================
+def tipe_terpicu(terpicu):
+    return [(a["id"], a["tipe"], a["harga"]) for a in terpicu]
+
+
+def test_harga_diam_di_zona_terpicu_sekali(alerts):
+    alert_id = alerts.tambah_alert("budi", 2_900_000, 3_100_000)
+    ticks = [(i, h) for i, h in enumerate([2_950_000, 2_900_000, 2_890_000, 2_900_000, 2_880_000])]
+    assert tipe_terpicu(alerts.proses_ticks(ticks)) == [(alert_id, "BELI", 2_900_000)]
+    # Batch berikutnya masih di zona -> tidak terpicu lagi
+    assert alerts.proses_ticks([(10, 2_870_000), (11, 2_899_999)]) == []
+    assert len(alerts.get_alert_terpicu_terbaru()) == 1
+
+
+def test_keluar_lalu_masuk_lagi_terpicu_lagi(alerts):
+    alert_id = alerts.tambah_alert("budi", 2_900_000, None)
+    assert len(alerts.proses_ticks([(0, 2_890_000)])) == 1
+    # Keluar zona 1 rupiah lalu kembali tepat di target
+    assert tipe_terpicu(alerts.proses_ticks([(1, 2_900_001), (2, 2_900_000)])) == [
+        (alert_id, "BELI", 2_900_000)]
+    log = alerts.get_alert_terpicu_terbaru()
+    assert [(a["alert_id"], a["harga"], a["waktu_epoch"]) for a in log] == [
+        (alert_id, 2_900_000, 2), (alert_id, 2_890_000, 0)]
+
+
+def test_lompatan_melewati_zona(alerts):
+    alert_id = alerts.tambah_alert("budi", 2_900_000, 3_000_000)
+    # Dari zona BELI langsung ke zona JUAL dalam satu tick: JUAL terpicu, BELI lepas (siap lagi)
+    ticks = [(0, 2_850_000), (1, 3_050_000), (2, 2_800_000)]
+    assert tipe_terpicu(alerts.proses_ticks(ticks)) == [
+        (alert_id, "BELI", 2_850_000), (alert_id, "JUAL", 3_050_000), (alert_id, "BELI", 2_800_000)]
+    # Lompatan dari atas ke jauh di bawah target tetap hanya satu notifikasi
+    alert_2 = alerts.tambah_alert("ani", 2_700_000, None)
+    assert tipe_terpicu(alerts.proses_ticks([(3, 3_000_000), (4, 2_500_000)])) == [
+        (alert_id, "JUAL", 3_000_000), (alert_id, "BELI", 2_500_000), (alert_2, "BELI", 2_500_000)]
+
+
+def test_status_terpicu_tersimpan_di_database(alerts):
+    alerts.tambah_alert("budi", 2_900_000, None)
+    assert len(alerts.proses_ticks([(0, 2_850_000)])) == 1
+    # Proses lain (mis. worker ingest yang restart) membaca status dari database
+    assert PriceAlert(alerts.db_path).proses_ticks([(1, 2_840_000)]) == []
@@ -0,0 +1,85 @@
+"""
+TEST_ROLLUP_OHLC.PY - Tabel rollup OHLC dibandingkan dengan GROUP BY langsung atas harga_emas
+
+    python -m pytest -q test_rollup_ohlc.py
+"""
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_schema import migrasi_db_harga
+from rollup_ohlc import RESOLUSI, bucket_awal
+
+AWAL = datetime(2026, 9, 1, 6, 0, 0)
+
+
+def isi_lama(conn, rng, jumlah):
+    """Tick bentuk lama (waktu TEXT saja), jarak acak 1 detik - 20 menit"""
+    waktu = AWAL
+    rows = []
+    for _ in range(jumlah):
+        waktu += timedelta(seconds=rng.randint(1, 1200))
+        rows.append((str(waktu), rng.randint(2_600_000, 2_900_000)))
+    conn.executemany("INSERT INTO harga_emas (waktu, harga) VALUES (?, ?)", rows)
+    return int(waktu.timestamp())
+
+
+def rollup_langsung(conn, resolusi):
+    """OHLC per bucket dihitung ulang dari tick mentah. open/close memakai
+    kolom bare milik baris min()/max() (perilaku SQLite)"""
+    kelompok = f"""
+    FROM harga_emas WHERE waktu_epoch IS NOT NULL AND harga IS NOT NULL
+    GROUP BY bucket_awal(waktu_epoch, '{resolusi}')
+    """
+    utama = conn.execute(f"""
+    SELECT bucket_awal(waktu_epoch, '{resolusi}'), max(harga), min(harga), count(*),
+           min(waktu_epoch), max(waktu_epoch)
+    {kelompok}
+    """).fetchall()
+    buka = dict(r[:2] for r in conn.execute(
+        f"SELECT bucket_awal(waktu_epoch, '{resolusi}'), harga, min(waktu_epoch) {kelompok}"))
+    tutup = dict(r[:2] for r in conn.execute(
+        f"SELECT bucket_awal(waktu_epoch, '{resolusi}'), harga, max(waktu_epoch) {kelompok}"))
+    return {bucket: (buka[bucket], high, low, tutup[bucket], jumlah, awal, akhir)
+            for bucket, high, low, jumlah, awal, akhir in utama}
+
+
+def rollup_tabel(conn, resolusi):
+    tabel = RESOLUSI[resolusi][0]
+    return {row[0]: row[1:] for row in conn.execute(
+        f"SELECT bucket, open, high, low, close, jumlah, epoch_awal, epoch_akhir FROM {tabel}")}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "emas.db"))
+    conn.create_function("bucket_awal", 2, bucket_awal, deterministic=True)
+    conn.execute("""
+    CREATE TABLE harga_emas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        waktu TEXT,
+        harga INTEGER
+    )
+    """)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("resolusi", list(RESOLUSI))
+def test_rollup_sama_dengan_group_by(conn, resolusi):
+    rng = random.Random(42)
+    akhir = isi_lama(conn, rng, 600)
+    conn.commit()
+    migrasi_db_harga(conn)  # Backfill dari tick lama
+
+    # Tick baru lewat trigger, sebagian terlambat datang (urutan insert acak).
+    # Epoch dibuat unik supaya open/close tidak ambigu
+    lama = {row[0] for row in conn.execute("SELECT waktu_epoch FROM harga_emas")}
+    epoch_baru = rng.sample(sorted(set(range(akhir - 86400, akhir + 2 * 86400)) - lama), 400)
+    conn.executemany("INSERT INTO harga_emas (harga, waktu_epoch) VALUES (?, ?)",
+                     [(rng.randint(2_600_000, 2_900_000), e) for e in epoch_baru])
+    conn.commit()
+
+    assert rollup_tabel(conn, resolusi) == rollup_langsung(conn, resolusi)
@@ -0,0 +1,69 @@
+"""
+TEST_STATISTIK_HARGA.PY - Statistik berjalan dibandingkan dengan pandas rolling/expanding
+
+    python -m pytest -q test_statistik_harga.py
+"""
+import math
+import random
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from statistik_harga import JendelaGeser, JendelaTahunan, awal_tahun
+
+
+def seri_acak(seed, jumlah, mulai, jeda_maks):
+    """Tick urut waktu dengan jeda acak (kadang panjang, supaya banyak tick keluar
+    jendela sekaligus) dan harga random walk dengan nilai kembar"""
+    rng = random.Random(seed)
+    epoch, harga, ticks = mulai, 2_900_000, []
+    for _ in range(jumlah):
+        epoch += rng.choice((rng.randint(1, jeda_maks), rng.randint(1, 60)))
+        harga += rng.choice((-1000, 0, 0, 500, 1500))
+        ticks.append((epoch, harga))
+    return ticks
+
+
+def bandingkan(ringkasan, n, rata, std, minimum, maksimum):
+    jumlah, r_rata, r_std, r_min, r_max, _, _ = ringkasan
+    assert jumlah == n
+    assert r_rata == pytest.approx(rata, rel=1e-12)
+    # pandas memberi NaN untuk stddev satu sampel (statistik_harga memberi 0) dan
+    # menyisakan galat pembulatan kecil saat harga dalam jendela kembar (jumlah int eksak)
+    assert r_std == pytest.approx(0 if math.isnan(std) else std, rel=1e-6, abs=1e-2)
+    assert (r_min, r_max) == (minimum, maksimum)
+
+
+@pytest.mark.parametrize("lebar", [60, 3600, 86400])
+def test_jendela_geser_sama_dengan_rolling(lebar):
+    ticks = seri_acak(13, 3000, 1_790_000_000, 2 * lebar)
+    seri = pd.Series([h for _, h in ticks],
+                     index=pd.to_datetime([e for e, _ in ticks], unit="s"), dtype="float64")
+    # Jendela waktu pandas (t - lebar, t] sama dengan aturan eviction JendelaGeser
+    rolling = seri.rolling(f"{lebar}s")
+    harapan = pd.DataFrame({"n": rolling.count(), "rata": rolling.mean(), "std": rolling.std(),
+                            "min": rolling.min(), "max": rolling.max()})
+
+    jendela = JendelaGeser(lebar)
+    for (epoch, harga), baris in zip(ticks, harapan.itertuples(index=False)):
+        jendela.tambah(epoch, harga)
+        bandingkan(jendela.ringkasan(), int(baris.n), baris.rata, baris.std, baris.min, baris.max)
+        assert jendela.epoch_akhir == epoch
+
+
+def test_jendela_tahunan_sama_dengan_expanding_per_tahun():
+    # Melewati pergantian tahun: statistik di-reset tepat di 1 Januari jam lokal
+    ticks = seri_acak(14, 2000, awal_tahun(2027) - 5 * 86400, 900)
+    jendela = JendelaTahunan()
+    tahun_baru = awal_tahun(2027)
+    df = pd.DataFrame(ticks, columns=["epoch", "harga"], dtype="float64")
+    df["tahun"] = (df["epoch"] >= tahun_baru).astype(int)
+    expanding = df.groupby("tahun")["harga"].expanding()
+    harapan = pd.DataFrame({"n": expanding.count(), "rata": expanding.mean(), "std": expanding.std(),
+                            "min": expanding.min(), "max": expanding.max()}).reset_index(drop=True)
+    assert 0 < df["tahun"].sum() < len(df)
+
+    for (epoch, harga), baris in zip(ticks, harapan.itertuples(index=False)):
+        jendela.tambah(epoch, harga)
+        bandingkan(jendela.ringkasan(), int(baris.n), baris.rata, baris.std, baris.min, baris.max)
@@ -0,0 +1,173 @@
+"""
+TEST_SUMBER_HARGA.PY - AgregatorHarga terhadap server stub aiohttp lokal
+
+    python -m pytest -q test_sumber_harga.py
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp import web
+
+import sumber_harga
+from harga_parser import format_rupiah
+from jadwal_polling import BudgetHabis, BudgetSumber
+from sumber_harga import AgregatorHarga, Sumber
+
+
+class ServerStub:
+    """Satu server aiohttp di thread sendiri. Perilaku tiap sumber diatur lewat
+    self.sumber[nama] = {"nilai", "jeda", "status"} dan bisa diubah di tengah test"""
+
+    def __init__(self):
+        self.sumber = {}
+        self.hit = {}
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._runner, self.port = asyncio.run_coroutine_threadsafe(self._mulai(), self._loop).result(5)
+
+    async def _mulai(self):
+        app = web.Application()
+        app.router.add_get("/harga/{nama}", self._harga)
+        runner = web.AppRunner(app, shutdown_timeout=0.1)  # Handler lambat tidak ditunggu saat tutup
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, site._server.sockets[0].getsockname()[1]
+
+    async def _harga(self, request):
+        nama = request.match_info["nama"]
+        self.hit[nama] = self.hit.get(nama, 0) + 1
+        perilaku = self.sumber[nama]
+        await asyncio.sleep(perilaku.get("jeda", 0))
+        if perilaku.get("status", 200) != 200:
+            return web.Response(status=perilaku["status"], text="error")
+        return web.Response(text=f"<table><td>Harga</td><td>{format_rupiah(perilaku['nilai'])}</td></table>",
+                            content_type="text/html")
+
+    def url(self, nama):
+        return f"http://127.0.0.1:{self.port}/harga/{nama}"
+
+    async def _berhenti(self):
+        await self._runner.cleanup()
+        # Handler sumber lambat yang masih tidur dibatalkan, bukan ditinggal pending
+        tugas = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tugas:
+            t.cancel()
+        await asyncio.gather(*tugas, return_exceptions=True)
+
+    def tutup(self):
+        asyncio.run_coroutine_threadsafe(self._berhenti(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def server():
+    server = ServerStub()
+    yield server
+    server.tutup()
+
+
+@pytest.fixture
+def buat_agregator(server):
+    dibuat = []
+
+    def buat(perilaku, kuorum, deadline=2.0):
+        sumber = []
+        for nama, p in perilaku.items():
+            server.sumber[nama] = p
+            s = Sumber(nama, server.url(nama), deadline=p.get("deadline", deadline))
+            s.budget = BudgetSumber(per_jam=10 ** 7)  # Budget host bersama tidak ikut diuji di sini
+            sumber.append(s)
+        agregator = AgregatorHarga(sumber, kuorum=kuorum)
+        dibuat.append(agregator)
+        return agregator
+
+    yield buat
+    for agregator in dibuat:
+        agregator.tutup()
+
+
+def test_median_semua_sumber(buat_agregator):
+    agregator = buat_agregator({"a": {"nilai": 2_950_000}, "b": {"nilai": 2_951_000},
+                                "c": {"nilai": 2_990_000}}, kuorum=3)
+    hasil = agregator.ambil()
+    assert hasil.nilai == 2_951_000 and hasil.teks == "2.951.000"
+    assert hasil.kutipan == {"a": 2_950_000, "b": 2_951_000, "c": 2_990_000}
+    assert hasil.gagal == {}
+
+
+def test_kuorum_tidak_menunggu_sumber_lambat(buat_agregator):
+    agregator = buat_agregator({"a": {"nilai": 2_950_000}, "b": {"nilai": 2_952_000},
+                                "lambat": {"nilai": 3_100_000, "jeda": 1.0}}, kuorum=2)
+    mulai = time.perf_counter()
+    hasil = agregator.ambil()
+    assert time.perf_counter() - mulai < 0.8
+    assert hasil.nilai == 2_951_000
+    assert hasil.gagal == {"lambat": "Belum menjawab saat kuorum tercapai"}
+
+
+def test_deadline_per_sumber(buat_agregator):
+    agregator = buat_agregator({"a": {"nilai": 2_950_000}, "b": {"nilai": 2_960_000},
+                                "lambat": {"nilai": 3_100_000, "jeda": 2.0, "deadline": 0.3}}, kuorum=3)
+    mulai = time.perf_counter()
+    hasil = agregator.ambil()
+    assert time.perf_counter() - mulai < 1.5
+    # Sumber lambat dibuang setelah deadline-nya sendiri, median dari yang tepat waktu
+    assert hasil.kutipan == {"a": 2_950_000, "b": 2_960_000}
+    assert hasil.gagal == {"lambat": "Timeout"}
+    assert agregator.get_statistik()["lambat"]["error"] == 1
+
+
+def test_semua_sumber_gagal(buat_agregator):
+    agregator = buat_agregator({"a": {"status": 500}, "b": {"status": 503}}, kuorum=2)
+    with pytest.raises(ValueError, match="Semua sumber harga gagal"):
+        agregator.ambil()
+
+
+def test_sumber_tidak_sehat_dilewati_lalu_pulih(buat_agregator, server, monkeypatch):
+    monkeypatch.setattr(sumber_harga, "SUMBER_GAGAL_TIDAK_SEHAT", 2)
+    monkeypatch.setattr(sumber_harga, "SUMBER_JEDA_PEMULIHAN", 0.3)
+    agregator = buat_agregator({"a": {"nilai": 2_950_000}, "b": {"nilai": 2_960_000},
+                                "rusak": {"status": 500}}, kuorum=3)
+    for _ in range(2):
+        assert agregator.ambil().gagal["rusak"].startswith("ClientResponseError")
+    assert not agregator.get_statistik()["rusak"]["sehat"]
+
+    # Tidak sehat: tidak di-request lagi, kuorum turun ke jumlah sumber sehat
+    hasil = agregator.ambil()
+    assert server.hit["rusak"] == 2
+    assert hasil.nilai == 2_955_000
+    assert "dilewati" in hasil.gagal["rusak"]
+    assert agregator.get_statistik()["rusak"]["dilewati"] == 1
+
+    # Setelah jeda pemulihan satu request percobaan dikirim. Kuorum masih 2 sumber sehat,
+    # jadi jawaban percobaan bisa datang setelah hasil dikembalikan
+    server.sumber["rusak"] = {"nilai": 2_970_000}
+    time.sleep(0.35)
+    agregator.ambil()
+    batas = time.monotonic() + 2
+    while not agregator.get_statistik()["rusak"]["sehat"] and time.monotonic() < batas:
+        time.sleep(0.01)
+    assert server.hit["rusak"] == 3
+
+    # Pulih: ikut dihitung lagi di putaran berikutnya
+    hasil = agregator.ambil()
+    assert hasil.kutipan == {"a": 2_950_000, "b": 2_960_000, "rusak": 2_970_000}
+    assert hasil.nilai == 2_960_000
+
+
+def test_budget_habis_semua_sumber(buat_agregator, server):
+    agregator = buat_agregator({"a": {"nilai": 2_950_000}, "b": {"nilai": 2_960_000}}, kuorum=2)
+    for s in agregator.sumber:
+        s.budget = BudgetSumber(per_jam=36, burst=100)  # Kapasitas 1 token, isi ulang 100 detik
+    agregator.ambil()
+    # Budget habis bukan kegagalan sumber: raise BudgetHabis dengan waktu tunggu, statistik tetap sehat
+    with pytest.raises(BudgetHabis) as info:
+        agregator.ambil()
+    assert 90 < info.value.tunggu <= 100
+    assert server.hit == {"a": 1, "b": 1}
+    assert all(st["sehat"] for st in agregator.get_statistik().values())